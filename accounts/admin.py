@@ -1,7 +1,7 @@
 # Register your models here.
 from django.contrib import admin
 
-from .models import Device, PatchNote, User
+from .models import Device, EmailOutbox, PatchNote, User
 
 
 class UserAdmin(admin.ModelAdmin):
@@ -55,9 +55,26 @@ class DeviceAdmin(admin.ModelAdmin):
 
 
 class PatchNoteAdmin(admin.ModelAdmin):
-    list_display = ("title", "created_at")
+    list_display = ("title", "created_at", "email_sent", "recipient_count")
+    readonly_fields = ("email_sent", "last_user_id", "recipient_count")
+    exclude = ("email_list",)
+
+
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "to_email",
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("to_email",)
 
 
 admin.site.register(User, UserAdmin)
 admin.site.register(Device, DeviceAdmin)
 admin.site.register(PatchNote, PatchNoteAdmin)
+admin.site.register(EmailOutbox, EmailOutboxAdmin)
@@ -1,12 +1,30 @@
+from asgiref.sync import sync_to_async
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken
 from rest_framework_simplejwt.settings import api_settings
 from jwt import DecodeError, ExpiredSignatureError
-import jwt
+
+from accounts.cache import user_cache
 
 
 class CustomJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
+        validated_token = self.get_request_token(request)
+        if validated_token is None:
+            return None
+        return self.get_user(validated_token), validated_token.payload
+
+    async def aauthenticate(self, request):
+        """
+        - async view 의 인증입니다. user_cache 에 있으면 DB 조회 없이
+          event loop 에서 끝납니다.
+        """
+        validated_token = self.get_request_token(request)
+        if validated_token is None:
+            return None
+        return await self.aget_user(validated_token), validated_token.payload
+
+    def get_request_token(self, request):
         header = self.get_header(request)
         if header is None:
             return None
@@ -17,13 +35,30 @@ class CustomJWTAuthentication(JWTAuthentication):
 
         try:
             validated_token = self.get_validated_token(raw_token)
-            token_payload = jwt.decode(
-                raw_token, 
-                api_settings.SIGNING_KEY, 
-                algorithms=[api_settings.ALGORITHM]
-            )
-            request.auth = token_payload
+            # SimpleJWT 가 검증하며 decode 한 payload 를 그대로 씁니다.
+            request.auth = validated_token.payload
         except (InvalidToken, DecodeError, ExpiredSignatureError) as e:
             raise InvalidToken(e)
+        return validated_token
+
+    def get_user(self, validated_token):
+        """
+        - user 를 process 의 user_cache 에서 먼저 찾고, 없으면 DB 에서
+          불러옵니다.
+        """
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            user = user_cache.get(user_id)
+            if user is not None:
+                return user
+        user = super().get_user(validated_token)
+        user_cache.set(user_id, user)
+        return user
 
-        return self.get_user(validated_token), token_payload
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            user = user_cache.get(user_id)
+            if user is not None:
+                return user
+        return await sync_to_async(self.get_user)(validated_token)
@@ -0,0 +1,64 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from onestep_be.cache import invalidate_on_commit
+
+AUTH_USER_CACHE_SIZE = getattr(settings, "AUTH_USER_CACHE_SIZE", 1024)
+AUTH_USER_CACHE_TTL = getattr(settings, "AUTH_USER_CACHE_TTL", 30)
+
+
+class UserCache:
+    """
+    - 인증된 User 를 process 안에 user_id 별로 잠깐 저장하는 LRU cache 입니다.
+    - User 가 저장되면 이 process 의 항목은 바로 지워지고, 다른 process 의
+      항목은 ttl 초 안에 만료됩니다.
+    - request 마다 복사본을 돌려주므로 view 에서 바꿔도 cache 는 그대로입니다.
+    """
+
+    def __init__(self, maxsize=AUTH_USER_CACHE_SIZE, ttl=AUTH_USER_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.users = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.users.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self.users[user_id]
+                return None
+            self.users.move_to_end(user_id)
+        return copy.copy(user)
+
+    def set(self, user_id, user):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.users[user_id] = (
+                time.monotonic() + self.ttl,
+                copy.copy(user),
+            )
+            self.users.move_to_end(user_id)
+            while len(self.users) > self.maxsize:
+                self.users.popitem(last=False)
+
+    def invalidate(self, user_id):
+        def pop():
+            with self.lock:
+                self.users.pop(user_id, None)
+
+        invalidate_on_commit(pop)
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache()
@@ -0,0 +1,274 @@
+import datetime
+import logging
+import threading
+import time
+
+import resend
+import sentry_sdk
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, F, OuterRef
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import (
+    PATCH_NOTE_ENQUEUE_BATCH_SIZE,
+    EmailOutbox,
+    PatchNote,
+    email_queued,
+)
+from accounts.utils import FROM_EMAIL_ADDRESS, SendParams
+
+logger = logging.getLogger(__name__)
+
+# Resend 의 batch API 는 한 번에 최대 100 개의 메일을 보낼 수 있습니다.
+EMAIL_SEND_BATCH_SIZE = getattr(settings, "EMAIL_SEND_BATCH_SIZE", 100)
+# Resend 의 기본 rate limit 은 초당 2 요청입니다.
+EMAIL_SEND_RATE_LIMIT = getattr(settings, "EMAIL_SEND_RATE_LIMIT", 2)
+EMAIL_SEND_MAX_ATTEMPTS = getattr(settings, "EMAIL_SEND_MAX_ATTEMPTS", 5)
+EMAIL_SEND_RETRY_BACKOFF = getattr(settings, "EMAIL_SEND_RETRY_BACKOFF", 30)
+# 가져간 메일을 다른 worker 가 다시 가져가지 않는 시간(초)입니다.
+# 이 시간 안에 결과를 기록하지 못하면(프로세스 종료 등) 다시 보냅니다.
+EMAIL_SEND_LEASE = getattr(settings, "EMAIL_SEND_LEASE", 300)
+EMAIL_SEND_POLL_INTERVAL = getattr(settings, "EMAIL_SEND_POLL_INTERVAL", 30)
+
+# 다시 보내도 성공할 수 없는 에러의 status code 입니다.
+PERMANENT_ERROR_CODES = {"400", "401", "403", "422"}
+
+
+class RateLimiter:
+    """
+    - 호출 사이의 간격을 1 / rate 초 이상으로 유지합니다.
+    - 프로세스 안에서만 제한하므로 여러 프로세스가 동시에 보내다 429 를
+      받으면 재시도로 처리합니다.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_at = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+rate_limiter = RateLimiter(EMAIL_SEND_RATE_LIMIT)
+
+
+def is_permanent_error(error):
+    return str(getattr(error, "code", "")) in PERMANENT_ERROR_CODES
+
+
+def get_retry_delay(attempts):
+    return datetime.timedelta(
+        seconds=EMAIL_SEND_RETRY_BACKOFF * 2 ** (attempts - 1)
+    )
+
+
+def claim_emails(batch_size, now):
+    """
+    - 보낼 때가 된 PENDING 메일을 batch_size 개 가져옵니다.
+    - next_attempt_at 을 EMAIL_SEND_LEASE 뒤로 미뤄서 다른 worker 가
+      같은 메일을 가져가지 않게 합니다.
+    """
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.filter(
+                status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now
+            )
+            .order_by("next_attempt_at", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:batch_size]
+        )
+        EmailOutbox.objects.filter(id__in=ids).update(
+            attempts=F("attempts") + 1,
+            next_attempt_at=now + datetime.timedelta(seconds=EMAIL_SEND_LEASE),
+        )
+    return list(
+        EmailOutbox.objects.filter(id__in=ids)
+        .select_related("patch_note")
+        .order_by("id")
+    )
+
+
+def get_messages(emails):
+    """
+    - 메일마다 본문을 반환합니다. patch note 는 파일을 한 번만 읽습니다.
+    """
+    patch_notes = {}
+    messages = []
+    for email in emails:
+        if email.message or email.patch_note is None:
+            messages.append(email.message)
+            continue
+        if email.patch_note_id not in patch_notes:
+            patch_notes[email.patch_note_id] = email.patch_note.get_message()
+        messages.append(patch_notes[email.patch_note_id])
+    return messages
+
+
+def send_batch(emails, messages):
+    """
+    - 메일을 Resend batch API 한 번으로 보내고, 메일마다 id 를 반환합니다.
+    """
+    params = [
+        SendParams(
+            from_email_address=FROM_EMAIL_ADDRESS,
+            to_email_address=email.to_email,
+            subject=email.subject,
+            message=message,
+        ).to_dict()
+        for email, message in zip(emails, messages)
+    ]
+    rate_limiter.wait()
+    response = resend.Batch.send(params)
+    return [item["id"] for item in response["data"]]
+
+
+def mark_sent(emails, provider_ids, now):
+    for email, provider_id in zip(emails, provider_ids):
+        email.status = EmailOutbox.Status.SENT
+        email.provider_id = provider_id
+        email.sent_at = now
+        email.error = None
+    EmailOutbox.objects.bulk_update(
+        emails, ["status", "provider_id", "sent_at", "error"]
+    )
+
+
+def mark_failed(emails, error, now):
+    """
+    - 다시 보낼 수 있으면 backoff 뒤로 미루고, 아니면 FAILED 로 바꿉니다.
+    """
+    permanent = is_permanent_error(error)
+    for email in emails:
+        email.error = str(error)
+        if permanent or email.attempts >= EMAIL_SEND_MAX_ATTEMPTS:
+            email.status = EmailOutbox.Status.FAILED
+        else:
+            email.next_attempt_at = now + get_retry_delay(email.attempts)
+    EmailOutbox.objects.bulk_update(
+        emails, ["status", "next_attempt_at", "error"]
+    )
+    logger.warning("Failed to send %d emails: %s", len(emails), error)
+
+
+def deliver(emails, messages):
+    try:
+        provider_ids = send_batch(emails, messages)
+    except Exception as e:
+        if is_permanent_error(e) and len(emails) > 1:
+            # 한 메일 때문에 batch 전체가 거절되었을 수 있으므로 하나씩
+            # 보냅니다.
+            for email, message in zip(emails, messages):
+                deliver([email], [message])
+            return
+        if not is_permanent_error(e):
+            sentry_sdk.capture_exception(e)
+        mark_failed(emails, e, timezone.now())
+        return
+    mark_sent(emails, provider_ids, timezone.now())
+
+
+def send_pending_emails(batch_size=EMAIL_SEND_BATCH_SIZE):
+    """
+    - 보낼 때가 된 메일이 없을 때까지 batch_size 개씩 보냅니다.
+    - 가져간 메일 수를 반환합니다.
+    """
+    count = 0
+    while emails := claim_emails(batch_size, timezone.now()):
+        deliver(emails, get_messages(emails))
+        count += len(emails)
+    return count
+
+
+def enqueue_patch_notes(batch_size=PATCH_NOTE_ENQUEUE_BATCH_SIZE):
+    """
+    - 아직 다 넣지 않은 patch note 마다 다음 batch 를 outbox 에 넣습니다.
+    - 이전 batch 에 PENDING 메일(재시도 대기 포함)이 남은 patch note 는
+      건너뛰므로 outbox 에는 patch note 마다 한 batch 만 쌓입니다.
+    - 넣을 patch note 가 있었으면 True 를 반환합니다.
+    """
+    pending = EmailOutbox.objects.filter(
+        patch_note=OuterRef("id"), status=EmailOutbox.Status.PENDING
+    )
+    ids = list(
+        PatchNote.objects.filter(email_sent=False)
+        .exclude(Exists(pending))
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for id in ids:
+        PatchNote.enqueue_next_batch(id, batch_size)
+    return bool(ids)
+
+
+def process_outbox(batch_size=EMAIL_SEND_BATCH_SIZE):
+    """
+    - 보낼 메일을 모두 보낸 뒤에 patch note 의 다음 batch 를 넣습니다.
+    - 이전 batch 가 재시도를 기다리는 동안에는 다음 batch 를 넣지 않으므로
+      user 수와 관계없이 outbox 에 쌓이는 patch note 메일은 patch note 마다
+      PATCH_NOTE_ENQUEUE_BATCH_SIZE 개를 넘지 않습니다.
+    - cron 에서도 실행해서 멈춘 worker 의 메일과 patch note 를 이어서
+      보냅니다.
+    """
+    count = send_pending_emails(batch_size)
+    while enqueue_patch_notes():
+        count += send_pending_emails(batch_size)
+    return count
+
+
+class EmailSender:
+    """
+    - outbox 의 메일을 요청 처리와 분리해서 보내는 worker thread 입니다.
+    - 메일이 들어오면 바로 깨어나고, 그 외에는 poll_interval 마다
+      재시도할 메일이 있는지 확인합니다.
+    """
+
+    def __init__(self, poll_interval=EMAIL_SEND_POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Condition()
+        self._pending = False
+        self._thread = None
+
+    def start(self):
+        # worker 는 fork 이후 첫 메일이 들어올 때 만듭니다.
+        with self._wakeup:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="email-sender", daemon=True
+            )
+            self._thread.start()
+
+    def wake(self):
+        self.start()
+        with self._wakeup:
+            self._pending = True
+            self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                if not self._pending:
+                    self._wakeup.wait(self.poll_interval)
+                self._pending = False
+            try:
+                process_outbox()
+            except Exception as e:
+                sentry_sdk.capture_exception(e)
+            finally:
+                close_old_connections()
+
+
+email_sender = EmailSender()
+
+
+@receiver(email_queued)
+def wake_email_sender(sender, **kwargs):
+    email_sender.wake()
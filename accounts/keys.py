@@ -0,0 +1,160 @@
+import json
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import google.auth.transport
+import jwt
+import requests
+import sentry_sdk
+from django.conf import settings
+from django.utils import timezone
+from google.auth.transport import requests as google_requests
+
+PUBLIC_KEY_DEFAULT_TTL = getattr(settings, "PUBLIC_KEY_DEFAULT_TTL", 3600)
+# 모르는 kid 로 다시 받아오는 간격의 최솟값 (잘못된 kid 로 인한 반복 요청 방지)
+PUBLIC_KEY_MIN_REFRESH_INTERVAL = getattr(
+    settings, "PUBLIC_KEY_MIN_REFRESH_INTERVAL", 60
+)
+PUBLIC_KEY_REQUEST_TIMEOUT = 5
+
+# 외부 공개키 요청이 함께 쓰는 connection pool 입니다.
+http_session = requests.Session()
+
+MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def get_cache_ttl(response, default=PUBLIC_KEY_DEFAULT_TTL):
+    """
+    - Cache-Control 의 max-age 에서 Age 를 뺀 값을 반환합니다.
+    - max-age 가 없으면 Expires, 둘 다 없으면 default 를 씁니다.
+    """
+    cache_control = response.headers.get("Cache-Control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = MAX_AGE_RE.search(cache_control)
+    if match is not None:
+        age = int(response.headers.get("Age", 0) or 0)
+        return max(int(match.group(1)) - age, 0)
+    expires = response.headers.get("Expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+        except (TypeError, ValueError):
+            return default
+        return max((expires_at - timezone.now()).total_seconds(), 0)
+    return default
+
+
+def parse_certs(data):
+    return dict(data)
+
+
+def parse_jwks(data):
+    return {
+        key["kid"]: jwt.algorithms.RSAAlgorithm.from_jwk(key)
+        for key in data.get("keys", [])
+    }
+
+
+class PublicKeyCache:
+    """
+    - url 의 공개키 목록을 parse_keys 로 파싱해 kid 별로 저장합니다.
+    - HTTP cache 헤더가 허락하는 동안은 다시 요청하지 않습니다.
+    - 만료되었거나 모르는 kid 일 때만 다시 받아오고, 동시에 온 요청은
+      lock 을 기다렸다가 먼저 받아온 결과를 씁니다.
+    - 다시 받아오지 못하면 이전 키를 계속 씁니다.
+    """
+
+    def __init__(
+        self,
+        url,
+        parse_keys,
+        min_refresh_interval=PUBLIC_KEY_MIN_REFRESH_INTERVAL,
+    ):
+        self.url = url
+        self.parse_keys = parse_keys
+        self.min_refresh_interval = min_refresh_interval
+        self.keys = {}
+        self.expires_at = 0
+        self.fetched_at = None
+        self.lock = threading.Lock()
+
+    def get(self, kid):
+        keys = self.keys
+        if kid in keys and time.monotonic() < self.expires_at:
+            return keys[kid]
+        self.refresh(keys)
+        return self.keys[kid]
+
+    def get_all(self):
+        keys = self.keys
+        if not keys or time.monotonic() >= self.expires_at:
+            self.refresh(keys)
+        return self.keys
+
+    def refresh(self, seen):
+        with self.lock:
+            if self.keys is not seen:
+                # 기다리는 동안 다른 요청이 이미 받아왔습니다.
+                return
+            now = time.monotonic()
+            if (
+                now < self.expires_at
+                and self.fetched_at is not None
+                and now - self.fetched_at < self.min_refresh_interval
+            ):
+                return
+            try:
+                response = http_session.get(
+                    self.url, timeout=PUBLIC_KEY_REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+                keys = self.parse_keys(response.json())
+            except (requests.RequestException, ValueError) as e:
+                if not self.keys:
+                    raise
+                sentry_sdk.capture_exception(e)
+                # 잠시 이전 키를 쓰고, 기다리던 요청도 다시 받아오지 않게
+                # 합니다.
+                self.fetched_at = now
+                self.expires_at = now + self.min_refresh_interval
+                return
+            self.fetched_at = now
+            self.expires_at = now + get_cache_ttl(response)
+            self.keys = keys
+
+
+class CertsResponse(google.auth.transport.Response):
+    def __init__(self, certs):
+        self._data = json.dumps(certs).encode()
+
+    @property
+    def status(self):
+        return 200
+
+    @property
+    def headers(self):
+        return {"Content-Type": "application/json"}
+
+    @property
+    def data(self):
+        return self._data
+
+
+class CachedCertsRequest(google.auth.transport.Request):
+    """
+    - google-auth 의 인증서 요청(certs_url GET)에 PublicKeyCache 로 응답합니다.
+    - 나머지 요청은 http_session 으로 보냅니다.
+    """
+
+    def __init__(self, certs_url, certs):
+        self.certs_url = certs_url
+        self.certs = certs
+        self.request = google_requests.Request(session=http_session)
+
+    def __call__(self, url, method="GET", **kwargs):
+        if method == "GET" and url == self.certs_url:
+            return CertsResponse(self.certs.get_all())
+        return self.request(url, method=method, **kwargs)
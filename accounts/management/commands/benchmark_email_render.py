@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+
+from accounts.utils import get_welcome_email
+
+
+def render_with_template(user_name):
+    return render_to_string("welcome_email.html", {"username": user_name})
+
+
+def measure(render, user_names):
+    """
+    - user_names 마다 render 를 실행한 시간(초)과 결과를 반환합니다.
+    """
+    start = time.perf_counter()
+    rendered = [render(user_name) for user_name in user_names]
+    return time.perf_counter() - start, rendered
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare render_to_string with the precompiled welcome email "
+        "template for a growing number of emails."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000")
+
+    def handle(self, *args, **options):
+        # 첫 compile 은 측정에서 제외합니다.
+        get_welcome_email("warmup")
+        for size in [int(size) for size in options["sizes"].split(",")]:
+            user_names = [f"user{i}@example.com" for i in range(size)]
+            slow, expected = measure(render_with_template, user_names)
+            fast, rendered = measure(get_welcome_email, user_names)
+            if rendered != expected:
+                raise CommandError(f"{size} emails: output differs")
+            self.stdout.write(
+                f"{size} emails: template {slow / size * 1e6:.1f}us/email, "
+                f"precompiled {fast / size * 1e6:.1f}us/email, "
+                f"{slow / fast:.1f}x"
+            )
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:56
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0019_remove_profile_age_profile_age_group'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='utc_offset',
+            field=models.SmallIntegerField(db_index=True, default=540, validators=[django.core.validators.MinValueValidator(-720), django.core.validators.MaxValueValidator(840)]),
+        ),
+    ]
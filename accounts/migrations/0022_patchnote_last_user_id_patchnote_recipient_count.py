@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patchnote',
+            name='last_user_id',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='patchnote',
+            name='recipient_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
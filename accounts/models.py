@@ -1,11 +1,20 @@
 import sentry_sdk
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
-from django.db import models
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.dispatch import Signal
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from accounts.utils import send_email, send_welcome_email
+from accounts.cache import user_cache
+from accounts.utils import get_welcome_email
+
+WELCOME_EMAIL_SUBJECT = "Welcome to join us"
+PATCH_NOTE_ENQUEUE_BATCH_SIZE = 1000
+
+# outbox 에 메일이 들어간 transaction 이 commit 되면 보냅니다.
+email_queued = Signal()
 
 
 class TimeStamp(models.Model):
@@ -43,6 +52,23 @@ class User(AbstractUser, TimeStamp):
     )
     is_subscribed = models.BooleanField(default=False)
     is_premium = models.BooleanField(default=False)
+    # 알림을 현지 시간에 보내기 위한 UTC offset (분 단위, 기본값 KST)
+    utc_offset = models.SmallIntegerField(
+        default=540,
+        db_index=True,
+        validators=[MinValueValidator(-720), MaxValueValidator(840)],
+    )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # 인증에서 cache 한 user 를 지웁니다.
+        user_cache.invalidate(self.id)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.id
+        result = super().delete(*args, **kwargs)
+        user_cache.invalidate(user_id)
+        return result
 
     @classmethod
     def get_or_create_user(self, email):
@@ -83,40 +109,137 @@ class PatchNote(models.Model):
     title = models.CharField(max_length=255)
     html_file = models.FileField(upload_to="patch_note/")
     created_at = models.DateTimeField(null=True, auto_now_add=True)
+    # 모든 사용자의 메일을 outbox 에 넣었는지 여부
     email_sent = models.BooleanField(default=False)
+    # 이전 버전에서 받는 사람 목록을 저장하던 필드로, 더 이상 쓰지 않습니다.
     email_list = models.TextField(null=True, blank=True)
+    # outbox 에 넣은 마지막 user id. 중단되면 여기서부터 이어서 넣습니다.
+    last_user_id = models.BigIntegerField(default=0)
+    recipient_count = models.PositiveIntegerField(default=0)
 
     def save(self, *args, **kwargs):
+        """
+        - 저장만 하고, 메일은 EmailSender 가 나눠서 outbox 에 넣고 보냅니다.
+        """
         super().save(*args, **kwargs)
+        if not self.email_sent:
+            transaction.on_commit(lambda: email_queued.send(sender=PatchNote))
 
-        # 모든 사용자에게 이메일 보내기
-        if not self.email_sent:  # 이메일이 아직 보내지지 않은 경우
-            user_email_list = self.send_email_to_all_users()
-            self.email_sent = True  # 이메일을 보냈으므로 True로 변경
-            self.email_list = ", ".join(user_email_list)
-            self.save(update_fields=["email_sent", "email_list"])
-
-    def send_email_to_all_users(self):
-        # 모든 사용자에게 이메일 보내기
-        user_email_list = User.objects.filter(
-            deleted_at__isnull=True, is_staff=False
-        ).values_list("username", flat=True)
-        subject = f"OneStep's New Patch Note: {self.title}"
-        sentry_sdk.capture_message(
-            f"Patch note title : {self.title}, Sending email to users"
-        )
-        try:
-            # HTML 파일 내용 읽기
-            with open(self.html_file.path, "r") as f:
-                message = f.read()
-            send_email(
-                to_email_address=list(user_email_list),
+    def get_message(self):
+        with self.html_file.open("r") as f:
+            return f.read()
+
+    def get_subject(self):
+        return f"OneStep's New Patch Note: {self.title}"
+
+    @classmethod
+    def enqueue_next_batch(cls, id, batch_size=PATCH_NOTE_ENQUEUE_BATCH_SIZE):
+        """
+        - last_user_id 다음 user 부터 batch_size 명의 메일을 outbox 에
+          넣습니다.
+        - outbox 와 last_user_id 를 같은 transaction 에서 저장하므로 중간에
+          멈춰도 이미 넣은 user 에게 다시 보내지 않습니다.
+        - patch note 를 잠그므로 여러 worker 가 같은 user 를 넣지 않습니다.
+        - 모두 넣었으면 True 를 반환합니다.
+        """
+        with transaction.atomic():
+            patch_note = cls.objects.select_for_update().get(id=id)
+            if patch_note.email_sent:
+                return True
+            if patch_note.last_user_id == 0:
+                sentry_sdk.capture_message(
+                    f"Patch note title : {patch_note.title}, "
+                    "Sending email to users"
+                )
+            users = list(
+                User.objects.filter(
+                    id__gt=patch_note.last_user_id,
+                    deleted_at__isnull=True,
+                    is_staff=False,
+                )
+                .order_by("id")
+                .values_list("id", "username")[:batch_size]
+            )
+            if users:
+                EmailOutbox.objects.enqueue(
+                    [username for _, username in users],
+                    patch_note.get_subject(),
+                    patch_note=patch_note,
+                )
+                patch_note.last_user_id = users[-1][0]
+            email_sent = len(users) < batch_size
+            cls.objects.filter(id=id).update(
+                last_user_id=patch_note.last_user_id,
+                recipient_count=models.F("recipient_count") + len(users),
+                email_sent=email_sent,
+            )
+            return email_sent
+
+
+class EmailOutboxManager(models.Manager):
+    def enqueue(self, to_email_addresses, subject, message="", **kwargs):
+        """
+        - 받는 사람마다 한 줄씩 outbox 에 넣습니다.
+        - transaction 이 commit 되면 email_queued 로 EmailSender 를 깨웁니다.
+        """
+        emails = self.bulk_create(
+            self.model(
+                to_email=to_email_address,
                 subject=subject,
                 message=message,
+                **kwargs,
             )
-            return user_email_list
-        except Exception as e:
-            sentry_sdk.capture_exception(e)
+            for to_email_address in to_email_addresses
+        )
+        transaction.on_commit(lambda: email_queued.send(sender=self.model))
+        return emails
+
+
+class EmailOutbox(models.Model):
+    """
+    - 보낼 메일을 받는 사람마다 한 줄씩 저장합니다.
+    - next_attempt_at 이 지난 PENDING 메일을 EmailSender 가 보냅니다.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING"
+        SENT = "SENT"
+        FAILED = "FAILED"
+
+    to_email = models.CharField(max_length=254)
+    subject = models.CharField(max_length=255)
+    # 비어 있으면 patch_note 의 html_file 을 보냅니다.
+    message = models.TextField(blank=True, default="")
+    patch_note = models.ForeignKey(
+        PatchNote, null=True, blank=True, on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    provider_id = models.CharField(max_length=64, null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = EmailOutboxManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="email_outbox_due_idx",
+            ),
+        ]
+
+
+def send_welcome_email(to_email_address, user_name):
+    EmailOutbox.objects.enqueue(
+        [to_email_address],
+        WELCOME_EMAIL_SUBJECT,
+        get_welcome_email(user_name),
+    )
 
 
 class DelayReason(models.Model):
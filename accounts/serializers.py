@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from accounts.models import Profile
+from onestep_be.renderers import CamelCaseSerializerMixin
 
 User = get_user_model()
 
@@ -36,7 +37,7 @@ class LoginPayloadSerializer(LoginRequestSerializer):
         return super().is_valid(raise_exception=raise_exception)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CamelCaseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -46,10 +47,11 @@ class UserSerializer(serializers.ModelSerializer):
             "social_provider",
             "is_subscribed",
             "is_premium",
+            "utc_offset",
         ]
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(CamelCaseSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Profile
         fields = [
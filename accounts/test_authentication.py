@@ -0,0 +1,67 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.cache import UserCache, user_cache
+from accounts.tokens import CustomRefreshToken
+
+
+def get_client(user):
+    token = CustomRefreshToken.for_user(user, "device").access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
+
+
+def count_user_selects(context):
+    return sum(
+        'FROM "accounts_user"' in query["sql"]
+        or "FROM `accounts_user`" in query["sql"]
+        for query in context.captured_queries
+    )
+
+
+@pytest.mark.django_db
+def test_authentication_reuses_cached_user(create_user):
+    client = get_client(create_user)
+    assert client.get(reverse("category")).status_code == 200
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse("category"))
+    assert response.status_code == 200
+    assert count_user_selects(context) == 0
+
+
+@pytest.mark.django_db
+def test_authentication_payload(create_user):
+    client = get_client(create_user)
+    response = client.get(reverse("category"))
+    assert response.wsgi_request.auth["device"] == "device"
+
+
+@pytest.mark.django_db
+def test_user_save_invalidates_cache(create_user):
+    client = get_client(create_user)
+    client.get(reverse("category"))
+    assert user_cache.get(create_user.id) is not None
+
+    create_user.is_premium = True
+    create_user.save()
+    assert user_cache.get(create_user.id) is None
+    client.get(reverse("category"))
+    assert user_cache.get(create_user.id).is_premium
+
+
+def test_user_cache_is_lru_with_ttl(monkeypatch):
+    cache = UserCache(maxsize=2, ttl=10)
+    now = [100.0]
+    monkeypatch.setattr("accounts.cache.time.monotonic", lambda: now[0])
+    cache.set(1, "first")
+    cache.set(2, "second")
+    cache.get(1)
+    cache.set(3, "third")
+    assert cache.get(2) is None
+    assert cache.get(1) == "first"
+    now[0] += 10
+    assert cache.get(1) is None
@@ -0,0 +1,201 @@
+import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from resend.exceptions import ApplicationError, ValidationError
+
+from accounts import emails
+from accounts.emails import (
+    enqueue_patch_notes,
+    process_outbox,
+    send_pending_emails,
+)
+from accounts.models import EmailOutbox, PatchNote, User
+
+"""
+======================================
+# Email outbox checklist #
+- welcome email is queued, not sent, on first login
+- patch note save returns without queueing emails
+- patch note queues users in keyset batches and resumes from checkpoint
+- patch note broadcast is sent by process_outbox
+- next patch note batch waits until the previous one is no longer pending
+- pending emails are sent in batches with provider ids
+- transient errors are retried with backoff
+- rejected emails are failed one by one
+======================================
+"""
+
+
+@pytest.fixture(autouse=True)
+def no_rate_limit(monkeypatch):
+    monkeypatch.setattr(emails.rate_limiter, "wait", lambda: None)
+
+
+def batch_response(params):
+    return {"data": [{"id": f"id-{i}"} for i in range(len(params))]}
+
+
+@pytest.fixture
+def patch_note(db, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return PatchNote(
+        title="v2",
+        html_file=SimpleUploadedFile("note.html", b"<p>new</p>"),
+    )
+
+
+@pytest.mark.django_db
+def test_welcome_email_queued_on_signup():
+    with patch("accounts.emails.resend.Batch.send") as send:
+        User.get_or_create_user("new@example.com")
+    send.assert_not_called()
+    email = EmailOutbox.objects.get()
+    assert email.to_email == "new@example.com"
+    assert email.status == EmailOutbox.Status.PENDING
+    assert "new@example.com" in email.message
+
+
+@pytest.mark.django_db
+def test_patch_note_save_queues_nothing(
+    create_user, patch_note, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        patch_note.save()
+    assert len(callbacks) == 1
+    assert not EmailOutbox.objects.exists()
+    assert patch_note.email_sent is False
+
+
+@pytest.mark.django_db
+def test_patch_note_queued_in_batches(create_user, patch_note):
+    usernames = [f"user{i}@example.com" for i in range(4)]
+    for username in usernames:
+        User.objects.create(username=username)
+    User.objects.create(username="staff@example.com", is_staff=True)
+    patch_note.save()
+
+    assert PatchNote.enqueue_next_batch(patch_note.id, batch_size=2) is False
+    patch_note.refresh_from_db()
+    queued = EmailOutbox.objects.filter(patch_note=patch_note)
+    assert queued.count() == 2
+    assert (
+        patch_note.last_user_id == User.objects.get(username=usernames[0]).id
+    )
+
+    # 중간에 멈췄다가 다시 시작해도 이미 넣은 user 는 건너뜁니다.
+    while not PatchNote.enqueue_next_batch(patch_note.id, batch_size=2):
+        pass
+    patch_note.refresh_from_db()
+    assert patch_note.email_sent is True
+    assert patch_note.recipient_count == 5
+    assert sorted(queued.values_list("to_email", flat=True)) == sorted(
+        [create_user.username, *usernames]
+    )
+    assert set(queued.values_list("message", flat=True)) == {""}
+    assert PatchNote.enqueue_next_batch(patch_note.id) is True
+    assert queued.count() == 5
+
+
+@pytest.mark.django_db
+def test_patch_note_sent_by_process_outbox(create_user, patch_note):
+    patch_note.save()
+    EmailOutbox.objects.enqueue(["a@example.com"], "hello", "<p>hi</p>")
+    send = Mock(side_effect=batch_response)
+    with patch("accounts.emails.resend.Batch.send", send):
+        assert process_outbox() == 2
+    patch_note.refresh_from_db()
+    assert patch_note.email_sent is True
+    assert not EmailOutbox.objects.exclude(
+        status=EmailOutbox.Status.SENT
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_patch_note_next_batch_waits_for_pending(create_user, patch_note):
+    for i in range(3):
+        User.objects.create(username=f"user{i}@example.com")
+    patch_note.save()
+    queued = EmailOutbox.objects.filter(patch_note=patch_note)
+
+    assert enqueue_patch_notes(batch_size=2) is True
+    assert enqueue_patch_notes(batch_size=2) is False
+    assert queued.count() == 2
+
+    # 재시도를 기다리는 메일이 있으면 다음 batch 를 넣지 않습니다.
+    error = ApplicationError("unavailable", "application_error", "500")
+    with patch("accounts.emails.resend.Batch.send", side_effect=error):
+        send_pending_emails()
+    assert enqueue_patch_notes(batch_size=2) is False
+    assert queued.count() == 2
+
+    queued.update(next_attempt_at=timezone.now())
+    send = Mock(side_effect=batch_response)
+    with patch("accounts.emails.resend.Batch.send", send):
+        assert send_pending_emails() == 2
+    assert enqueue_patch_notes(batch_size=2) is True
+    assert queued.count() == 4
+
+
+@pytest.mark.django_db
+def test_pending_emails_sent_in_batches(create_user, patch_note):
+    patch_note.save()
+    PatchNote.enqueue_next_batch(patch_note.id)
+    EmailOutbox.objects.enqueue(["a@example.com"], "hello", "<p>hi</p>")
+    send = Mock(side_effect=batch_response)
+    with patch("accounts.emails.resend.Batch.send", send):
+        assert send_pending_emails(batch_size=1) == 2
+    assert send.call_count == 2
+    params = [call.args[0][0] for call in send.call_args_list]
+    assert {param["html"] for param in params} == {"<p>new</p>", "<p>hi</p>"}
+    assert all(isinstance(param["to"], str) for param in params)
+    for email in EmailOutbox.objects.all():
+        assert email.status == EmailOutbox.Status.SENT
+        assert email.provider_id == "id-0"
+        assert email.attempts == 1
+
+
+@pytest.mark.django_db
+def test_transient_error_retried_with_backoff():
+    EmailOutbox.objects.enqueue(["a@example.com"], "hello", "<p>hi</p>")
+    error = ApplicationError("unavailable", "application_error", "500")
+    with patch("accounts.emails.resend.Batch.send", side_effect=error):
+        send_pending_emails()
+    email = EmailOutbox.objects.get()
+    assert email.status == EmailOutbox.Status.PENDING
+    assert email.attempts == 1
+    assert email.next_attempt_at > timezone.now() + datetime.timedelta(
+        seconds=emails.EMAIL_SEND_RETRY_BACKOFF - 5
+    )
+
+    # 재시도 시각이 지나야 다시 보냅니다.
+    send = Mock(side_effect=batch_response)
+    with patch("accounts.emails.resend.Batch.send", send):
+        assert send_pending_emails() == 0
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        assert send_pending_emails() == 1
+    email.refresh_from_db()
+    assert email.status == EmailOutbox.Status.SENT
+    assert email.attempts == 2
+
+
+@pytest.mark.django_db
+def test_rejected_batch_sent_one_by_one():
+    EmailOutbox.objects.enqueue(
+        ["a@example.com", "invalid"], "hello", "<p>hi</p>"
+    )
+
+    def send(params):
+        if any(param["to"] == "invalid" for param in params):
+            raise ValidationError("invalid to", "validation_error", "422")
+        return batch_response(params)
+
+    with patch("accounts.emails.resend.Batch.send", side_effect=send):
+        send_pending_emails()
+    statuses = dict(EmailOutbox.objects.values_list("to_email", "status"))
+    assert statuses == {
+        "a@example.com": EmailOutbox.Status.SENT,
+        "invalid": EmailOutbox.Status.FAILED,
+    }
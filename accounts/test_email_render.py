@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+import pytest
+from django.template import engines
+from django.template.loader import get_template, render_to_string
+
+from accounts.utils import EmailTemplate, get_email_template, get_welcome_email
+
+
+@pytest.fixture(autouse=True)
+def clear_email_templates():
+    get_email_template.cache_clear()
+    yield
+    get_email_template.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "user_name",
+    ["user@example.com", "<script>'&\"</script>", "{username} {0}", "한글"],
+)
+def test_welcome_email_matches_template(user_name):
+    assert get_welcome_email(user_name) == render_to_string(
+        "welcome_email.html", {"username": user_name}
+    )
+
+
+def test_welcome_email_template_loaded_once():
+    with patch(
+        "accounts.utils.get_template", wraps=get_template
+    ) as load_template:
+        for i in range(3):
+            get_welcome_email(f"user{i}")
+    assert load_template.call_count == 1
+
+
+def test_email_template_falls_back_to_template_render():
+    template = engines["django"].from_string("<p>{{ username|upper }}</p>")
+    with patch("accounts.utils.get_template", return_value=template):
+        email_template = EmailTemplate("upper.html", ["username"])
+    assert email_template.format is None
+    assert email_template.render(username="a&b") == "<p>A&amp;B</p>"
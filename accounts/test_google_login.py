@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts import views
+from accounts.keys import CachedCertsRequest, PublicKeyCache, parse_certs
+
+CLIENT_ID = "test-client-id"
+
+
+def generate_key():
+    private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_key, public_pem.decode()
+
+
+class CertsServer(ThreadingHTTPServer):
+    """
+    - Google 의 인증서 endpoint 를 대신하는 로컬 서버입니다.
+    """
+
+    def __init__(self, certs, max_age=3600):
+        super().__init__(("127.0.0.1", 0), CertsHandler)
+        self.certs = certs
+        self.max_age = max_age
+        self.request_count = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/oauth2/v1/certs"
+
+
+class CertsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.request_count += 1
+        body = json.dumps(self.server.certs).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header(
+            "Cache-Control", f"public, max-age={self.server.max_age}"
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def patch_send_welcome_email(monkeypatch):
+    monkeypatch.setattr(
+        "accounts.models.send_welcome_email", lambda *args, **kwargs: None
+    )
+
+
+@pytest.fixture
+def signing_key():
+    return generate_key()
+
+
+@pytest.fixture
+def certs_server(signing_key, monkeypatch):
+    server = CertsServer({"kid-1": signing_key[1]})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    certs = PublicKeyCache(server.url, parse_certs)
+    monkeypatch.setattr(views, "google_certs", certs)
+    monkeypatch.setattr(
+        views,
+        "google_request",
+        CachedCertsRequest(views.GOOGLE_OAUTH2_CERTS_URL, certs),
+    )
+    monkeypatch.setattr(views, "GOOGLE_ANDROID_CLIENT_ID", CLIENT_ID)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_token(private_key, kid="kid-1", **claims):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234",
+        "email": "testuser@example.com",
+        "iat": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(
+        payload, private_key, algorithm="RS256", headers={"kid": kid}
+    )
+
+
+def login(token):
+    return APIClient().post(
+        reverse("google_login"), {"token": token, "type": 0}, format="json"
+    )
+
+
+@pytest.mark.django_db
+def test_google_login_fetches_certs_once(certs_server, signing_key):
+    for _ in range(3):
+        response = login(make_token(signing_key[0]))
+        assert response.status_code == 200
+        assert response.data["email"] == "testuser@example.com"
+    assert certs_server.request_count == 1
+
+
+@pytest.mark.django_db
+def test_google_login_refetches_expired_certs(certs_server, signing_key):
+    certs_server.max_age = 0
+    assert login(make_token(signing_key[0])).status_code == 200
+    assert login(make_token(signing_key[0])).status_code == 200
+    assert certs_server.request_count == 2
+
+
+@pytest.mark.django_db
+def test_google_login_rejects_invalid_tokens(certs_server, signing_key):
+    other_key, _ = generate_key()
+    assert login(make_token(other_key)).status_code == 400
+    assert login(make_token(signing_key[0], aud="other")).status_code == 400
+    assert (
+        login(make_token(signing_key[0], iss="https://evil.com")).status_code
+        == 400
+    )
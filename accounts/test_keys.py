@@ -0,0 +1,111 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from accounts import keys
+from accounts.keys import PublicKeyCache, get_cache_ttl
+
+
+def make_response(data, headers=None):
+    response = Mock()
+    response.json.return_value = data
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    get = Mock()
+    monkeypatch.setattr(keys.http_session, "get", get)
+    return get
+
+
+def parse_keys(data):
+    return dict(data)
+
+
+def test_keys_are_cached_until_expiry(fake_get, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(keys.time, "monotonic", lambda: now[0])
+    fake_get.return_value = make_response(
+        {"a": "key-a"}, {"Cache-Control": "public, max-age=60"}
+    )
+    cache = PublicKeyCache("https://keys", parse_keys)
+    assert cache.get("a") == "key-a"
+    assert cache.get("a") == "key-a"
+    assert fake_get.call_count == 1
+
+    now[0] += 60
+    assert cache.get("a") == "key-a"
+    assert fake_get.call_count == 2
+
+
+def test_unknown_kid_refreshes_once(fake_get, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(keys.time, "monotonic", lambda: now[0])
+    fake_get.return_value = make_response({"a": "key-a"})
+    cache = PublicKeyCache("https://keys", parse_keys, min_refresh_interval=10)
+    cache.get("a")
+
+    fake_get.return_value = make_response({"a": "key-a", "b": "key-b"})
+    now[0] += 10
+    assert cache.get("b") == "key-b"
+    assert fake_get.call_count == 2
+    with pytest.raises(KeyError):
+        cache.get("c")
+    assert fake_get.call_count == 2
+
+
+def test_concurrent_misses_fetch_once(fake_get):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_get(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return make_response({"a": "key-a"})
+
+    fake_get.side_effect = slow_get
+    cache = PublicKeyCache("https://keys", parse_keys)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("a")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["key-a"] * 5
+    assert fake_get.call_count == 1
+
+
+def test_stale_keys_are_kept_on_error(fake_get, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(keys.time, "monotonic", lambda: now[0])
+    fake_get.return_value = make_response({"a": "key-a"})
+    cache = PublicKeyCache("https://keys", parse_keys)
+    cache.get("a")
+
+    now[0] += keys.PUBLIC_KEY_DEFAULT_TTL
+    fake_get.side_effect = requests.ConnectionError()
+    assert cache.get("a") == "key-a"
+    assert cache.get("a") == "key-a"
+    assert fake_get.call_count == 2
+
+
+def test_cache_ttl_from_headers():
+    assert get_cache_ttl(make_response({}, {"Cache-Control": "max-age=30"}))
+    assert (
+        get_cache_ttl(
+            make_response({}, {"Cache-Control": "max-age=30", "Age": "10"})
+        )
+        == 20
+    )
+    assert get_cache_ttl(make_response({}, {"Cache-Control": "no-cache"})) == 0
+    assert get_cache_ttl(make_response({}), default=5) == 5
@@ -25,13 +25,15 @@ def test_user_info(create_user):
         force_authenticate(request, user=create_user)
         response = view(request)
         assert response.status_code == 200
+        # UserSerializer 는 camelCase key 로 바로 출력합니다.
         assert response.data == {
             "id": 1,
             "email": create_user.email,
             "username": create_user.username,
-            "social_provider": "GOOGLE",
-            "is_subscribed": False,
-            "is_premium": False,
+            "socialProvider": "GOOGLE",
+            "isSubscribed": False,
+            "isPremium": False,
+            "utcOffset": 540,
         }
 
 
@@ -46,7 +48,7 @@ def test_update_user_is_subscribed(
     }
     response = authenticated_client.patch(url, data, format="json")
     assert response.status_code == 200
-    assert response.data["is_subscribed"]
+    assert response.data["isSubscribed"]
 
 
 @pytest.mark.django_db
@@ -60,7 +62,43 @@ def test_update_user_is_premium(
     }
     response = authenticated_client.patch(url, data, format="json")
     assert response.status_code == 200
-    assert response.data["is_premium"]
+    assert response.data["isPremium"]
+
+
+@pytest.mark.django_db
+def test_update_user_utc_offset(
+    create_user,
+    authenticated_client,
+):
+    url = reverse("user")
+    response = authenticated_client.patch(
+        url, {"utc_offset": -300}, format="json"
+    )
+    assert response.status_code == 200
+    assert response.data["utcOffset"] == -300
+
+    response = authenticated_client.patch(
+        url, {"utc_offset": 2000}, format="json"
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_update_user_keeps_other_changes(
+    create_user,
+    authenticated_client,
+):
+    url = reverse("user")
+    # 인증에서 다시 쓰이는 복사본이 남은 상태로 다른 process 처럼 바꿉니다.
+    User.objects.filter(id=create_user.id).update(is_premium=True)
+    response = authenticated_client.patch(
+        url, {"utc_offset": -300}, format="json"
+    )
+    assert response.status_code == 200
+    assert response.data["isPremium"]
+    user = User.objects.get(id=create_user.id)
+    assert user.is_premium
+    assert user.utc_offset == -300
 
 
 @pytest.mark.django_db
@@ -1,8 +1,15 @@
+import functools
+import re
+import uuid
 from dataclasses import dataclass
 from typing import List, Union
 
 import resend
-from django.template.loader import render_to_string
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+
+# compile 결과를 검증할 때 쓰는 값으로, escape 되는 문자를 모두 포함합니다.
+EMAIL_TEMPLATE_CHECK_VALUE = "<a href=\"x\">'&'</a> {0}"
 
 
 @dataclass
@@ -28,11 +35,14 @@ class SendParams:
         }
 
 
+FROM_EMAIL_ADDRESS = "developers@stepby.one"
+
+
 def send_email(
     to_email_address: Union[str, List[str]], subject: str, message: str
 ):
     params = SendParams(
-        from_email_address="developers@stepby.one",
+        from_email_address=FROM_EMAIL_ADDRESS,
         to_email_address=to_email_address,
         subject=subject,
         message=message,
@@ -42,17 +52,60 @@ def send_email(
     return email
 
 
-def send_welcome_email(
-    to_email_address: Union[str, List[str]], user_name: str
-):
-    html_message = render_to_string(
-        "welcome_email.html", {"username": user_name}
-    )
-    send_email(to_email_address, "Welcome to join us", html_message)
+class EmailTemplate:
+    """
+    - template 을 한 번 렌더링해서 정적인 HTML 을 format 문자열로 저장합니다.
+    - render 는 변수 값을 escape 해서 끼워 넣기만 하므로 template 엔진을
+      거치지 않습니다.
+    - 변수에 filter 나 조건문이 있어 결과가 달라지면 template 으로
+      렌더링합니다.
+    """
+
+    def __init__(self, template_name, variables):
+        self.template = get_template(template_name)
+        self.variables = tuple(variables)
+        self.format = self.compile()
+
+    def compile(self):
+        markers = {name: f"email{uuid.uuid4().hex}" for name in self.variables}
+        rendered = self.template.render(markers)
+        names = {marker: name for name, marker in markers.items()}
+        tokens = re.split(f"({'|'.join(names)})", rendered)
+        format_string = "".join(
+            "{" + names[token] + "}"
+            if i % 2
+            else token.replace("{", "{{").replace("}", "}}")
+            for i, token in enumerate(tokens)
+        )
+        context = dict.fromkeys(self.variables, EMAIL_TEMPLATE_CHECK_VALUE)
+        expected = self.template.render(context)
+        if self.substitute(format_string, context) != expected:
+            return None
+        return format_string
+
+    def substitute(self, format_string, context):
+        return format_string.format_map(
+            {
+                name: conditional_escape(context[name])
+                for name in self.variables
+            }
+        )
+
+    def render(self, **context):
+        if self.format is None:
+            return self.template.render(context)
+        return self.substitute(self.format, context)
+
+
+@functools.lru_cache(maxsize=None)
+def get_email_template(template_name, variables):
+    """
+    - template 마다 프로세스에서 한 번만 불러와 compile 합니다.
+    """
+    return EmailTemplate(template_name, variables)
 
 
 def get_welcome_email(user_name):
-    html_message = render_to_string(
-        "welcome_email.html", {"username": user_name}
+    return get_email_template("welcome_email.html", ("username",)).render(
+        username=user_name
     )
-    return html_message
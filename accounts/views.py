@@ -1,12 +1,9 @@
 import jwt
-import requests
 import sentry_sdk
-import urllib3
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from drf_yasg.utils import swagger_auto_schema
 from fcm_django.models import FCMDevice
-from google.auth.transport import requests as google_requests
 from google.oauth2 import id_token
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -14,6 +11,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from accounts.exceptions import LoginException
+from accounts.keys import (
+    CachedCertsRequest,
+    PublicKeyCache,
+    parse_certs,
+    parse_jwks,
+)
 from accounts.models import Profile
 from accounts.serializers import (
     ProfileSerializer,
@@ -31,6 +34,18 @@ GOOGLE_IOS_CLIENT_ID = settings.SECRETS.get("GOOGLE_IOS_CLIENT_ID")
 DEVICE_TYPE_ANDROID = 0
 DEVICE_TYPE_IOS = 1
 
+APPLE_PUBLIC_KEYS_URL = "https://appleid.apple.com/auth/keys"
+apple_public_keys = PublicKeyCache(APPLE_PUBLIC_KEYS_URL, parse_jwks)
+
+# id_token.verify_oauth2_token 이 인증서를 받아오는 URL 입니다.
+GOOGLE_OAUTH2_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+# 테스트에서는 대신 인증서를 내려주는 endpoint 로 바꿀 수 있습니다.
+GOOGLE_CERTS_URL = getattr(
+    settings, "GOOGLE_CERTS_URL", GOOGLE_OAUTH2_CERTS_URL
+)
+google_certs = PublicKeyCache(GOOGLE_CERTS_URL, parse_certs)
+google_request = CachedCertsRequest(GOOGLE_OAUTH2_CERTS_URL, google_certs)
+
 
 class BaseLogin(APIView):
     authentication_classes = []
@@ -80,7 +95,7 @@ class GoogleLogin(BaseLogin):
         audience = self.get_audience(device_type)
         idinfo = id_token.verify_oauth2_token(
             token,
-            google_requests.Request(),
+            google_request,
             audience=audience,
         )
         self.validate_issuer(idinfo)
@@ -101,7 +116,6 @@ class GoogleLogin(BaseLogin):
 
 class AppleLogin(BaseLogin):
     APPLE_APP_ID = settings.SECRETS.get("APPLE_APP_ID")
-    APPLE_PUBLIC_KEYS_URL = "https://appleid.apple.com/auth/keys"
 
     def verify_token(self, device_type, identity_token):
         if device_type != DEVICE_TYPE_IOS:
@@ -130,13 +144,10 @@ class AppleLogin(BaseLogin):
             raise LoginException(f"An unexpected error occurred: {e}")
 
     def get_apple_public_key(self, kid):
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        response = requests.get(self.APPLE_PUBLIC_KEYS_URL, verify=False)
-        keys = response.json().get("keys", [])
-        for key in keys:
-            if key["kid"] == kid:
-                return jwt.algorithms.RSAAlgorithm.from_jwk(key)
-        raise ValueError("Matching key not found")
+        try:
+            return apple_public_keys.get(kid)
+        except KeyError:
+            raise ValueError("Matching key not found")
 
 
 class UserRetrieveView(APIView):
@@ -172,21 +183,41 @@ class UserRetrieveView(APIView):
 
     def patch(self, request):
         """
-        입력 : is_subscribe (Boolean), is_premium (Boolean)
+        입력 : is_subscribe (Boolean), is_premium (Boolean),
+        utc_offset (Integer, 분 단위)
         """
         try:
-            user = request.user
+            # request.user 는 user_cache 의 복사본이라 다른 process 의 변경이
+            # 빠져 있을 수 있으므로 DB 에서 다시 읽고 바뀐 field 만 저장합니다.
+            user = User.objects.get(id=request.user.id)
             sentry_sdk.set_user(
                 {
                     "id": request.user.id,
                     "username": request.user.username,
                 }
             )
+            update_fields = []
             if request.data.get("is_premium"):
                 user.is_premium = request.data.get("is_premium")
+                update_fields.append("is_premium")
             if request.data.get("is_subscribed"):
                 user.is_subscribed = request.data.get("is_subscribed")
-            user.save()
+                update_fields.append("is_subscribed")
+            if request.data.get("utc_offset") is not None:
+                serializer = UserSerializer(
+                    user,
+                    data={"utc_offset": request.data.get("utc_offset")},
+                    partial=True,
+                )
+                if not serializer.is_valid():
+                    return Response(
+                        {"error": serializer.errors},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                user.utc_offset = serializer.validated_data["utc_offset"]
+                update_fields.append("utc_offset")
+            if update_fields:
+                user.save(update_fields=update_fields)
             serializer = UserSerializer(user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except User.DoesNotExist as e:
@@ -2,12 +2,17 @@
 # This file is used to define fixtures that can be used in multiple test files
 
 import random
+from contextlib import contextmanager
 from unittest.mock import Mock
 
 import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from faker import Faker
 from rest_framework.test import APIClient
 
+from accounts.cache import user_cache
 from accounts.models import DelayReason, Profile
 from todos.models import Category, SubTodo, Todo, User
 
@@ -16,6 +21,32 @@ client = APIClient()
 fake = Faker()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    user_cache.clear()
+    yield
+    cache.clear()
+    user_cache.clear()
+
+
+# SAVEPOINT / RELEASE SAVEPOINT 를 뺀 실행 query 를 모으는 fixture
+@pytest.fixture
+def capture_queries():
+    @contextmanager
+    def capture():
+        queries = []
+        with CaptureQueriesContext(connection) as context:
+            yield queries
+        queries.extend(
+            query["sql"]
+            for query in context.captured_queries
+            if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+        )
+
+    return capture
+
+
 @pytest.fixture(scope="module")
 def invalid_token():
     response = {
@@ -172,6 +203,14 @@ def patch_send_push_notification_device(monkeypatch):
     )
 
 
+# outbox 메일을 보내는 worker 를 기본적으로 disable하는 fixture
+@pytest.fixture(autouse=True)
+def patch_email_sender(monkeypatch):
+    monkeypatch.setattr(
+        "accounts.emails.email_sender.wake", lambda *args, **kwargs: None
+    )
+
+
 @pytest.fixture
 def username():
     return fake.user_name()
@@ -2,9 +2,12 @@ from rest_framework import serializers
 
 from accounts.models import User
 from feedback.models import Feedback
+from onestep_be.renderers import CamelCaseSerializerMixin
 
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(
+    CamelCaseSerializerMixin, serializers.ModelSerializer
+):
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), required=True
     )
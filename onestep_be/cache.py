@@ -0,0 +1,11 @@
+from django.db import transaction
+
+
+def invalidate_on_commit(invalidate):
+    """
+    - invalidate 를 바로 실행하고 transaction commit 후 한 번 더 실행합니다.
+    - commit 전에 다른 request 가 이전 값을 다시 cache 해도 commit 후에
+      지워집니다.
+    """
+    invalidate()
+    transaction.on_commit(invalidate)
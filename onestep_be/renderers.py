@@ -0,0 +1,161 @@
+import functools
+
+import orjson
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as BaseCamelCaseJSONRenderer,
+)
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import camelize
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+camelize_options = api_settings.JSON_UNDERSCOREIZE
+
+
+def dumps(data):
+    """
+    - JSONRenderer 와 같은 바이트를 만듭니다(compact, UTF-8).
+    - JSONRenderer 처럼 U+2028 / U+2029 는 escape 합니다.
+    """
+    return (
+        orjson.dumps(data)
+        .replace(b"\xe2\x80\xa8", b"\\u2028")
+        .replace(b"\xe2\x80\xa9", b"\\u2029")
+    )
+
+
+def loads_rendered(rendered):
+    return RenderedJSON(orjson.loads(rendered), rendered)
+
+
+class RenderedJSON(list):
+    """
+    - camelCase JSON 으로 미리 렌더링된 목록입니다.
+    - CamelCaseJSONRenderer 는 camelize / 인코딩 없이 rendered 를 그대로
+      씁니다.
+    - pickle 에는 rendered 만 저장하므로 cache 크기가 늘지 않습니다.
+    """
+
+    def __init__(self, data, rendered=None):
+        super().__init__(data)
+        self.rendered = dumps(data) if rendered is None else rendered
+
+    def __reduce__(self):
+        return loads_rendered, (self.rendered,)
+
+
+@functools.lru_cache(maxsize=None)
+def camelize_key(key):
+    """
+    - CamelCaseJSONRenderer 와 같은 규칙으로 key 하나를 camelCase 로 바꿉니다.
+    """
+    return next(iter(camelize({key: None}, **camelize_options)))
+
+
+def is_represented(serializer):
+    """
+    - serializer.data 가 to_representation 의 결과인지 반환합니다.
+    - 검증 실패나 초기값인 경우는 snake_case 그대로입니다.
+    """
+    if getattr(serializer, "_errors", None):
+        return False
+    return serializer.instance is not None or hasattr(
+        serializer, "_validated_data"
+    )
+
+
+class CamelCaseReturnDict(ReturnDict):
+    pass
+
+
+class CamelCaseReturnList(ReturnList):
+    pass
+
+
+class CamelCaseListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        data = super().data
+        if is_represented(self):
+            return CamelCaseReturnList(data, serializer=self)
+        return data
+
+
+class CamelCaseSerializerMixin:
+    """
+    - to_representation 에서 camelCase key 로 바로 출력합니다.
+    - key 는 class 를 정의할 때 만든 camel_keys 로 바꾸므로 정규식을 다시
+      돌리지 않습니다.
+    - CamelCaseJSONRenderer 는 이 serializer 의 data 를 다시 camelize 하지
+      않습니다.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, "Meta", None)
+        names = list(cls._declared_fields)
+        if meta is not None:
+            if not hasattr(meta, "list_serializer_class"):
+                meta.list_serializer_class = CamelCaseListSerializer
+            if isinstance(getattr(meta, "fields", None), (list, tuple)):
+                names.extend(meta.fields)
+        cls.camel_keys = {name: camelize_key(name) for name in names}
+
+    @property
+    def data(self):
+        data = super().data
+        if is_represented(self):
+            return CamelCaseReturnDict(data, serializer=self)
+        return data
+
+    def to_representation(self, instance):
+        ignore_fields = camelize_options.get("ignore_fields") or ()
+        ret = {}
+        for field in self._readable_fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            name = field.field_name
+            key = self.camel_keys.get(name) or camelize_key(name)
+            check_for_none = (
+                attribute.pk
+                if isinstance(attribute, PKOnlyObject)
+                else attribute
+            )
+            if check_for_none is None:
+                ret[key] = None
+                continue
+            value = field.to_representation(attribute)
+            if (
+                isinstance(value, (dict, list))
+                and not isinstance(
+                    getattr(field, "child", field), CamelCaseSerializerMixin
+                )
+                and name not in ignore_fields
+                and key not in ignore_fields
+            ):
+                value = camelize(value, **camelize_options)
+            ret[key] = value
+        return ret
+
+
+class CamelCaseJSONRenderer(BaseCamelCaseJSONRenderer):
+    """
+    - RenderedJSON 은 렌더링된 바이트를 그대로 씁니다.
+    - CamelCaseSerializerMixin 의 data 는 camelize 없이 JSON 으로 바꿉니다.
+    - 나머지는 djangorestframework_camel_case 와 같이 camelize 합니다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, RenderedJSON) and not self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return data.rendered
+        if isinstance(data, (CamelCaseReturnDict, CamelCaseReturnList)):
+            return super(BaseCamelCaseJSONRenderer, self).render(
+                data, accepted_media_type, renderer_context
+            )
+        return super().render(data, accepted_media_type, renderer_context)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 from urllib.parse import urlparse
@@ -78,21 +79,78 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "djangorestframework_camel_case.middleware.CamelCaseMiddleWare",
+    "todos.middleware.CamelCaseMiddleware",
 ]
 
+# Alarms are sent at 08:00 / 14:00 / 20:00 in each user's local time.
+# Every 15 minutes only the users whose local time hits one of those
+# hours are processed. Run several workers with different
+# ALARM_SHARD_INDEX values to split users by user_id % ALARM_SHARD_COUNT.
 CRONJOBS = [
-    ("0 8 * * *", "todos.jobs.send_morning_alarm"),
-    ("0 14 * * *", "todos.jobs.send_afternoon_alarm"),
-    ("0 20 * * *", "todos.jobs.send_evening_alarm"),
+    ("*/15 * * * *", "todos.jobs.send_scheduled_alarms"),
+    ("* * * * *", "accounts.emails.process_outbox"),
 ]
+ALARM_SHARD_INDEX = int(os.environ.get("ALARM_SHARD_INDEX", 0))
+ALARM_SHARD_COUNT = int(os.environ.get("ALARM_SHARD_COUNT", 1))
+
+# Sync push notifications are sent by background worker threads
+# (todos.firebase_messaging.PushDispatcher)
+PUSH_DISPATCH_WORKERS = 2
+PUSH_DISPATCH_MAX_RETRIES = 3
+PUSH_DISPATCH_RETRY_BACKOFF = 0.5
+PUSH_DISPATCH_QUEUE_SIZE = 10000
+# Sync pushes of one user within this many seconds are sent as one
+PUSH_COALESCE_WINDOW = 2.0
+# Push dispatch metrics are logged at most once per this many seconds
+PUSH_METRICS_LOG_INTERVAL = 60
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "todos.firebase_messaging": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
+# Emails are written to accounts.EmailOutbox and sent by a background
+# thread (accounts.emails.EmailSender) through the Resend batch API.
+# Patch notes are queued PATCH_NOTE_ENQUEUE_BATCH_SIZE users at a time,
+# checkpointed on PatchNote.last_user_id. The cron job above resumes
+# whatever a stopped worker left behind.
+EMAIL_SEND_BATCH_SIZE = 100
+EMAIL_SEND_RATE_LIMIT = 2
+EMAIL_SEND_MAX_ATTEMPTS = 5
+EMAIL_SEND_RETRY_BACKOFF = 30
+EMAIL_SEND_LEASE = 300
+EMAIL_SEND_POLL_INTERVAL = 30
+
+# Todo / inbox list cache (todos.cache). Cached lists are keyed by the ETag
+# built from the DB fingerprint, so a write on another gunicorn worker is
+# seen even with the per-process LocMemCache; set REDIS_URL to share the
+# cached lists between workers.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+    TODO_CACHE_TIMEOUT = 300
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+    TODO_CACHE_TIMEOUT = 5
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "accounts.authentication.CustomJWTAuthentication",
     ),
     "DEFAULT_RENDERER_CLASSES": (
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
+        "onestep_be.renderers.CamelCaseJSONRenderer",
         "djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer",
     ),
     "DEFAULT_PARSER_CLASSES": (
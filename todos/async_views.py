@@ -0,0 +1,81 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """
+    - handler 를 async def 로 정의하는 APIView 입니다.
+    - 인증, 권한 확인, 렌더링을 event loop 에서 처리하므로 ASGI worker 의
+      thread 를 쓰지 않고 여러 요청을 동시에 처리합니다.
+    - authenticator 에 aauthenticate 가 있으면 await 하고, 없으면
+      authenticate 를 sync_to_async 로 실행합니다.
+    - transaction 이 필요한 저장은 handler 에서 sync_to_async 로 실행해야
+      합니다. (Django 의 async ORM 은 transaction 을 지원하지 않습니다.)
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        # Django 는 async view 의 응답을 thread 에서 render 하므로 미리
+        # render 해서 그 호출이 바로 끝나게 합니다.
+        if hasattr(self.response, "render"):
+            self.response.render()
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """
+        - Request._authenticate 와 같은 순서로 인증하고 request.user 를
+          채웁니다.
+        """
+        for authenticator in request.authenticators:
+            if hasattr(authenticator, "aauthenticate"):
+                authenticate = authenticator.aauthenticate
+            else:
+                authenticate = sync_to_async(authenticator.authenticate)
+            try:
+                user_auth_tuple = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
@@ -0,0 +1,210 @@
+from itertools import groupby
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from todos.cache import invalidate_user_cache
+from todos.models import Category, RankConflictError, SubTodo, Todo
+from todos.serializers import (
+    CategorySerializer,
+    SubTodoSerializer,
+    TodoSerializer,
+)
+
+BATCH_MODELS = {
+    "todo": (Todo, TodoSerializer),
+    "subtodo": (SubTodo, SubTodoSerializer),
+    "category": (Category, CategorySerializer),
+}
+
+# 다른 항목을 가리키는 필드. 가리키는 항목이 user 의 것인지 확인합니다.
+BATCH_RELATIONS = {
+    "todo": ("category_id", Category),
+    "subtodo": ("todo_id", Todo),
+}
+
+
+class BatchError(Exception):
+    def __init__(self, index, error, status_code=status.HTTP_400_BAD_REQUEST):
+        super().__init__(error)
+        self.index = index
+        self.error = error
+        self.status_code = status_code
+
+
+def get_not_found_error(model):
+    return f"{model.__name__} not found"
+
+
+def get_related_instances(user_id, name, group):
+    """
+    - group 의 항목이 가리키는 category / todo 를 한 번에 불러오고, user 의
+      것인지 확인합니다.
+    - 반환값을 serializer context 의 related 로 넘기면 항목마다 다시
+      조회하지 않습니다.
+    """
+    if name not in BATCH_RELATIONS:
+        return {}
+    field, model = BATCH_RELATIONS[name]
+    ids = {}
+    for index, operation in group:
+        try:
+            ids[index] = int(operation["data"][field])
+        except (KeyError, TypeError, ValueError):
+            continue
+    owned = model.objects.get_user_queryset(user_id).in_bulk(set(ids.values()))
+    for index, id in ids.items():
+        if id not in owned:
+            raise BatchError(
+                index, get_not_found_error(model), status.HTTP_404_NOT_FOUND
+            )
+    return {model: owned}
+
+
+def get_user_instances(user_id, model, group):
+    instances = model.objects.get_user_queryset(user_id).in_bulk(
+        [operation["id"] for _, operation in group]
+    )
+    for index, operation in group:
+        if operation["id"] not in instances:
+            raise BatchError(
+                index, get_not_found_error(model), status.HTTP_404_NOT_FOUND
+            )
+    return instances
+
+
+def create_group(request, name, group, results):
+    """
+    - rank 를 한 번에 할당하고, 한 번의 bulk INSERT 로 생성합니다.
+    """
+    model, serializer_class = BATCH_MODELS[name]
+    user_id = request.user.id
+    related = get_related_instances(user_id, name, group)
+    ranks = model.objects.get_next_ranks(user_id, len(group))
+    data = [
+        {**operation["data"], "rank": rank}
+        for (_, operation), rank in zip(group, ranks)
+    ]
+    serializer = serializer_class(
+        data=data, many=True, context={"request": request, "related": related}
+    )
+    if not serializer.is_valid():
+        for (index, _), errors in zip(group, serializer.errors):
+            if errors:
+                raise BatchError(index, errors)
+    instances = []
+    for validated_data in serializer.validated_data:
+        validated_data.pop("patch_rank", None)
+        if model is not SubTodo:
+            validated_data["user_id"] = request.user
+        instances.append(model(**validated_data))
+    model.objects.create_many(user_id, instances)
+    for (index, _), instance in zip(group, instances):
+        results[index] = {
+            "status": status.HTTP_201_CREATED,
+            "data": serializer_class(instance).data,
+        }
+
+
+def update_group(request, name, group, results):
+    """
+    - 항목을 한 번에 불러와 검증하고, 한 번의 bulk UPDATE 로 저장합니다.
+    - rank 이동은 항목마다 TodosManager.move 로 저장합니다.
+    - Todo 의 date 가 바뀌면 date 마다 UPDATE 한 번으로 subtodo 에 전파합니다.
+    """
+    model, serializer_class = BATCH_MODELS[name]
+    user_id = request.user.id
+    related = get_related_instances(user_id, name, group)
+    instances = get_user_instances(user_id, model, group)
+    now = timezone.now()
+    fields = set()
+    dated_ids = set()
+    for index, operation in group:
+        instance = instances[operation["id"]]
+        serializer = serializer_class(
+            instance,
+            data=operation["data"],
+            partial=True,
+            context={"request": request, "related": related},
+        )
+        if not serializer.is_valid():
+            raise BatchError(index, serializer.errors)
+        validated_data = dict(serializer.validated_data)
+        patch_rank = validated_data.pop("patch_rank", None)
+        if patch_rank is not None:
+            try:
+                model.objects.move(
+                    instance,
+                    patch_rank.get("prev_id"),
+                    patch_rank.get("next_id"),
+                )
+            except RankConflictError as e:
+                raise BatchError(index, str(e), status.HTTP_409_CONFLICT)
+            except model.DoesNotExist:
+                raise BatchError(
+                    index,
+                    get_not_found_error(model),
+                    status.HTTP_404_NOT_FOUND,
+                )
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        fields.update(validated_data)
+        if model is Todo and "date" in validated_data:
+            dated_ids.add(instance.id)
+    changed = [instances[id] for id in {op["id"] for _, op in group}]
+    if fields:
+        for instance in changed:
+            instance.updated_at = now
+        model.objects.bulk_update(changed, [*fields, "updated_at"])
+    todo_ids_by_date = {}
+    for id in dated_ids:
+        todo_ids_by_date.setdefault(instances[id].date, []).append(id)
+    for date, todo_ids in todo_ids_by_date.items():
+        SubTodo.objects.filter(todo_id__in=todo_ids).update(
+            date=date, updated_at=now
+        )
+    for index, operation in group:
+        results[index] = {
+            "status": status.HTTP_200_OK,
+            "data": serializer_class(instances[operation["id"]]).data,
+        }
+
+
+def delete_group(request, name, group, results):
+    """
+    - 항목과 하위 항목을 모델마다 한 번의 UPDATE 로 soft delete 합니다.
+    """
+    model, _ = BATCH_MODELS[name]
+    instances = get_user_instances(request.user.id, model, group)
+    model.objects.delete_instances(list(instances.values()))
+    for index, operation in group:
+        results[index] = {
+            "status": status.HTTP_200_OK,
+            "data": {"id": operation["id"]},
+        }
+
+
+BATCH_HANDLERS = {
+    "create": create_group,
+    "update": update_group,
+    "delete": delete_group,
+}
+
+
+def apply_batch(request, operations):
+    """
+    - operations 를 순서대로 하나의 transaction 에서 적용합니다.
+    - 연속된 같은 종류의 operation 은 묶어서 bulk 로 처리합니다.
+    - 하나라도 실패하면 전체를 되돌리고 BatchError 를 던집니다.
+    - operation 마다 결과를 같은 순서로 반환합니다.
+    """
+    results = [None] * len(operations)
+    with transaction.atomic():
+        for (op, name), group in groupby(
+            enumerate(operations),
+            key=lambda item: (item[1]["op"], item[1]["type"]),
+        ):
+            BATCH_HANDLERS[op](request, name, list(group), results)
+        invalidate_user_cache(request.user.id)
+    return results
@@ -0,0 +1,160 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from onestep_be.cache import invalidate_on_commit
+from onestep_be.renderers import CamelCaseReturnList, RenderedJSON
+
+TODO_CACHE_TIMEOUT = getattr(settings, "TODO_CACHE_TIMEOUT", 300)
+
+
+def get_version_key(user_id):
+    return f"todos:version:{user_id}"
+
+
+def get_user_version(user_id):
+    """
+    - user 의 cache version 을 반환합니다.
+    - version 이 없으면(만료, eviction 포함) 새 version 을 만듭니다.
+    - 새 version 은 임의 값이라 이전 version 의 항목은 다시 읽히지 않습니다.
+    """
+    key = get_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_user_version(user_id):
+    key = get_version_key(user_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, uuid.uuid4().hex, timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def make_list_key(user_id, version, etag):
+    return f"todos:{user_id}:{version}:{etag}"
+
+
+def get_list_key(user_id, etag):
+    """
+    - user 의 현재 version 과 목록 ETag 가 들어간 cache key 를 반환합니다.
+    - ETag 는 DB fingerprint 로 만들므로 다른 process 에서 바뀐 목록도
+      새 key 로 조회됩니다.
+    """
+    return make_list_key(user_id, get_user_version(user_id), etag)
+
+
+async def aget_list_key(user_id, etag):
+    version = await aget_user_version(user_id)
+    return make_list_key(user_id, version, etag)
+
+
+def make_list_etag(user_id, kind, args, fingerprints):
+    parts = [str(user_id), kind, *(str(arg) for arg in args)]
+    for model, (last_updated, count) in fingerprints:
+        parts.append(f"{model._meta.model_name}:{last_updated}:{count}")
+    return quote_etag(hashlib.md5(":".join(parts).encode()).hexdigest())
+
+
+def get_list_etag(user_id, models, kind, *args):
+    """
+    - models 의 fingerprint 로 목록의 ETag 를 만듭니다.
+    - 목록 종류와 조회 조건도 함께 넣어 응답마다 다른 ETag 가 되게 합니다.
+    """
+    fingerprints = [
+        (model, model.objects.get_user_fingerprint(user_id))
+        for model in models
+    ]
+    return make_list_etag(user_id, kind, args, fingerprints)
+
+
+async def aget_list_etag(user_id, models, kind, *args):
+    fingerprints = [
+        (model, await model.objects.aget_user_fingerprint(user_id))
+        for model in models
+    ]
+    return make_list_etag(user_id, kind, args, fingerprints)
+
+
+def etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = [tag.removeprefix("W/") for tag in parse_etags(header)]
+    return "*" in etags or etag in etags
+
+
+def get_list_response(request, kind, *args, models, get_data):
+    """
+    - 목록 응답을 ETag 와 함께 반환합니다.
+    - 먼저 models 의 fingerprint 로 ETag 를 만들고, If-None-Match 와 같으면
+      목록을 조회하지 않고 304 를 반환합니다.
+    - 다르면 ETag 를 key 로 cache 된 목록을 반환하고, 없으면 get_data() 로
+      목록을 만들어 cache 합니다.
+    - camelCase 목록은 한 번 렌더링한 RenderedJSON 으로 cache 합니다.
+    """
+    user_id = request.user.id
+    etag = get_list_etag(user_id, models, kind, *args)
+    if etag_matches(request, etag):
+        return get_not_modified_response(etag)
+    key = get_list_key(user_id, etag)
+    data = cache.get(key)
+    if data is None:
+        data = get_cache_data(get_data())
+        cache.set(key, data, timeout=TODO_CACHE_TIMEOUT)
+    return Response(data, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+
+async def aget_list_response(request, kind, *args, models, get_data):
+    """
+    - get_list_response 의 async 버전입니다. get_data 는 async 함수입니다.
+    """
+    user_id = request.user.id
+    etag = await aget_list_etag(user_id, models, kind, *args)
+    if etag_matches(request, etag):
+        return get_not_modified_response(etag)
+    key = await aget_list_key(user_id, etag)
+    data = await cache.aget(key)
+    if data is None:
+        data = get_cache_data(await get_data())
+        await cache.aset(key, data, timeout=TODO_CACHE_TIMEOUT)
+    return Response(data, status=status.HTTP_200_OK, headers={"ETag": etag})
+
+
+def get_not_modified_response(etag):
+    return Response(
+        status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+    )
+
+
+def get_cache_data(data):
+    """
+    - camelCase 목록은 한 번 렌더링한 RenderedJSON 으로 cache 합니다.
+    """
+    if isinstance(data, CamelCaseReturnList):
+        return RenderedJSON(data)
+    if not isinstance(data, RenderedJSON):
+        return list(data)
+    return data
+
+
+def invalidate_user_cache(user_id):
+    """
+    - user 의 cache version 을 바꿔 모든 목록 cache 를 무효화합니다.
+    """
+    if user_id is None:
+        return
+
+    def bump():
+        cache.set(get_version_key(user_id), uuid.uuid4().hex, timeout=None)
+
+    invalidate_on_commit(bump)
@@ -1,14 +1,22 @@
 import firebase_admin
+import heapq
+import logging
 import os
+import queue
+import threading
+import time
 from firebase_admin import credentials, messaging
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onestep_be.settings')
 from django.conf import settings
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import sentry_sdk
+from django.db import close_old_connections, transaction
 from fcm_django.models import FCMDevice
 from django.contrib.auth import get_user_model
 
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -19,22 +27,248 @@ class PushNotificationStatus:
 PUSH_NOTIFICATION_SUCCESS = PushNotificationStatus("success")
 PUSH_NOTIFICATION_ERROR = PushNotificationStatus("error")
 
+PUSH_DISPATCH_WORKERS = getattr(settings, "PUSH_DISPATCH_WORKERS", 2)
+PUSH_DISPATCH_MAX_RETRIES = getattr(settings, "PUSH_DISPATCH_MAX_RETRIES", 3)
+PUSH_DISPATCH_RETRY_BACKOFF = getattr(
+    settings, "PUSH_DISPATCH_RETRY_BACKOFF", 0.5
+)
+PUSH_DISPATCH_QUEUE_SIZE = getattr(settings, "PUSH_DISPATCH_QUEUE_SIZE", 10000)
+PUSH_COALESCE_WINDOW = getattr(settings, "PUSH_COALESCE_WINDOW", 2.0)
+PUSH_METRICS_LOG_INTERVAL = getattr(settings, "PUSH_METRICS_LOG_INTERVAL", 60)
 
-def send_push_notification_device(token, target_user, title, body):
-    target_device = FCMDevice.objects.filter(user=target_user).exclude(registration_id=token)
-    if target_device.exists():
-        target_device = target_device.first()
-        try:
-            target_device.send_message(
-                messaging.Message(
-                    notification=messaging.Notification(
-                        title=title,
-                        body=body,
-                    ),
+SYNC_FCM_MESSAGE_TITLE = "Sync"
+SYNC_FCM_MESSAGE_BODY = "데이터가 변경되었습니다."
+
+
+@dataclass
+class PushJob:
+    user_id: int
+    origin_tokens: set
+    title: str
+    body: str
+    attempt: int = 0
+    # 다시 보낼 때는 앞에서 실패한 token 에만 보냅니다.
+    tokens: list = None
+
+
+@dataclass
+class SyncPushResult:
+    sent: int = 0
+    deactivated: int = 0
+    # 일시적인 에러로 실패해 다시 보낼 token 과 그 에러
+    errors: dict = field(default_factory=dict)
+
+
+class PushDispatcher:
+    """
+    - 동기화 알림을 요청 처리와 분리해서 보내는 in-process 큐입니다.
+    - transaction commit 이후에 user 별로 window 동안 알림을 모읍니다.
+    - window 가 끝나면 device 마다 한 번만 보내도록 job 하나로 합칩니다.
+    - worker thread 가 FCM 으로 보내고, 실패한 device 에만 backoff 후
+      max_retries 번까지 다시 시도합니다.
+    - metrics 의 sent / deactivated 는 device 수, 나머지는 job 수이며
+      metrics_interval 초마다 log 로 남깁니다.
+    """
+
+    def __init__(
+        self,
+        workers=PUSH_DISPATCH_WORKERS,
+        max_retries=PUSH_DISPATCH_MAX_RETRIES,
+        retry_backoff=PUSH_DISPATCH_RETRY_BACKOFF,
+        queue_size=PUSH_DISPATCH_QUEUE_SIZE,
+        window=PUSH_COALESCE_WINDOW,
+        metrics_interval=PUSH_METRICS_LOG_INTERVAL,
+    ):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.window = window
+        self.metrics_interval = metrics_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.metrics = {
+            "enqueued": 0,
+            "coalesced": 0,
+            "sent": 0,
+            "deactivated": 0,
+            "retried": 0,
+            "failed": 0,
+            "dropped": 0,
+        }
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._pending = {}
+        self._deadlines = []
+        self._threads = []
+        self._metrics_logged_at = time.monotonic()
+
+    def _count(self, key, count=1):
+        with self._lock:
+            self.metrics[key] += count
+
+    def get_metrics(self):
+        with self._lock:
+            return {
+                **self.metrics,
+                "queued": self.queue.qsize(),
+                "pending": len(self._pending),
+            }
+
+    def start(self):
+        # worker 는 fork 이후 첫 enqueue 시점에 만듭니다.
+        with self._lock:
+            if self._threads:
+                return
+            targets = [self._run] * self.workers + [self._run_flusher]
+            for i, target in enumerate(targets):
+                thread = threading.Thread(
+                    target=target, name=f"push-dispatch-{i}", daemon=True
                 )
+                thread.start()
+                self._threads.append(thread)
+
+    def enqueue(self, token, user_id, title, body):
+        transaction.on_commit(
+            lambda: self._coalesce(user_id, token, title, body)
+        )
+
+    def _coalesce(self, user_id, token, title, body):
+        self.start()
+        with self._lock:
+            pending = self._pending.get(user_id)
+            if pending is not None:
+                pending["origin_tokens"].add(token)
+                pending["messages"].add((title, body))
+                self.metrics["coalesced"] += 1
+                return
+            self._pending[user_id] = {
+                "origin_tokens": {token},
+                "messages": {(title, body)},
+            }
+            heapq.heappush(
+                self._deadlines, (time.monotonic() + self.window, user_id)
             )
-        except Exception:
-            pass
+            self._wakeup.notify()
+
+    def _run_flusher(self):
+        with self._lock:
+            while True:
+                if not self._deadlines:
+                    self._wakeup.wait()
+                    continue
+                deadline, user_id = self._deadlines[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                heapq.heappop(self._deadlines)
+                self._flush(user_id)
+
+    def _flush(self, user_id):
+        pending = self._pending.pop(user_id)
+        if len(pending["messages"]) == 1:
+            title, body = next(iter(pending["messages"]))
+        else:
+            title, body = SYNC_FCM_MESSAGE_TITLE, SYNC_FCM_MESSAGE_BODY
+        self._put(PushJob(user_id, pending["origin_tokens"], title, body))
+
+    def _put(self, job):
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning("Push dispatch queue is full, dropping job")
+            return
+        self._count("enqueued")
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self._process(job)
+            finally:
+                close_old_connections()
+                self.queue.task_done()
+                self._log_metrics()
+
+    def _log_metrics(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._metrics_logged_at < self.metrics_interval:
+                return
+            self._metrics_logged_at = now
+            metrics = self.get_metrics()
+        logger.info("Push dispatch metrics: %s", metrics)
+
+    def _process(self, job):
+        while True:
+            try:
+                result = send_sync_notification(
+                    job.user_id,
+                    job.origin_tokens,
+                    job.title,
+                    job.body,
+                    tokens=job.tokens,
+                )
+            except Exception as e:
+                error = e
+            else:
+                self._count("sent", result.sent)
+                self._count("deactivated", result.deactivated)
+                if not result.errors:
+                    return
+                job.tokens = list(result.errors)
+                error = next(iter(result.errors.values()))
+            job.attempt += 1
+            if job.attempt > self.max_retries:
+                self._count("failed")
+                sentry_sdk.capture_exception(error)
+                return
+            self._count("retried")
+            time.sleep(self.retry_backoff * 2 ** (job.attempt - 1))
+
+
+push_dispatcher = PushDispatcher()
+
+
+def send_sync_notification(user_id, origin_tokens, title, body, tokens=None):
+    """
+    - 변경을 만든 device 를 제외한 user 의 device 에 알림을 보냅니다.
+    - 여러 device 에서 변경이 모였다면 모든 device 가 다른 device 의
+      변경을 받아야 하므로 전부에게 보냅니다.
+    - tokens 가 있으면 그 device 에만 다시 보냅니다.
+    - FCM 은 device 별 실패를 응답에 담아 돌려주므로 결과를 device 별로
+      나눕니다. 유효하지 않은 token 은 fcm_django 가 비활성화하므로 다시
+      보내지 않습니다.
+    """
+    target_devices = FCMDevice.objects.filter(user_id=user_id)
+    if tokens is not None:
+        target_devices = target_devices.filter(registration_id__in=tokens)
+    elif len(origin_tokens) == 1:
+        target_devices = target_devices.exclude(
+            registration_id=next(iter(origin_tokens))
+        )
+    response = target_devices.send_message(
+        messaging.Message(
+            notification=messaging.Notification(
+                title=title,
+                body=body,
+            ),
+        )
+    )
+    deactivated = set(response.deactivated_registration_ids)
+    result = SyncPushResult(deactivated=len(deactivated))
+    for token, sent in zip(
+        response.registration_ids_sent, response.response.responses
+    ):
+        if sent.success:
+            result.sent += 1
+        elif token not in deactivated:
+            result.errors[token] = sent.exception
+    return result
+
+
+def send_push_notification_device(token, target_user, title, body):
+    push_dispatcher.enqueue(token, target_user.id, title, body)
 
 
 def send_push_notification(token, title, body):
@@ -50,4 +284,4 @@ def send_push_notification(token, title, body):
         )
     except Exception:
         return PUSH_NOTIFICATION_ERROR
-    return PUSH_NOTIFICATION_SUCCESS
\ No newline at end of file
+    return PUSH_NOTIFICATION_SUCCESS
@@ -1,10 +1,19 @@
+import datetime
 import firebase_admin
+import logging
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import chain, groupby, islice
+from operator import itemgetter
 from firebase_admin import credentials, messaging
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'onestep_be.settings')
 from django.conf import settings
+import sentry_sdk
+from django.db.models.functions import Mod
+from django.utils import timezone
 from fcm_django.models import FCMDevice
-from django.db.models import Prefetch
+from accounts.models import User
 from todos.models import Todo
 
 
@@ -12,39 +21,221 @@ firebase_info = eval(settings.SECRETS.get("FIREBASE"))
 cred = credentials.Certificate(firebase_info)
 firebase_admin.initialize_app(cred)
 
+logger = logging.getLogger(__name__)
+
 
 MORNING_ALARM_TITLE = "오늘의 할 일을 확인해보세요"
 AFTERNOON_ALARM_TITLE = "지금 할 일을 확인해보세요"
 EVENING_ALARM_TITLE = "오늘의 남은 할 일을 확인해보세요"
 
+# 현지 시간 기준 알림 시각
+ALARM_SCHEDULE = [
+    (8, MORNING_ALARM_TITLE),
+    (14, AFTERNOON_ALARM_TITLE),
+    (20, EVENING_ALARM_TITLE),
+]
+ALARM_SLOT_MINUTES = 15
+ALARM_SHARD_INDEX = getattr(settings, "ALARM_SHARD_INDEX", 0)
+ALARM_SHARD_COUNT = getattr(settings, "ALARM_SHARD_COUNT", 1)
+MINUTES_PER_DAY = 24 * 60
+MIN_UTC_OFFSET = -12 * 60
+MAX_UTC_OFFSET = 14 * 60
 
-def send_morning_alarm():
-    send_day_alarm(MORNING_ALARM_TITLE)
+# FCM send_each 는 한 번에 최대 500 개의 메시지를 보낼 수 있습니다.
+ALARM_BATCH_SIZE = 500
+ALARM_DEVICE_CHUNK_SIZE = 2000
+ALARM_MAX_CONCURRENT_BATCHES = 4
 
+INVALID_TOKEN_ERRORS = (
+    messaging.UnregisteredError,
+    messaging.SenderIdMismatchError,
+)
 
-def send_afternoon_alarm():
-    send_day_alarm(AFTERNOON_ALARM_TITLE)
 
+@dataclass
+class AlarmReport:
+    sent: int = 0
+    failures: dict = field(default_factory=dict)
+    pruned: int = 0
 
-def send_evening_alarm():
-    send_day_alarm(EVENING_ALARM_TITLE)
 
+def get_alarm_offsets(slot, hour):
+    """
+    - slot(UTC) 에 현지 시간이 hour:00 이 되는 UTC offset 목록을 반환합니다.
+    - offset 은 분 단위이며 -720 ~ 840 범위만 사용합니다.
+    """
+    slot_minutes = slot.hour * 60 + slot.minute
+    offset = (hour * 60 - slot_minutes) % MINUTES_PER_DAY
+    return [
+        candidate
+        for candidate in (offset, offset - MINUTES_PER_DAY)
+        if MIN_UTC_OFFSET <= candidate <= MAX_UTC_OFFSET
+    ]
 
-def send_day_alarm(alarm_title):
-    users_prefetch = Prefetch('user__todo_set', queryset=Todo.objects.filter(is_completed=False))
-    devices = FCMDevice.objects.all().select_related('user').prefetch_related(users_prefetch)
-    try:
-        for device in devices:
-            todos_queryset = device.user.todo_set.filter(is_completed=False).values_list("content", flat=True)
-            todos_list = "\n".join(todos_queryset)
-            device.send_message(
-                messaging.Message(
-                    notification=messaging.Notification(
-                        title=alarm_title,
-                        body=todos_list,
-                    ),
+
+def get_alarm_slot(now):
+    minute = now.minute - now.minute % ALARM_SLOT_MINUTES
+    return now.replace(minute=minute, second=0, microsecond=0)
+
+
+def send_scheduled_alarms(now=None, shard_index=None, shard_count=None):
+    """
+    - 15분마다 실행되며 현지 시간이 08:00 / 14:00 / 20:00 인 user 에게만
+      알림을 보냅니다.
+    - user_id % shard_count == shard_index 인 user 만 처리해서 여러
+      worker 에 나눠 실행할 수 있습니다.
+    """
+    if now is None:
+        now = timezone.now()
+    if shard_index is None:
+        shard_index = ALARM_SHARD_INDEX
+    if shard_count is None:
+        shard_count = ALARM_SHARD_COUNT
+    slot = get_alarm_slot(now.astimezone(datetime.timezone.utc))
+
+    users = User.objects.filter(deleted_at__isnull=True)
+    if shard_count > 1:
+        users = users.alias(shard=Mod("id", shard_count)).filter(
+            shard=shard_index
+        )
+    messages = []
+    for hour, alarm_title in ALARM_SCHEDULE:
+        for offset in get_alarm_offsets(slot, hour):
+            local_date = (slot + datetime.timedelta(minutes=offset)).date()
+            messages.append(
+                iter_alarm_messages(
+                    alarm_title,
+                    date=local_date,
+                    users=users.filter(utc_offset=offset),
                 )
             )
-    except Exception:
-        pass
-    
+    return report_day_alarm(send_alarm_messages(chain(*messages)))
+
+
+def send_day_alarm(alarm_title, date=None):
+    return report_day_alarm(
+        send_alarm_messages(iter_alarm_messages(alarm_title, date))
+    )
+
+
+def report_day_alarm(report):
+    if report.failures:
+        with sentry_sdk.new_scope() as scope:
+            scope.set_extra("sent", report.sent)
+            scope.set_extra("pruned", report.pruned)
+            sentry_sdk.capture_message(
+                f"Day alarm failed for {len(report.failures)} devices",
+                level="warning",
+            )
+    return report
+
+
+def iter_user_todos(date, users=None):
+    """
+    - date 의 미완료 todo 를 한 번의 쿼리로 user 별로 묶어 반환합니다.
+    - (user_id, [content, ...]) 를 user_id 순서로 yield 합니다.
+    """
+    todos = Todo.objects.filter(date=date, is_completed=False)
+    if users is not None:
+        todos = todos.filter(user_id__in=users.values("id"))
+    rows = (
+        todos.order_by("user_id", "rank")
+        .values_list("user_id", "content")
+        .iterator(chunk_size=ALARM_DEVICE_CHUNK_SIZE)
+    )
+    for user_id, group in groupby(rows, key=itemgetter(0)):
+        yield user_id, [content for _, content in group]
+
+
+def iter_alarm_messages(alarm_title, date=None, users=None):
+    """
+    - device 와 todo 를 모두 user_id 순서로 읽으면서 merge 합니다.
+    - device 수와 관계없이 쿼리는 두 번만 실행됩니다.
+    - users 를 주면 해당 user queryset 의 device 에만 보냅니다.
+    """
+    if date is None:
+        date = timezone.localdate()
+    devices = FCMDevice.objects.filter(
+        active=True, user__isnull=False, user__deleted_at__isnull=True
+    )
+    if users is not None:
+        devices = devices.filter(user_id__in=users.values("id"))
+    devices = (
+        devices.order_by("user_id", "id")
+        .values_list("user_id", "registration_id")
+        .iterator(chunk_size=ALARM_DEVICE_CHUNK_SIZE)
+    )
+    user_todos = iter_user_todos(date, users)
+    todo_user_id, contents = next(user_todos, (None, []))
+    for user_id, registration_id in devices:
+        while todo_user_id is not None and todo_user_id < user_id:
+            todo_user_id, contents = next(user_todos, (None, []))
+        body = "\n".join(contents) if todo_user_id == user_id else ""
+        yield messaging.Message(
+            token=registration_id,
+            notification=messaging.Notification(
+                title=alarm_title,
+                body=body,
+            ),
+        )
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def send_alarm_batch(batch):
+    """
+    - 메시지 묶음을 send_each 로 보내고 (token, 에러) 목록을 반환합니다.
+    - 묶음 전체가 실패하면 모든 token 에 같은 에러를 기록합니다.
+    """
+    try:
+        response = messaging.send_each(batch)
+    except Exception as e:
+        return [(message.token, e) for message in batch]
+    return [
+        (message.token, result.exception)
+        for message, result in zip(batch, response.responses)
+    ]
+
+
+def send_alarm_messages(
+    messages,
+    batch_size=ALARM_BATCH_SIZE,
+    max_workers=ALARM_MAX_CONCURRENT_BATCHES,
+):
+    """
+    - 메시지를 batch_size 단위로 묶어 최대 max_workers 개씩 동시에 보냅니다.
+    - 실패는 token 별로 기록하고, 더 이상 유효하지 않은 token 은
+      비활성화합니다.
+    """
+    report = AlarmReport()
+    invalid_tokens = []
+
+    def collect(futures):
+        for future in futures:
+            for token, error in future.result():
+                if error is None:
+                    report.sent += 1
+                    continue
+                report.failures[token] = error
+                logger.warning("Day alarm failed for %s: %s", token, error)
+                if isinstance(error, INVALID_TOKEN_ERRORS):
+                    invalid_tokens.append(token)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = set()
+        for batch in chunked(messages, batch_size):
+            if len(running) >= max_workers:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                collect(done)
+            running.add(executor.submit(send_alarm_batch, batch))
+        collect(wait(running).done)
+
+    if invalid_tokens:
+        report.pruned = FCMDevice.objects.filter(
+            registration_id__in=invalid_tokens
+        ).update(active=False)
+    return report
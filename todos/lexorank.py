@@ -12,3 +12,61 @@ class LexoRank:
                 f"Object must be of type {self.__class__.__name__}"
             )
         return (self.rank > other.rank) - (self.rank < other.rank)
+
+
+RANK_BUCKETS = ("0", "1", "2")
+RANK_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+RANK_INTEGER_LENGTH = 6
+RANK_SPACE = len(RANK_DIGITS) ** RANK_INTEGER_LENGTH
+MAX_RANK_LENGTH = 16
+
+
+def split_rank(rank: str):
+    """
+    - "0|hzzzzz:abc" 형태의 rank 를 (bucket, 정수부, 소수부) 로 나눕니다.
+    """
+    bucket, value = rank.split("|", 1)
+    integer, _, fraction = value.partition(":")
+    return bucket, integer, fraction
+
+
+def format_rank(bucket: str, value: int) -> str:
+    digits = ""
+    while value:
+        value, remainder = divmod(value, len(RANK_DIGITS))
+        digits = RANK_DIGITS[remainder] + digits
+    return f"{bucket}|{digits.rjust(RANK_INTEGER_LENGTH, '0')}:"
+
+
+def next_bucket(rank: str) -> str:
+    bucket = split_rank(rank)[0]
+    index = RANK_BUCKETS.index(bucket)
+    return RANK_BUCKETS[(index + 1) % len(RANK_BUCKETS)]
+
+
+def spaced_ranks(count: int, bucket: str):
+    """
+    - bucket 안에서 정수부만 쓰는 rank 를 count 개 균등 간격으로 만듭니다.
+    - 앞 뒤로도 한 칸씩 비워 gen_prev / gen_next 여유를 둡니다.
+    """
+    step = RANK_SPACE // (count + 1)
+    return [format_rank(bucket, step * (i + 1)) for i in range(count)]
+
+
+def needs_rebalance(ranks, max_length: int = MAX_RANK_LENGTH) -> bool:
+    """
+    - 정렬된 rank 목록이 길거나(max_length 초과) 붐비는지 확인합니다.
+    - 이웃한 rank 가 같은 정수부를 쓰면 소수부로만 나눌 수 있으므로
+      붐비는 것으로 봅니다.
+    """
+    if any(len(rank) > max_length for rank in ranks):
+        return True
+    integers = [split_rank(rank)[:2] for rank in ranks]
+    return any(prev == curr for prev, curr in zip(integers, integers[1:]))
+
+
+def rank_length_histogram(ranks):
+    histogram = {}
+    for rank in ranks:
+        histogram[len(rank)] = histogram.get(len(rank), 0) + 1
+    return dict(sorted(histogram.items()))
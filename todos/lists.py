@@ -0,0 +1,138 @@
+from django.utils import timezone
+from djangorestframework_camel_case.util import camelize
+
+from onestep_be.renderers import RenderedJSON
+from todos.models import SubTodo
+
+# GetTodoSerializer / SubTodoSerializer 의 출력 필드와 같은 순서입니다.
+TODO_FIELDS = (
+    "id",
+    "content",
+    "category_id",
+    "date",
+    "due_time",
+    "user_id",
+    "rank",
+    "is_completed",
+)
+SUBTODO_FIELDS = (
+    "id",
+    "content",
+    "todo_id",
+    "date",
+    "rank",
+    "is_completed",
+    "created_at",
+    "updated_at",
+    "deleted_at",
+    "due_time",
+)
+
+
+def get_camel_keys(fields):
+    return dict(zip(fields, camelize(dict.fromkeys(fields))))
+
+
+TODO_KEYS = get_camel_keys((*TODO_FIELDS, "children"))
+SUBTODO_KEYS = get_camel_keys(SUBTODO_FIELDS)
+
+
+def format_iso(value):
+    return None if value is None else value.isoformat()
+
+
+def format_datetime(value):
+    """
+    - DRF DateTimeField 와 같이 현재 timezone 의 ISO 8601 로 바꿉니다.
+    """
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def get_subtodo_row(subtodo):
+    keys = SUBTODO_KEYS
+    return {
+        keys["id"]: subtodo["id"],
+        keys["content"]: subtodo["content"],
+        keys["todo_id"]: subtodo["todo_id"],
+        keys["date"]: format_iso(subtodo["date"]),
+        keys["rank"]: subtodo["rank"],
+        keys["is_completed"]: bool(subtodo["is_completed"]),
+        keys["created_at"]: format_datetime(subtodo["created_at"]),
+        keys["updated_at"]: format_datetime(subtodo["updated_at"]),
+        keys["deleted_at"]: format_datetime(subtodo["deleted_at"]),
+        keys["due_time"]: format_iso(subtodo["due_time"]),
+    }
+
+
+def get_todo_row(todo, children):
+    keys = TODO_KEYS
+    return {
+        keys["id"]: todo["id"],
+        keys["content"]: todo["content"],
+        keys["category_id"]: todo["category_id"],
+        keys["date"]: format_iso(todo["date"]),
+        keys["due_time"]: format_iso(todo["due_time"]),
+        keys["user_id"]: todo["user_id"],
+        keys["rank"]: todo["rank"],
+        keys["is_completed"]: bool(todo["is_completed"]),
+        keys["children"]: children,
+    }
+
+
+def get_todo_values(todos, limit=None):
+    todos = todos.prefetch_related(None).values(*TODO_FIELDS)
+    if limit is not None:
+        todos = todos[:limit]
+    return todos
+
+
+def get_subtodo_values(todo_ids):
+    return (
+        SubTodo.objects.filter(todo_id__in=todo_ids, deleted_at__isnull=True)
+        .order_by("rank")
+        .values(*SUBTODO_FIELDS)
+    )
+
+
+def build_todo_list(todos, subtodos):
+    children = {todo["id"]: [] for todo in todos}
+    for subtodo in subtodos:
+        children[subtodo["todo_id"]].append(get_subtodo_row(subtodo))
+    return RenderedJSON(
+        [get_todo_row(todo, children[todo["id"]]) for todo in todos]
+    )
+
+
+def render_todo_list(todos, limit=None):
+    """
+    - todos queryset 을 GetTodoSerializer + CamelCaseJSONRenderer 와 같은
+      JSON 으로 렌더링합니다.
+    - 모델 instance 와 serializer 없이 values() 로 todo 와 subtodo 를 한 번씩
+      조회하고, subtodo 는 한 번 순회하며 todo 아래로 묶습니다.
+    """
+    todos = list(get_todo_values(todos, limit))
+    subtodos = []
+    if todos:
+        subtodos = get_subtodo_values([todo["id"] for todo in todos])
+    return build_todo_list(todos, subtodos)
+
+
+async def arender_todo_list(todos, limit=None):
+    """
+    - render_todo_list 의 async 버전으로, async iteration 으로 조회합니다.
+    """
+    todos = [todo async for todo in get_todo_values(todos, limit)]
+    subtodos = []
+    if todos:
+        subtodos = [
+            subtodo
+            async for subtodo in get_subtodo_values(
+                [todo["id"] for todo in todos]
+            )
+        ]
+    return build_todo_list(todos, subtodos)
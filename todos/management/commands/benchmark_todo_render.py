@@ -0,0 +1,91 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+from todos.lists import render_todo_list
+from todos.models import Category, SubTodo, Todo
+from todos.serializers import GetTodoSerializer
+
+
+def render_with_serializer(todos):
+    data = GetTodoSerializer(todos, many=True).data
+    return CamelCaseJSONRenderer().render(data)
+
+
+def render_fast(todos):
+    return render_todo_list(todos).rendered
+
+
+def measure(render, todos, repeat):
+    """
+    - render 를 repeat 번 실행한 가장 빠른 시간(초)과 결과를 반환합니다.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rendered = render(todos)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, rendered
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare GetTodoSerializer + CamelCaseJSONRenderer with the "
+        "values()-based todo list renderer on temporary todos. The todos "
+        "are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, required=True)
+        parser.add_argument("--sizes", default="10,100,1000")
+        parser.add_argument("--subtodos", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def create_todos(self, user_id, category, size, subtodos):
+        ranks = iter(Todo.objects.get_next_ranks(user_id, size))
+        Todo.objects.bulk_create(
+            Todo(
+                user_id_id=user_id,
+                category_id=category,
+                content=f"benchmark todo {i}",
+                date="2024-08-01",
+                rank=next(ranks),
+            )
+            for i in range(size)
+        )
+        # MySQL 은 bulk_create 에서 id 를 돌려주지 않으므로 다시 조회합니다.
+        todos = Todo.objects.filter(category_id=category)
+        SubTodo.objects.bulk_create(
+            SubTodo(todo_id=todo, content=f"benchmark subtodo {i}")
+            for todo in todos
+            for i in range(subtodos)
+        )
+        return Todo.objects.get_daily_page(user_id).filter(
+            category_id=category
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        user_id = options["user_id"]
+        with transaction.atomic():
+            for size in sizes:
+                category = Category.objects.create(
+                    user_id_id=user_id, color=0, title="benchmark"
+                )
+                todos = self.create_todos(
+                    user_id, category, size, options["subtodos"]
+                )
+                slow, expected = measure(
+                    render_with_serializer, todos, options["repeat"]
+                )
+                fast, rendered = measure(render_fast, todos, options["repeat"])
+                if rendered != expected:
+                    raise CommandError(f"{size} todos: output differs")
+                self.stdout.write(
+                    f"{size} todos: serializer {slow * 1000:.2f}ms, "
+                    f"fast {fast * 1000:.2f}ms, {slow / fast:.1f}x"
+                )
+            transaction.set_rollback(True)
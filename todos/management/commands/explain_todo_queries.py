@@ -0,0 +1,131 @@
+import datetime
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from todos.models import Category, SubTodo, Todo
+from todos.pagination import TODO_PAGE_SIZE
+
+
+def find_plan_problems(plan):
+    """
+    - MySQL EXPLAIN FORMAT=JSON 결과를 순회하며 문제를 찾습니다.
+    - access_type 이 ALL 인 테이블은 full scan 으로 봅니다.
+    - using_filesort 가 true 인 단계는 filesort 로 봅니다.
+    """
+    problems = []
+    if isinstance(plan, dict):
+        if plan.get("access_type") == "ALL":
+            problems.append(f"full scan on {plan.get('table_name')}")
+        if plan.get("using_filesort"):
+            problems.append("filesort")
+        for value in plan.values():
+            problems.extend(find_plan_problems(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            problems.extend(find_plan_problems(value))
+    return problems
+
+
+def get_manager_queries(user_id, todo_id, start_date, end_date):
+    """
+    - TodosManager 의 읽기 쿼리 목록을 반환합니다.
+    - (이름, queryset, filesort 허용 여부) 형태입니다.
+    - 날짜 범위 / IN 조회는 인덱스의 rank 순서를 그대로 쓸 수 없으므로
+      범위 안의 row 만 정렬하는 filesort 를 허용합니다.
+    """
+    return [
+        (
+            "Todo.get_with_user_id",
+            Todo.objects.get_with_user_id(user_id),
+            False,
+        ),
+        (
+            "Todo.get_next_rank",
+            Todo.objects.get_with_user_id(user_id).reverse()[:1],
+            False,
+        ),
+        ("Todo.get_inbox", Todo.objects.get_inbox(user_id), False),
+        (
+            "Todo.get_daily_with_date",
+            Todo.objects.get_daily_with_date(user_id, start_date, end_date),
+            True,
+        ),
+        (
+            "Todo.get_daily_page",
+            Todo.objects.get_daily_page(user_id)[:TODO_PAGE_SIZE],
+            False,
+        ),
+        (
+            "Todo.get_daily_page (cursor)",
+            Todo.objects.get_daily_page(
+                user_id,
+                start_date,
+                end_date,
+                after=(start_date, "0|hzzzzz:", todo_id),
+            )[:TODO_PAGE_SIZE],
+            False,
+        ),
+        (
+            "SubTodo.get_subtodos",
+            SubTodo.objects.get_subtodos(todo_id),
+            False,
+        ),
+        (
+            "SubTodo.prefetch",
+            SubTodo.objects.filter(
+                deleted_at__isnull=True, todo_id__in=[todo_id]
+            ).order_by("rank"),
+            True,
+        ),
+        (
+            "Category.get_with_user_id",
+            Category.objects.get_with_user_id(user_id),
+            False,
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on every TodosManager read query and fail when one "
+        "of them falls back to a full scan or filesort."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, default=1)
+        parser.add_argument("--todo-id", type=int, default=1)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "mysql":
+            raise CommandError(
+                f"EXPLAIN check requires MySQL, got {connection.vendor}"
+            )
+        start_date = datetime.date.today()
+        end_date = start_date + datetime.timedelta(days=7)
+        queries = get_manager_queries(
+            options["user_id"], options["todo_id"], start_date, end_date
+        )
+
+        failed = []
+        with connection.cursor() as cursor:
+            for name, queryset, allow_filesort in queries:
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute("EXPLAIN FORMAT=JSON " + sql, params)
+                plan = json.loads(cursor.fetchone()[0])
+                problems = find_plan_problems(plan)
+                if allow_filesort:
+                    problems = [p for p in problems if p != "filesort"]
+                if problems:
+                    failed.append(name)
+                    self.stdout.write(
+                        self.style.ERROR(f"{name}: {', '.join(problems)}")
+                    )
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{name}: ok"))
+
+        if failed:
+            raise CommandError(
+                f"{len(failed)} query plan(s) failed: {', '.join(failed)}"
+            )
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Left, Length
+
+from todos.lexorank import (
+    MAX_RANK_LENGTH,
+    RANK_INTEGER_LENGTH,
+    rank_length_histogram,
+)
+from todos.models import Category, SubTodo, Todo
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite long or crowded Todo, SubTodo and Category ranks with "
+        "evenly spaced short ranks in the next LexoRank bucket."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int)
+        parser.add_argument("--max-length", type=int, default=MAX_RANK_LENGTH)
+        parser.add_argument("--force", action="store_true")
+
+    def get_user_ids(self, model, max_length):
+        """
+        - rank 가 max_length 보다 길거나 붐비는 user 를 찾습니다.
+        - needs_rebalance 와 같이 정수부("0|hzzzzz")가 같은 rank 가 둘
+          이상이면 붐비는 것으로 봅니다.
+        """
+        user_field = "todo_id__user_id" if model is SubTodo else "user_id"
+        return set(
+            model.objects.annotate(
+                rank_integer=Left("rank", RANK_INTEGER_LENGTH + 2)
+            )
+            .values(user_field, "rank_integer")
+            .annotate(count=Count("id"), longest=Max(Length("rank")))
+            .filter(Q(count__gt=1) | Q(longest__gt=max_length))
+            .values_list(user_field, flat=True)
+        )
+
+    def handle(self, *args, **options):
+        max_length = options["max_length"]
+        for model in (Todo, SubTodo, Category):
+            if options["user_id"] is not None:
+                user_ids = {options["user_id"]}
+            else:
+                user_ids = self.get_user_ids(model, max_length)
+
+            before_ranks = []
+            after_ranks = []
+            rebalanced = 0
+            for user_id in sorted(user_ids):
+                before, after = model.objects.rebalance_ranks(
+                    user_id, max_length=max_length, force=options["force"]
+                )
+                before_ranks.extend(before)
+                after_ranks.extend(after)
+                if before != after:
+                    rebalanced += 1
+
+            name = model.__name__
+            self.stdout.write(
+                f"{name}: rebalanced {rebalanced}/{len(user_ids)} users"
+            )
+            self.stdout.write(
+                f"{name} before: {rank_length_histogram(before_ranks)}"
+            )
+            self.stdout.write(
+                f"{name} after: {rank_length_histogram(after_ranks)}"
+            )
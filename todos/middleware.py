@@ -0,0 +1,36 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from djangorestframework_camel_case.settings import api_settings
+from djangorestframework_camel_case.util import underscoreize
+
+
+class CamelCaseMiddleware:
+    """
+    - djangorestframework_camel_case 의 CamelCaseMiddleWare 와 같이 query
+      parameter 를 snake_case 로 바꿉니다.
+    - sync / async 를 모두 지원하므로 ASGI 에서 async view 앞의 middleware
+      때문에 요청이 thread 로 넘어가지 않습니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        self.underscoreize_query(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.underscoreize_query(request)
+        return await self.get_response(request)
+
+    def underscoreize_query(self, request):
+        request.GET = underscoreize(
+            request.GET, **api_settings.JSON_UNDERSCOREIZE
+        )
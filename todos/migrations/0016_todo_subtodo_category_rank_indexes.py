@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-18 18:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0015_alter_category_color_alter_category_rank_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user_id', 'deleted_at', 'rank'], name='category_user_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtodo',
+            index=models.Index(fields=['todo_id', 'deleted_at', 'rank'], name='subtodo_todo_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user_id', 'deleted_at', 'date', 'rank'], name='todo_user_date_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user_id', 'deleted_at', 'rank'], name='todo_user_rank_idx'),
+        ),
+    ]
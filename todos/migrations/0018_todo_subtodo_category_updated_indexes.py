@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0017_ranktail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['user_id', 'updated_at'], name='category_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtodo',
+            index=models.Index(fields=['todo_id', 'updated_at'], name='subtodo_todo_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['user_id', 'updated_at'], name='todo_user_updated_idx'),
+        ),
+    ]
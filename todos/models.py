@@ -1,63 +1,323 @@
+from asgiref.sync import async_to_sync
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models import Prefetch
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Max, Prefetch, Q, Subquery
 from django.utils import timezone
 
 from accounts.models import User
 from Lexorank.src.lexo_rank import LexoRank
+from todos.cache import invalidate_user_cache
+from todos.lexorank import (
+    MAX_RANK_LENGTH,
+    needs_rebalance,
+    next_bucket,
+    spaced_ranks,
+)
+
+
+class RankConflictError(Exception):
+    pass
 
 
 class TodosManager(models.Manager):
     def delete_instance(self, instance):
-        instance.deleted_at = timezone.now()
-        instance.save()
-        return instance
-
-    def delete_many(self, instances):
+        """
+        - instance 를 soft delete 하고 하위 항목까지 함께 지웁니다.
+        """
+        return self.delete_instances([instance])[0]
+
+    def delete_instances(self, instances):
+        """
+        - instances 를 soft delete 하고 하위 항목까지 함께 지웁니다.
+        - Category -> Todo -> SubTodo 순서로 cascade 합니다.
+        - 항목과 하위 항목 수와 관계없이 모델마다 UPDATE 한 번만 실행합니다.
+        """
+        ids = [instance.id for instance in instances]
+        owner_ids = {self.get_owner_id(instance) for instance in instances}
+        now = timezone.now()
+        with transaction.atomic():
+            if self.model is Category:
+                todos = Todo.objects.filter(category_id__in=ids)
+                SubTodo.objects.delete_many(
+                    SubTodo.objects.filter(todo_id__in=todos.values("id")),
+                    now,
+                )
+                Todo.objects.delete_many(todos, now)
+            elif self.model is Todo:
+                SubTodo.objects.delete_many(
+                    SubTodo.objects.filter(todo_id__in=ids), now
+                )
+            self.delete_many(self.filter(id__in=ids), now)
+            for owner_id in owner_ids:
+                invalidate_user_cache(owner_id)
         for instance in instances:
-            instance.deleted_at = timezone.now()
-            instance.save()
+            instance.deleted_at = now
+            instance.updated_at = now
         return instances
 
-    def get_next_rank_subtodo(self, user_id):
-        get_list = (
-            SubTodo.objects.filter(todo_id__user_id=user_id)
-            .select_related("todo_id")
-            .last()
+    def create_many(self, user_id, instances):
+        """
+        - user 의 instances 를 한 번의 bulk INSERT 로 생성합니다.
+        - MySQL 은 bulk_create 에서 id 를 돌려주지 않으므로, 새로 할당한
+          rank 로 생성된 항목을 한 번에 다시 찾아 id 를 채웁니다.
+        """
+        with transaction.atomic():
+            instances = self.bulk_create(instances)
+            missing = [
+                instance for instance in instances if instance.pk is None
+            ]
+            if missing:
+                ids = dict(
+                    self.get_user_queryset(user_id)
+                    .filter(rank__in=[instance.rank for instance in missing])
+                    .values_list("rank", "id")
+                )
+                for instance in missing:
+                    instance.id = ids[instance.rank]
+            invalidate_user_cache(user_id)
+        return instances
+
+    def delete_many(self, queryset, deleted_at=None):
+        """
+        - queryset 을 한 번의 UPDATE 로 soft delete 합니다.
+        """
+        if deleted_at is None:
+            deleted_at = timezone.now()
+        return queryset.filter(deleted_at__isnull=True).update(
+            deleted_at=deleted_at, updated_at=deleted_at
         )
-        if get_list is None:
-            return str(LexoRank.middle())
-        return str((LexoRank.parse(get_list.rank)).gen_next())
 
     def gen_next_rank(self, prev_rank):
         return str(LexoRank.parse(prev_rank).gen_next())
 
+    def get_user_queryset(self, user_id):
+        if self.model is SubTodo:
+            return self.get_queryset().filter(todo_id__user_id=user_id)
+        return self.get_queryset().filter(user_id=user_id)
+
+    def get_user_fingerprint(self, user_id):
+        """
+        - user 의 항목 중 가장 최근 updated_at 과 항목 수를 반환합니다.
+        - soft delete 된 항목도 포함하므로 삭제도 fingerprint 를 바꿉니다.
+        """
+        fingerprint = self.get_user_base_queryset(user_id).aggregate(
+            last_updated=Max("updated_at"), count=Count("id")
+        )
+        return fingerprint["last_updated"], fingerprint["count"]
+
+    async def aget_user_fingerprint(self, user_id):
+        fingerprint = await self.get_user_base_queryset(user_id).aaggregate(
+            last_updated=Max("updated_at"), count=Count("id")
+        )
+        return fingerprint["last_updated"], fingerprint["count"]
+
+    def get_user_base_queryset(self, user_id):
+        """
+        - soft delete 된 항목까지 포함한 user 의 queryset 을 반환합니다.
+        """
+        queryset = self.model._base_manager.all()
+        if self.model is SubTodo:
+            return queryset.filter(todo_id__user_id=user_id)
+        return queryset.filter(user_id=user_id)
+
+    def get_changes(self, user_id, since=None):
+        """
+        - since 이후 생성, 수정, 삭제된 user 의 항목을 반환합니다.
+        - since 가 없으면 삭제되지 않은 전체 항목을 반환합니다.
+        - 삭제도 updated_at 을 갱신하므로 updated_at 만으로 변경을 찾습니다.
+        """
+        queryset = self.get_user_base_queryset(user_id)
+        if since is None:
+            return queryset.filter(deleted_at__isnull=True).order_by("id")
+        return queryset.filter(updated_at__gte=since).order_by("id")
+
+    def get_last_rank(self, user_id):
+        last = self.get_user_queryset(user_id).order_by("rank").last()
+        if last is None:
+            return None
+        return last.rank
+
+    def lock_rank_tail(self, user_id):
+        """
+        - user 의 rank tail row 를 select_for_update 로 잠급니다.
+        - row 가 없으면 현재 마지막 rank 로 한 번만 생성합니다.
+        - transaction 안에서 호출해야 합니다.
+        """
+        scope = self.model._meta.model_name
+        tail = (
+            RankTail.objects.select_for_update()
+            .filter(user_id=user_id, scope=scope)
+            .first()
+        )
+        if tail is not None:
+            return tail
+        try:
+            with transaction.atomic():
+                return RankTail.objects.create(
+                    user_id_id=user_id,
+                    scope=scope,
+                    rank=self.get_last_rank(user_id),
+                )
+        except IntegrityError:
+            return RankTail.objects.select_for_update().get(
+                user_id=user_id, scope=scope
+            )
+
+    def get_next_ranks(self, user_id, count):
+        with transaction.atomic():
+            tail = self.lock_rank_tail(user_id)
+            ranks = []
+            rank = tail.rank
+            for _ in range(count):
+                if rank is None:
+                    rank = str(LexoRank.middle())
+                else:
+                    rank = self.gen_next_rank(rank)
+                ranks.append(rank)
+            if ranks:
+                tail.rank = rank
+                tail.save(update_fields=["rank"])
+            return ranks
+
     def get_next_rank(self, user_id):
-        get_list = (
-            self.get_queryset().filter(user_id=user_id).order_by("rank").last()
+        return self.get_next_ranks(user_id, 1)[0]
+
+    def get_rank_owner_id(self, instance):
+        if self.model is SubTodo:
+            return Subquery(
+                Todo.objects.filter(id=instance.todo_id_id).values("user_id")
+            )
+        return instance.user_id_id
+
+    def get_owner_id(self, instance):
+        if self.model is SubTodo:
+            if SubTodo.todo_id.is_cached(instance):
+                return instance.todo_id.user_id_id
+            return (
+                Todo._base_manager.filter(id=instance.todo_id_id)
+                .values_list("user_id", flat=True)
+                .first()
+            )
+        return instance.user_id_id
+
+    def get_rank_tail_queryset(self, user_id):
+        return RankTail.objects.filter(
+            user_id=user_id, scope=self.model._meta.model_name
         )
-        if get_list is None:
-            return str(LexoRank.middle())
-        return str(LexoRank.parse(get_list.rank).gen_next())
 
-    def get_update_rank(self, instance, prev_id, next_id):
+    def bump_rank_tail(self, user_id, rank):
+        """
+        - rank 가 tail 보다 뒤에 있으면 tail 을 rank 로 옮깁니다.
+        - 맨 아래로 이동한 항목과 다음 할당 rank 가 겹치지 않게 합니다.
+        """
+        self.get_rank_tail_queryset(user_id).filter(rank__lt=rank).update(
+            rank=rank
+        )
+
+    def rebalance_ranks(
+        self, user_id, max_length=MAX_RANK_LENGTH, force=False
+    ):
+        """
+        - user 의 rank 가 길거나 붐비면 균등 간격의 짧은 rank 로 다시 씁니다.
+        - 새 rank 는 다음 bucket 에 만들고, 한 번의 bulk UPDATE 로 저장합니다.
+        - 변경 전 / 후 rank 목록을 반환합니다.
+        """
+        with transaction.atomic():
+            tail = self.lock_rank_tail(user_id)
+            instances = list(
+                self.get_user_queryset(user_id)
+                .select_for_update()
+                .order_by("rank", "id")
+                .only("id", "rank")
+            )
+            before = [instance.rank for instance in instances]
+            if not instances or not (
+                force or needs_rebalance(before, max_length)
+            ):
+                return before, before
+
+            ranks = spaced_ranks(len(instances), next_bucket(before[0]))
+            now = timezone.now()
+            for instance, rank in zip(instances, ranks):
+                instance.rank = rank
+                instance.updated_at = now
+            self.bulk_update(instances, ["rank", "updated_at"])
+            tail.rank = ranks[-1]
+            tail.save(update_fields=["rank"])
+            invalidate_user_cache(user_id)
+            return before, ranks
+
+    def get_move_rank(self, prev_rank, next_rank):
+        if prev_rank is None:  # Move to the top
+            return str(LexoRank.parse(next_rank).gen_prev())
+        if next_rank is None:  # Move to the bottom
+            return str(LexoRank.parse(prev_rank).gen_next())
+        # Move to after prev_id
+        prev_lexo = LexoRank.parse(prev_rank)
+        return str(prev_lexo.between(LexoRank.parse(next_rank)))
+
+    def move(self, instance, prev_id, next_id):
+        """
+        - instance 를 prev_id 와 next_id 사이로 옮기고 rank 를 저장합니다.
+        - 이웃 rank 는 한 번의 id__in 조회로 가져오면서 잠급니다.
+          맨 아래로 옮길 때는 같은 조회에서 rank tail 도 함께 읽습니다.
+        - rank 는 instance 의 rank 가 그대로일 때만 UPDATE 합니다.
+        - 새 rank 가 tail 보다 뒤일 때만 같은 transaction 에서 tail 을
+          옮기므로, 그 경우에만 UPDATE 가 하나 더 실행됩니다.
+        - 이웃이나 instance 가 동시에 바뀌었으면 RankConflictError 를 던집니다.
+        """
         if prev_id is None and next_id is None:
-            return instance.rank
-        elif prev_id is None:  # Move to the top
-            get_next_rank = self.get_queryset().get(id=next_id).rank
-            get_rank = str(LexoRank.parse(get_next_rank).gen_prev())
-            return get_rank
-        elif next_id is None:  # Move to the bottom
-            get_prev_rank = self.get_queryset().get(id=prev_id).rank
-            get_rank = str(LexoRank.parse(get_prev_rank).gen_next())
-            return get_rank
-        else:  # Move to after prev_id
-            prev_rank = self.get_queryset().get(id=prev_id).rank
-            prev_lexo = LexoRank.parse(prev_rank)
-            next_rank = self.get_queryset().get(id=next_id).rank
-            next_instance = LexoRank.parse(next_rank)
-            return str(prev_lexo.between(next_instance))
+            return instance
+        neighbour_ids = [id for id in (prev_id, next_id) if id is not None]
+        queryset = (
+            self.get_queryset()
+            .select_for_update()
+            .filter(id__in=neighbour_ids)
+        )
+        fields = ["id", "rank"]
+        if next_id is None:
+            owner_id = self.get_rank_owner_id(instance)
+            queryset = queryset.annotate(
+                tail_rank=Subquery(
+                    self.get_rank_tail_queryset(owner_id).values("rank")[:1]
+                )
+            )
+            fields.append("tail_rank")
+        with transaction.atomic():
+            rows = list(queryset.values_list(*fields))
+            neighbours = {row[0]: row[1] for row in rows}
+            tail_rank = rows[0][2] if next_id is None and rows else None
+            for id in neighbour_ids:
+                if id not in neighbours:
+                    raise self.model.DoesNotExist(
+                        f"No object found with id {id}"
+                    )
+            prev_rank = neighbours.get(prev_id)
+            next_rank = neighbours.get(next_id)
+            if (
+                prev_rank is not None
+                and next_rank is not None
+                and LexoRank.parse(next_rank) < LexoRank.parse(prev_rank)
+            ):
+                raise RankConflictError("Neighbours changed concurrently")
+
+            rank = self.get_move_rank(prev_rank, next_rank)
+            now = timezone.now()
+            updated = (
+                self.get_queryset()
+                .filter(id=instance.id, rank=instance.rank)
+                .update(rank=rank, updated_at=now)
+            )
+            if updated == 0:
+                raise RankConflictError("Rank changed concurrently")
+            if tail_rank is not None and tail_rank < rank:
+                self.bump_rank_tail(owner_id, rank)
+            invalidate_user_cache(self.get_owner_id(instance))
+
+        instance.rank = rank
+        instance.updated_at = now
+        return instance
 
     def get_queryset(self):
         return super().get_queryset().filter(deleted_at__isnull=True)
@@ -68,6 +328,12 @@ class TodosManager(models.Manager):
             raise ObjectDoesNotExist(f"No object found with id {id}")
         return instance
 
+    async def aget_with_id(self, id):
+        instance = await self.get_queryset().filter(id=id).afirst()
+        if instance is None:
+            raise ObjectDoesNotExist(f"No object found with id {id}")
+        return instance
+
     def get_with_user_id(self, user_id):
         instance = self.get_queryset().filter(user_id=user_id).order_by("rank")
         if instance is None:
@@ -115,7 +381,7 @@ class TodosManager(models.Manager):
         return (
             Todo.objects.filter(user_id=user_id, deleted_at__isnull=True)
             .filter(date__isnull=False)
-            .order_by("rank")
+            .order_by("date", "rank", "id")
             .prefetch_related(
                 Prefetch(
                     "subtodos",
@@ -126,6 +392,28 @@ class TodosManager(models.Manager):
             )
         )
 
+    def get_daily_page(
+        self, user_id, start_date=None, end_date=None, after=None
+    ):
+        """
+        - 날짜가 있는 todo 를 (date, rank, id) 순서로 반환합니다.
+        - after 가 있으면 그 (date, rank, id) 다음 todo 부터 반환합니다.
+        - offset 없이 인덱스 순서로 이어 읽으므로 뒤 페이지도 빠릅니다.
+        """
+        queryset = self.get_daily(user_id)
+        if start_date is not None:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date is not None:
+            queryset = queryset.filter(date__lte=end_date)
+        if after is not None:
+            date, rank, id = after
+            queryset = queryset.filter(
+                Q(date__gt=date)
+                | Q(date=date, rank__gt=rank)
+                | Q(date=date, rank=rank, id__gt=id)
+            )
+        return queryset
+
 
 class TimeStamp(models.Model):
     created_at = models.DateTimeField(null=True, auto_now_add=True)
@@ -149,6 +437,22 @@ class Todo(TimeStamp):
 
     objects = TodosManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user_id", "deleted_at", "date", "rank"],
+                name="todo_user_date_rank_idx",
+            ),
+            models.Index(
+                fields=["user_id", "deleted_at", "rank"],
+                name="todo_user_rank_idx",
+            ),
+            models.Index(
+                fields=["user_id", "updated_at"],
+                name="todo_user_updated_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.content
 
@@ -167,6 +471,18 @@ class SubTodo(TimeStamp):
 
     objects = TodosManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["todo_id", "deleted_at", "rank"],
+                name="subtodo_todo_rank_idx",
+            ),
+            models.Index(
+                fields=["todo_id", "updated_at"],
+                name="subtodo_todo_updated_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.content
 
@@ -183,6 +499,36 @@ class Category(TimeStamp):
 
     objects = TodosManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user_id", "deleted_at", "rank"],
+                name="category_user_rank_idx",
+            ),
+            models.Index(
+                fields=["user_id", "updated_at"],
+                name="category_user_updated_idx",
+            ),
+        ]
+
+
+class RankTail(models.Model):
+    """
+    - user 별로 마지막으로 할당한 rank 를 저장합니다.
+    - scope 는 rank 를 쓰는 모델 이름(todo, subtodo, category)입니다.
+    """
+
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE)
+    scope = models.CharField(max_length=20)
+    rank = models.CharField(max_length=255, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user_id", "scope"], name="unique_rank_tail"
+            ),
+        ]
+
 
 class UserLastUsage(models.Model):
     id = models.AutoField(primary_key=True)
@@ -191,14 +537,20 @@ class UserLastUsage(models.Model):
 
     @classmethod
     def check_rate_limit(cls, user_id: int, RATE_LIMIT_SECONDS: int):
+        return async_to_sync(cls.acheck_rate_limit)(
+            user_id, RATE_LIMIT_SECONDS
+        )
+
+    @classmethod
+    async def acheck_rate_limit(cls, user_id: int, RATE_LIMIT_SECONDS: int):
         try:
-            user = User.objects.get(id=user_id)
-            user_last_usage, created = cls.objects.get_or_create(
+            user = await User.objects.aget(id=user_id)
+            user_last_usage, created = await cls.objects.aget_or_create(
                 user_id=user, defaults={"last_used_at": timezone.now()}
             )
             if user.is_premium:
                 user_last_usage.last_used_at = timezone.now()
-                user_last_usage.save(update_fields=["last_used_at"])
+                await user_last_usage.asave(update_fields=["last_used_at"])
                 return True, "Premium user"
             if not created:
                 now = timezone.now()
@@ -210,7 +562,7 @@ class UserLastUsage(models.Model):
                     return False, "Rate limit exceeded"
                 else:
                     user_last_usage.last_used_at = now
-                    user_last_usage.save(update_fields=["last_used_at"])
+                    await user_last_usage.asave(update_fields=["last_used_at"])
                     return True, "Updated"
             else:
                 return True, "Created"
@@ -0,0 +1,83 @@
+import base64
+import datetime
+import json
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.utils.urls import replace_query_param
+
+from todos.sync import InvalidCursorError
+
+TODO_PAGE_SIZE = getattr(settings, "TODO_PAGE_SIZE", 50)
+TODO_MAX_PAGE_SIZE = getattr(settings, "TODO_MAX_PAGE_SIZE", 100)
+# start_date 나 end_date 하나만 있으면 이 기간만큼을 조회합니다.
+# 둘 다 없으면 오늘의 앞뒤로 이 기간만큼을 조회합니다.
+TODO_DATE_WINDOW_DAYS = getattr(settings, "TODO_DATE_WINDOW_DAYS", 31)
+
+
+def encode_todo_cursor(todo):
+    key = [str(todo["date"]), todo["rank"], todo["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_todo_cursor(cursor):
+    """
+    - cursor 를 (date, rank, id) 로 바꿉니다.
+    """
+    try:
+        date, rank, id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.date.fromisoformat(date), str(rank), int(id)
+    except (TypeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+
+
+def get_page_size(page_size):
+    """
+    - 요청한 page_size 를 TODO_MAX_PAGE_SIZE 이하로 제한합니다.
+    """
+    if page_size is None:
+        return TODO_PAGE_SIZE
+    page_size = int(page_size)
+    if page_size < 1:
+        raise ValueError("page_size must be positive")
+    return min(page_size, TODO_MAX_PAGE_SIZE)
+
+
+def get_local_date(utc_offset):
+    """
+    - utc_offset(분) 기준의 오늘 날짜를 반환합니다.
+    """
+    return (timezone.now() + datetime.timedelta(minutes=utc_offset)).date()
+
+
+def get_date_window(start_date, end_date, today=None):
+    """
+    - 하나만 주어진 날짜는 TODO_DATE_WINDOW_DAYS 기간으로 채웁니다.
+    - 둘 다 없으면 today 앞뒤로 TODO_DATE_WINDOW_DAYS 일을 조회합니다.
+    """
+    window = datetime.timedelta(days=TODO_DATE_WINDOW_DAYS - 1)
+    if start_date is not None:
+        start_date = datetime.date.fromisoformat(start_date)
+    if end_date is not None:
+        end_date = datetime.date.fromisoformat(end_date)
+    if start_date is not None and end_date is None:
+        end_date = start_date + window
+    elif start_date is None and end_date is not None:
+        start_date = end_date - window
+    elif start_date is None and end_date is None:
+        if today is None:
+            today = timezone.localdate()
+        days = datetime.timedelta(days=TODO_DATE_WINDOW_DAYS)
+        start_date, end_date = today - days, today + days
+    return start_date, end_date
+
+
+def get_next_link(request, data, page_size):
+    """
+    - 페이지가 가득 찼으면 마지막 todo 다음부터 읽는 URL 을 반환합니다.
+    """
+    if len(data) < page_size:
+        return None
+    return replace_query_param(
+        request.build_absolute_uri(), "cursor", encode_todo_cursor(data[-1])
+    )
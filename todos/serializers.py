@@ -1,19 +1,63 @@
 # todos/serializers.py
 
 import django.utils.timezone as timezone
+from django.db import transaction
 from rest_framework import serializers
 
 from accounts.models import User
+from onestep_be.renderers import CamelCaseSerializerMixin
 
 from .models import Category, SubTodo, Todo
 
+BATCH_MAX_OPERATIONS = 100
+
 
 class PatchRankSerializer(serializers.Serializer):
     prev_id = serializers.IntegerField(allow_null=True)
     next_id = serializers.IntegerField(allow_null=True)
 
 
-class CategorySerializer(serializers.ModelSerializer):
+def get_related(context, model):
+    return context.get("related", {}).get(model, {})
+
+
+class RelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    - context 의 related 에 미리 불러온 항목이 있으면 DB 조회 없이
+      씁니다.
+    """
+
+    def to_internal_value(self, data):
+        related = get_related(self.context, self.queryset.model)
+        try:
+            return related[int(data)]
+        except (KeyError, TypeError, ValueError):
+            return super().to_internal_value(data)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    type = serializers.ChoiceField(choices=["todo", "subtodo", "category"])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, data):
+        if data["op"] != "create" and data.get("id") is None:
+            raise serializers.ValidationError(
+                "id must be provided for update and delete"
+            )
+        return data
+
+
+class BatchSerializer(serializers.Serializer):
+    operations = BatchOperationSerializer(
+        many=True, allow_empty=False, max_length=BATCH_MAX_OPERATIONS
+    )
+
+
+class CategorySerializer(
+    CamelCaseSerializerMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Category
         fields = "__all__"
@@ -26,8 +70,7 @@ class CategorySerializer(serializers.ModelSerializer):
         return data
 
     def validate(self, data):
-        request = self.context["request"]
-        if request.method == "PATCH":
+        if self.instance is not None:
             if not any(
                 data.get(field) for field in ["color", "title", "rank"]
             ):
@@ -39,11 +82,9 @@ class CategorySerializer(serializers.ModelSerializer):
         return data
 
 
-class SubTodoSerializer(serializers.ModelSerializer):
+class SubTodoSerializer(CamelCaseSerializerMixin, serializers.ModelSerializer):
     content = serializers.CharField(max_length=255)
-    todo_id = serializers.PrimaryKeyRelatedField(
-        queryset=Todo.objects.all(), required=True
-    )
+    todo_id = RelatedField(queryset=Todo.objects.all(), required=True)
     date = serializers.DateField(required=False, allow_null=True)
     rank = serializers.CharField(max_length=255, required=False)
     is_completed = serializers.BooleanField(default=False)
@@ -61,8 +102,7 @@ class SubTodoSerializer(serializers.ModelSerializer):
         return data
 
     def validate(self, data):
-        request = self.context["request"]
-        if request.method == "PATCH":
+        if self.instance is not None:
             if not any(
                 data.get(field) is not None
                 for field in [
@@ -81,20 +121,21 @@ class SubTodoSerializer(serializers.ModelSerializer):
         return data
 
     def update(self, instance, validated_data):
+        patch_rank = validated_data.pop("patch_rank", None)
+        if patch_rank is not None:
+            SubTodo.objects.move(
+                instance, patch_rank.get("prev_id"), patch_rank.get("next_id")
+            )
+        if not validated_data:
+            return instance
         for attr, value in validated_data.items():
-            if attr == "patch_rank":
-                rank = SubTodo.objects.get_update_rank(
-                    instance, value.get("prev_id"), value.get("next_id")
-                )
-                setattr(instance, "rank", rank)
-            else:
-                setattr(instance, attr, value)
+            setattr(instance, attr, value)
         instance.updated_at = timezone.now()
         instance.save()
         return instance
 
 
-class GetTodoSerializer(serializers.ModelSerializer):
+class GetTodoSerializer(CamelCaseSerializerMixin, serializers.ModelSerializer):
     children = SubTodoSerializer(many=True, read_only=True, source="subtodos")
 
     class Meta:
@@ -112,11 +153,9 @@ class GetTodoSerializer(serializers.ModelSerializer):
         ]
 
 
-class TodoSerializer(serializers.ModelSerializer):
+class TodoSerializer(CamelCaseSerializerMixin, serializers.ModelSerializer):
     content = serializers.CharField(max_length=255)
-    category_id = serializers.PrimaryKeyRelatedField(
-        queryset=Category.objects.all(), required=True
-    )
+    category_id = RelatedField(queryset=Category.objects.all(), required=True)
     user_id = serializers.PrimaryKeyRelatedField(
         queryset=User.objects.all(), required=False
     )
@@ -141,6 +180,8 @@ class TodoSerializer(serializers.ModelSerializer):
         ]
 
     def validate_category_id(self, data):
+        if data.id in get_related(self.context, Category):
+            return data
         if not Category.objects.filter(id=data.id).exists():
             raise serializers.ValidationError("Category does not exist")
         return data
@@ -151,9 +192,7 @@ class TodoSerializer(serializers.ModelSerializer):
         return data
 
     def validate(self, data):
-        request = self.context["request"]
-
-        if request.method == "PATCH":
+        if self.instance is not None:
             if not any(
                 data.get(field) is not None
                 for field in [
@@ -173,24 +212,26 @@ class TodoSerializer(serializers.ModelSerializer):
         return data
 
     def update(self, instance, validated_data):
+        # Move the todo first, the rank is saved by a conditional UPDATE
+        patch_rank = validated_data.pop("patch_rank", None)
+        if patch_rank is not None:
+            Todo.objects.move(
+                instance, patch_rank.get("prev_id"), patch_rank.get("next_id")
+            )
+        if not validated_data:
+            return instance
+
         # Update the fields as usual
         for attr, value in validated_data.items():
-            if attr == "patch_rank":
-                # If the rank field is provided, update the rank field
-                rank = Todo.objects.get_update_rank(
-                    instance, value.get("prev_id"), value.get("next_id")
-                )
-                setattr(instance, "rank", rank)
-            elif attr == "date":
-                subtodos = SubTodo.objects.filter(todo_id=instance.id).all()
-                for subtodo in subtodos:
-                    setattr(subtodo, attr, value)
-                    subtodo.save()
-                setattr(instance, attr, value)
-            else:
-                setattr(instance, attr, value)
+            setattr(instance, attr, value)
 
         # Set the updated_at field to the current time
         instance.updated_at = timezone.now()
-        instance.save()
+        with transaction.atomic():
+            if "date" in validated_data:
+                # Propagate the date to the subtodos in a single UPDATE
+                SubTodo.objects.filter(todo_id=instance.id).update(
+                    date=instance.date, updated_at=instance.updated_at
+                )
+            instance.save()
         return instance
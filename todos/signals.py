@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from todos.cache import invalidate_user_cache
+from todos.models import Category, SubTodo, Todo
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_save, sender=SubTodo)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Todo)
+@receiver(post_delete, sender=SubTodo)
+@receiver(post_delete, sender=Category)
+def invalidate_todo_cache(sender, instance, **kwargs):
+    """
+    - Todo / SubTodo / Category 가 저장되거나 삭제되면 user 의 목록 cache 를 무효화합니다.
+    - queryset.update() 는 signal 을 보내지 않으므로 TodosManager 에서 따로 무효화합니다.
+    """  # noqa: E501
+    invalidate_user_cache(sender.objects.get_owner_id(instance))
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from todos.models import Category, SubTodo, Todo
+from todos.serializers import (
+    CategorySerializer,
+    SubTodoSerializer,
+    TodoSerializer,
+)
+
+# 아직 commit 되지 않은 transaction 의 updated_at 은 cursor 보다 과거일 수
+# 있으므로, 새 cursor 는 현재 시각보다 이만큼 앞으로 둡니다.
+SYNC_CURSOR_LAG = getattr(settings, "SYNC_CURSOR_LAG", 5)
+
+SYNC_MODELS = (
+    ("todos", Todo, TodoSerializer),
+    ("subtodos", SubTodo, SubTodoSerializer),
+    ("categories", Category, CategorySerializer),
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(moment):
+    delta = moment - datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+    return str(delta // timedelta(microseconds=1))
+
+
+def decode_cursor(cursor):
+    try:
+        microseconds = int(cursor)
+    except (TypeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    if microseconds < 0:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return datetime(1970, 1, 1, tzinfo=dt_timezone.utc) + timedelta(
+        microseconds=microseconds
+    )
+
+
+def get_sync_data(user_id, cursor=None):
+    """
+    - cursor 이후 바뀐 Todo, SubTodo, Category 를 upserts 와 deletes 로
+      반환합니다.
+    - cursor 가 없으면 삭제되지 않은 전체 항목을 upserts 로 반환합니다.
+    - 새 cursor 는 SYNC_CURSOR_LAG 초 전 시각이며 이전 cursor 보다 작아지지
+      않습니다. 겹치는 구간의 항목은 다시 내려가지만 upsert 라 안전합니다.
+    - 현재 시각보다 미래인 cursor 는 그 사이의 변경을 놓치게 되므로 거부합니다.
+    """
+    since = decode_cursor(cursor) if cursor is not None else None
+    now = timezone.now()
+    if since is not None and since > now:
+        raise InvalidCursorError(f"Cursor is in the future: {cursor}")
+    next_cursor = now - timedelta(seconds=SYNC_CURSOR_LAG)
+    if since is not None:
+        next_cursor = max(next_cursor, since)
+    data = {"cursor": encode_cursor(next_cursor)}
+    for name, model, serializer_class in SYNC_MODELS:
+        upserts, deletes = [], []
+        for instance in model.objects.get_changes(user_id, since):
+            if instance.deleted_at is not None:
+                deletes.append(instance.id)
+            else:
+                upserts.append(instance)
+        data[name] = {
+            "upserts": serializer_class(upserts, many=True).data,
+            "deletes": deletes,
+        }
+    return data
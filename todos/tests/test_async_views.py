@@ -0,0 +1,98 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from django.urls import reverse
+
+from accounts.tokens import CustomRefreshToken
+from todos.models import Todo
+from todos.views import (
+    CategoryView,
+    InboxView,
+    RecommendSubTodo,
+    SubTodoView,
+    TodoView,
+)
+
+"""
+======================================
+# Async view checklist #
+- todo, subtodo, category, inbox and recommend views are coroutine views
+- JWT authentication works through the async auth path
+- camelCase query parameters are converted by the async middleware
+- writes run the sync ORM in a thread and still notify / invalidate
+======================================
+"""
+
+
+def get_auth_headers(user):
+    token = CustomRefreshToken.for_user(user, "device").access_token
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.parametrize(
+    "view", [TodoView, SubTodoView, CategoryView, InboxView, RecommendSubTodo]
+)
+def test_views_are_async(view):
+    assert view.view_is_async
+    assert iscoroutinefunction(view.as_view())
+
+
+@pytest.mark.django_db
+def test_async_get_with_bearer_token(create_user, create_category):
+    response = async_to_sync(AsyncClient().get)(
+        reverse("category"), headers=get_auth_headers(create_user)
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == create_category.id
+
+
+@pytest.mark.django_db
+def test_async_get_rejects_invalid_token():
+    response = async_to_sync(AsyncClient().get)(
+        reverse("category"), headers={"Authorization": "Bearer invalid"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_async_get_underscoreizes_query(create_user, create_todo):
+    response = async_to_sync(AsyncClient().get)(
+        reverse("todos"),
+        {"startDate": "2024-08-01", "endDate": "2024-08-01", "pageSize": 1},
+        headers=get_auth_headers(create_user),
+    )
+    assert response.status_code == 200
+    assert [todo["id"] for todo in response.json()] == [create_todo.id]
+
+
+@pytest.mark.django_db
+def test_async_patch_invalidates_list(create_user, create_todo):
+    client = AsyncClient()
+    headers = get_auth_headers(create_user)
+    params = {"start_date": "2024-08-01", "end_date": "2024-08-01"}
+    async_to_sync(client.get)(reverse("todos"), params, headers=headers)
+
+    response = async_to_sync(client.patch)(
+        reverse("todos"),
+        {"todo_id": create_todo.id, "content": "Updated Todo"},
+        content_type="application/json",
+        headers=headers,
+    )
+    assert response.status_code == 200
+    assert Todo.objects.get(id=create_todo.id).content == "Updated Todo"
+
+    response = async_to_sync(client.get)(
+        reverse("todos"), params, headers=headers
+    )
+    assert response.json()[0]["content"] == "Updated Todo"
+
+
+@pytest.mark.django_db
+def test_async_delete_not_found(create_user):
+    response = async_to_sync(AsyncClient().delete)(
+        reverse("todos"),
+        {"todo_id": 999},
+        content_type="application/json",
+        headers=get_auth_headers(create_user),
+    )
+    assert response.status_code == 400
@@ -0,0 +1,192 @@
+import pytest
+from django.urls import reverse
+
+from accounts.models import User
+from todos.models import Category, SubTodo, Todo
+
+"""
+======================================
+# Batch checklist #
+- operations are applied in order with per-operation results
+- creates, updates and deletes can be mixed in one batch
+- updates and deletes are applied in bulk
+- a failing operation rolls back the whole batch
+- items of other users cannot be referenced
+======================================
+"""
+
+
+def post_batch(client, operations):
+    return client.post(
+        reverse("batch"), {"operations": operations}, format="json"
+    )
+
+
+@pytest.mark.django_db
+def test_batch_create(authenticated_client, create_category):
+    response = post_batch(
+        authenticated_client,
+        [
+            {
+                "op": "create",
+                "type": "todo",
+                "data": {
+                    "content": "first",
+                    "category_id": create_category.id,
+                },
+            },
+            {
+                "op": "create",
+                "type": "todo",
+                "data": {
+                    "content": "second",
+                    "category_id": create_category.id,
+                },
+            },
+        ],
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [201, 201]
+    first, second = (result["data"] for result in results)
+    assert Todo.objects.get(id=first["id"]).content == "first"
+    assert Todo.objects.get(id=second["id"]).content == "second"
+    assert first["rank"] < second["rank"]
+
+
+@pytest.mark.django_db
+def test_batch_mixed_operations(authenticated_client):
+    category = post_batch(
+        authenticated_client,
+        [{"op": "create", "type": "category", "data": {"color": 1}}],
+    ).json()["results"][0]["data"]
+    response = post_batch(
+        authenticated_client,
+        [
+            {
+                "op": "create",
+                "type": "todo",
+                "data": {"content": "todo", "category_id": category["id"]},
+            },
+        ],
+    )
+    todo = response.json()["results"][0]["data"]
+    response = post_batch(
+        authenticated_client,
+        [
+            {
+                "op": "create",
+                "type": "subtodo",
+                "data": {"content": "sub", "todo_id": todo["id"]},
+            },
+            {"op": "delete", "type": "category", "id": category["id"]},
+        ],
+    )
+    assert response.status_code == 200
+    assert not Category.objects.filter(id=category["id"]).exists()
+    assert not Todo.objects.filter(id=todo["id"]).exists()
+    assert not SubTodo.objects.filter(todo_id=todo["id"]).exists()
+
+
+@pytest.mark.django_db
+def test_batch_update(authenticated_client, create_user, create_todo):
+    other = Todo.objects.create(
+        user_id=create_user,
+        content="other",
+        category_id=create_todo.category_id,
+    )
+    subtodo = SubTodo.objects.create(todo_id=create_todo, content="sub")
+    response = post_batch(
+        authenticated_client,
+        [
+            {
+                "op": "update",
+                "type": "todo",
+                "id": create_todo.id,
+                "data": {"date": "2024-09-01"},
+            },
+            {
+                "op": "update",
+                "type": "todo",
+                "id": other.id,
+                "data": {"is_completed": True},
+            },
+        ],
+    )
+    assert response.status_code == 200
+    create_todo.refresh_from_db()
+    other.refresh_from_db()
+    subtodo.refresh_from_db()
+    assert str(create_todo.date) == "2024-09-01"
+    assert str(subtodo.date) == "2024-09-01"
+    assert other.is_completed
+
+
+@pytest.mark.django_db
+def test_batch_rolls_back_on_error(authenticated_client, create_todo):
+    response = post_batch(
+        authenticated_client,
+        [
+            {
+                "op": "update",
+                "type": "todo",
+                "id": create_todo.id,
+                "data": {"content": "changed"},
+            },
+            {"op": "delete", "type": "subtodo", "id": 0},
+        ],
+    )
+    assert response.status_code == 404
+    assert response.json()["index"] == 1
+    create_todo.refresh_from_db()
+    assert create_todo.content == "Test Todo"
+
+
+@pytest.mark.django_db
+def test_batch_rejects_other_users_items(authenticated_client, create_todo):
+    user = User.objects.create_user(
+        username="otheruser",
+        email="otheruser@example.com",
+        password="otherpassword",
+    )
+    other = Category.objects.create(user_id=user, color=1, title="other")
+    response = post_batch(
+        authenticated_client,
+        [
+            {
+                "op": "create",
+                "type": "todo",
+                "data": {"content": "todo", "category_id": other.id},
+            },
+        ],
+    )
+    assert response.status_code == 404
+    assert Todo.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_batch_requires_id(authenticated_client):
+    response = post_batch(
+        authenticated_client, [{"op": "delete", "type": "todo"}]
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("kind", ["todo", "subtodo"])
+def test_batch_create_validates_in_bulk(
+    authenticated_client, create_todo, capture_queries, kind
+):
+    if kind == "todo":
+        data = {"content": "todo", "category_id": create_todo.category_id.id}
+    else:
+        data = {"content": "sub", "todo_id": create_todo.id}
+    counts = []
+    # 처음 만들 때만 실행되는 rank tail 조회를 먼저 끝내 둡니다.
+    for size in (1, 1, 5):
+        operations = [{"op": "create", "type": kind, "data": data}] * size
+        with capture_queries() as queries:
+            response = post_batch(authenticated_client, operations)
+        assert response.status_code == 200
+        counts.append(len(queries))
+    assert counts[1] == counts[2]
@@ -0,0 +1,58 @@
+import pytest
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from onestep_be.renderers import CamelCaseJSONRenderer as FastRenderer
+from onestep_be.renderers import CamelCaseReturnDict, CamelCaseReturnList
+from todos.models import SubTodo, Todo
+from todos.serializers import GetTodoSerializer, TodoSerializer
+
+"""
+======================================
+# camelCase serializer checklist #
+- serializers emit camelCase keys
+- rendered bytes match the camelizing renderer
+- validation errors keep their field names and are still camelized
+======================================
+"""
+
+
+@pytest.mark.django_db
+def test_serializer_emits_camel_case_keys(create_todo):
+    SubTodo.objects.create(todo_id=create_todo, content="sub")
+    data = GetTodoSerializer(create_todo).data
+    assert isinstance(data, CamelCaseReturnDict)
+    assert list(data) == [
+        "id",
+        "content",
+        "categoryId",
+        "date",
+        "dueTime",
+        "userId",
+        "rank",
+        "isCompleted",
+        "children",
+    ]
+    assert "todoId" in data["children"][0]
+    assert "createdAt" in data["children"][0]
+
+
+@pytest.mark.django_db
+def test_render_matches_camelizing_renderer(create_todo):
+    SubTodo.objects.create(todo_id=create_todo, content="sub")
+    data = GetTodoSerializer(
+        Todo.objects.filter(id=create_todo.id), many=True
+    ).data
+    assert isinstance(data, CamelCaseReturnList)
+    assert FastRenderer().render(data) == CamelCaseJSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+def test_errors_are_camelized(create_user):
+    request = APIRequestFactory().post("/")
+    serializer = TodoSerializer(
+        context={"request": request}, data={"content": "todo"}
+    )
+    assert not serializer.is_valid()
+    assert not isinstance(serializer.data, CamelCaseReturnDict)
+    assert b"categoryId" in FastRenderer().render({"error": serializer.errors})
@@ -1,13 +1,14 @@
 import pytest
 from django.urls import reverse
 
-from todos.models import Category
+from todos.models import Category, SubTodo, Todo
 
 """
 ======================================
 # category Delete checklist #
 - correct test
 - category_id validation
+- todos and subtodos are deleted with the category
 ======================================
 """
 
@@ -42,3 +43,16 @@ def test_delete_category_invalid_id(
     data = {"category_id": 999}
     response = authenticated_client.delete(url, data, format="json")
     assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_delete_category_cascade(
+    authenticated_client, create_category, create_todo, content
+):
+    subtodo = SubTodo.objects.create(todo_id=create_todo, content=content)
+    url = reverse("category")
+    data = {"category_id": create_category.id}
+    response = authenticated_client.delete(url, data, format="json")
+    assert response.status_code == 200
+    assert not Todo.objects.filter(category_id=create_category).exists()
+    assert not SubTodo.objects.filter(id=subtodo.id).exists()
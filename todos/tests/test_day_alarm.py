@@ -0,0 +1,194 @@
+from unittest.mock import Mock, patch
+
+import datetime
+
+import pytest
+from django.utils import timezone
+from fcm_django.models import FCMDevice
+from firebase_admin import messaging
+
+from todos.jobs import (
+    AlarmReport,
+    get_alarm_offsets,
+    iter_alarm_messages,
+    send_alarm_messages,
+    send_day_alarm,
+    send_scheduled_alarms,
+)
+from todos.models import Todo, User
+
+"""
+======================================
+# Day alarm checklist #
+- messages are sent in batches
+- failures are recorded per token
+- invalid tokens are deactivated
+- failures are reported to sentry without stopping the job
+- alarm body has only today's live incomplete todos
+- alarm messages are built with a constant number of queries
+- scheduled alarms only reach users whose local time is an alarm hour
+- scheduled alarms are sharded by user_id
+======================================
+"""
+
+
+def make_message(token):
+    return messaging.Message(
+        token=token,
+        notification=messaging.Notification(title="title", body="body"),
+    )
+
+
+def make_response(results):
+    return Mock(
+        responses=[
+            Mock(success=error is None, exception=error) for error in results
+        ]
+    )
+
+
+def test_send_alarm_messages_in_batches():
+    send_each = Mock(
+        side_effect=lambda batch: make_response([None] * len(batch))
+    )
+    messages = [make_message(f"token{i}") for i in range(5)]
+    with patch("todos.jobs.messaging.send_each", send_each):
+        report = send_alarm_messages(messages, batch_size=2, max_workers=2)
+    assert [len(call.args[0]) for call in send_each.call_args_list] == [
+        2,
+        2,
+        1,
+    ]
+    assert report.sent == 5
+    assert report.failures == {}
+
+
+@pytest.mark.django_db
+def test_send_alarm_messages_prunes_invalid_tokens(create_user):
+    FCMDevice.objects.create(user=create_user, registration_id="invalid")
+    FCMDevice.objects.create(user=create_user, registration_id="valid")
+    unregistered = messaging.UnregisteredError("unregistered")
+    send_each = Mock(return_value=make_response([unregistered, None]))
+    messages = [make_message("invalid"), make_message("valid")]
+    with patch("todos.jobs.messaging.send_each", send_each):
+        report = send_alarm_messages(messages)
+    assert report.sent == 1
+    assert report.failures == {"invalid": unregistered}
+    assert report.pruned == 1
+    assert not FCMDevice.objects.get(registration_id="invalid").active
+    assert FCMDevice.objects.get(registration_id="valid").active
+
+
+def test_send_alarm_messages_batch_error():
+    send_each = Mock(side_effect=Exception("unavailable"))
+    messages = [make_message("token1"), make_message("token2")]
+    with patch("todos.jobs.messaging.send_each", send_each):
+        report = send_alarm_messages(messages)
+    assert report.sent == 0
+    assert set(report.failures) == {"token1", "token2"}
+
+
+@pytest.mark.django_db
+def test_send_day_alarm_reports_failures(create_user):
+    FCMDevice.objects.create(user=create_user, registration_id="stale")
+    FCMDevice.objects.create(user=create_user, registration_id="valid")
+    unregistered = messaging.UnregisteredError("unregistered")
+    send_each = Mock(return_value=make_response([unregistered, None]))
+    with patch("todos.jobs.messaging.send_each", send_each):
+        report = send_day_alarm("title", date=datetime.date(2024, 8, 1))
+    assert report.sent == 1
+    assert report.failures == {"stale": unregistered}
+    assert report.pruned == 1
+
+
+@pytest.mark.django_db
+def test_alarm_messages_body(
+    create_user, create_category, django_assert_num_queries
+):
+    today = datetime.date(2024, 8, 1)
+    other_user = User.objects.create_user(username="otheruser")
+    FCMDevice.objects.create(user=create_user, registration_id="device1")
+    FCMDevice.objects.create(user=create_user, registration_id="device2")
+    FCMDevice.objects.create(user=other_user, registration_id="device3")
+    todos = [
+        ("first", today, False, None, "0|hzzzzz:"),
+        ("second", today, False, None, "0|i00007:"),
+        ("completed", today, True, None, "0|i0000f:"),
+        ("deleted", today, False, timezone.now(), "0|i0000n:"),
+        ("tomorrow", today + datetime.timedelta(days=1), False, None, "0"),
+    ]
+    for content, date, is_completed, deleted_at, rank in todos:
+        Todo.objects.create(
+            user_id=create_user,
+            category_id=create_category,
+            content=content,
+            date=date,
+            is_completed=is_completed,
+            deleted_at=deleted_at,
+            rank=rank,
+        )
+
+    with django_assert_num_queries(2):
+        messages = list(iter_alarm_messages("title", date=today))
+    bodies = {message.token: message.notification.body for message in messages}
+    assert bodies == {
+        "device1": "first\nsecond",
+        "device2": "first\nsecond",
+        "device3": "",
+    }
+
+
+def test_alarm_offsets():
+    slot = datetime.datetime(2024, 8, 1, 23, 0, tzinfo=datetime.timezone.utc)
+    # 23:00 UTC is 08:00 KST (+09:00)
+    assert get_alarm_offsets(slot, 8) == [540]
+    # 23:00 UTC is 14:00 at -09:00 and 20:00 at -03:00
+    assert get_alarm_offsets(slot, 14) == [-540]
+    assert get_alarm_offsets(slot, 20) == [-180]
+    slot = datetime.datetime(2024, 8, 1, 18, 15, tzinfo=datetime.timezone.utc)
+    # 20:00 at +01:45, 08:00 at +13:45 or at -10:15 on the previous day
+    assert get_alarm_offsets(slot, 20) == [105]
+    assert get_alarm_offsets(slot, 8) == [825, -615]
+
+
+@pytest.mark.django_db
+def test_scheduled_alarms_local_time(create_user):
+    create_user.utc_offset = 540
+    create_user.save()
+    other_user = User.objects.create_user(username="otheruser", utc_offset=0)
+    FCMDevice.objects.create(user=create_user, registration_id="kst")
+    FCMDevice.objects.create(user=other_user, registration_id="utc")
+
+    captured = []
+
+    def capture(messages):
+        captured.extend(messages)
+        return AlarmReport(sent=len(captured))
+
+    now = datetime.datetime(2024, 8, 1, 23, 7, tzinfo=datetime.timezone.utc)
+    with patch("todos.jobs.send_alarm_messages", capture):
+        send_scheduled_alarms(now=now, shard_index=0, shard_count=1)
+    assert [message.token for message in captured] == ["kst"]
+    assert captured[0].notification.title == "오늘의 할 일을 확인해보세요"
+
+
+@pytest.mark.django_db
+def test_scheduled_alarms_sharded(create_user):
+    other_user = User.objects.create_user(username="otheruser")
+    FCMDevice.objects.create(user=create_user, registration_id="first")
+    FCMDevice.objects.create(user=other_user, registration_id="second")
+
+    now = datetime.datetime(2024, 8, 1, 23, 0, tzinfo=datetime.timezone.utc)
+    tokens = {}
+    for shard_index in range(2):
+        captured = []
+        with patch(
+            "todos.jobs.send_alarm_messages",
+            lambda messages: captured.extend(messages) or AlarmReport(),
+        ):
+            send_scheduled_alarms(
+                now=now, shard_index=shard_index, shard_count=2
+            )
+        tokens[shard_index] = [message.token for message in captured]
+    assert sorted(tokens[0] + tokens[1]) == ["first", "second"]
+    assert len(tokens[0]) == len(tokens[1]) == 1
@@ -0,0 +1,115 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todos.cache import get_version_key
+from todos.models import Category, SubTodo, Todo
+
+"""
+======================================
+# List ETag checklist #
+- list responses carry an ETag
+- matching If-None-Match returns 304 without loading the list
+- changes (including soft deletes) change the ETag
+- writes that did not invalidate this process's cache still change it
+- each list has its own ETag
+======================================
+"""
+
+
+@pytest.mark.django_db
+def test_todo_list_not_modified(authenticated_client, create_todo):
+    url = reverse("todos")
+    response = authenticated_client.get(url)
+    etag = response.headers["ETag"]
+
+    response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.django_db
+def test_todo_list_not_modified_skips_list_queries(
+    authenticated_client, create_todo
+):
+    url = reverse("todos")
+    etag = authenticated_client.get(url).headers["ETag"]
+    cache.clear()
+
+    with CaptureQueriesContext(connection) as context:
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    # Todo / SubTodo fingerprint 조회만 실행합니다.
+    assert len(context.captured_queries) == 2
+
+
+@pytest.mark.django_db
+def test_todo_list_etag_changes_on_subtodo_update(
+    authenticated_client, create_todo, content
+):
+    url = reverse("todos")
+    params = {"start_date": "2024-08-01"}
+    etag = authenticated_client.get(url, params).headers["ETag"]
+    SubTodo.objects.create(todo_id=create_todo, content=content)
+
+    response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()[0]["children"]) == 1
+
+
+@pytest.mark.django_db
+def test_todo_list_etag_checked_when_cached(authenticated_client, create_todo):
+    url = reverse("todos")
+    params = {"start_date": "2024-08-01"}
+    etag = authenticated_client.get(url, params).headers["ETag"]
+    # 다른 process 의 변경처럼 이 process 의 cache version 은 그대로 둡니다.
+    key = get_version_key(create_todo.user_id.id)
+    version = cache.get(key)
+    create_todo.content = "changed"
+    create_todo.save()
+    cache.set(key, version, timeout=None)
+
+    response = authenticated_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["content"] == "changed"
+
+
+@pytest.mark.django_db
+def test_category_list_etag_changes_on_delete(
+    authenticated_client, create_category
+):
+    url = reverse("category")
+    etag = authenticated_client.get(url).headers["ETag"]
+    assert (
+        authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+        == 304
+    )
+    Category.objects.delete_instance(create_category)
+    cache.clear()
+
+    response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.django_db
+def test_list_etags_differ_by_view(
+    authenticated_client, create_user, create_category
+):
+    Todo.objects.create(
+        user_id=create_user,
+        content="inbox",
+        category_id=create_category,
+        rank="0|hzzzzz:",
+    )
+    todo_etag = authenticated_client.get(reverse("todos")).headers["ETag"]
+    inbox = authenticated_client.get(
+        reverse("inbox"), HTTP_IF_NONE_MATCH=todo_etag
+    )
+    assert inbox.status_code == 200
+    assert inbox.headers["ETag"] != todo_etag
@@ -0,0 +1,134 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from firebase_admin import messaging
+from firebase_admin.exceptions import UnavailableError
+
+from todos.firebase_messaging import (
+    PushDispatcher,
+    PushJob,
+    SyncPushResult,
+    send_push_notification_device,
+    send_sync_notification,
+)
+
+"""
+======================================
+# Push dispatch checklist #
+- job is enqueued only after commit
+- pushes of one user are coalesced within the window
+- failed send is retried
+- only devices that failed are retried, invalid tokens are not
+- job fails after max retries
+- metrics are logged
+======================================
+"""
+
+
+@pytest.mark.django_db
+def test_push_enqueued_on_commit(
+    create_user, django_capture_on_commit_callbacks
+):
+    with patch(
+        "todos.firebase_messaging.push_dispatcher._coalesce"
+    ) as coalesce:
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            send_push_notification_device(
+                "device_token", create_user, "title", "body"
+            )
+        coalesce.assert_not_called()
+        for callback in callbacks:
+            callback()
+        coalesce.assert_called_once_with(
+            create_user.id, "device_token", "title", "body"
+        )
+
+
+def test_push_coalesced_per_user():
+    dispatcher = PushDispatcher(window=0.05)
+    jobs = []
+    with patch.object(dispatcher, "_put", jobs.append):
+        dispatcher._coalesce(1, "a", "Todo", "changed")
+        dispatcher._coalesce(1, "b", "Todo", "changed")
+        dispatcher._coalesce(2, "a", "Todo", "changed")
+        dispatcher._coalesce(2, "a", "SubTodo", "changed")
+        time.sleep(0.3)
+    jobs = {job.user_id: job for job in jobs}
+    assert len(jobs) == 2
+    assert jobs[1].origin_tokens == {"a", "b"}
+    assert jobs[1].title == "Todo"
+    assert jobs[2].origin_tokens == {"a"}
+    assert jobs[2].title == "Sync"
+    assert dispatcher.get_metrics()["coalesced"] == 2
+
+
+def test_push_retried_until_sent():
+    dispatcher = PushDispatcher(max_retries=3, retry_backoff=0)
+    send = Mock(side_effect=[Exception("unavailable"), SyncPushResult(1)])
+    with patch("todos.firebase_messaging.send_sync_notification", send):
+        dispatcher._process(PushJob(1, {"token"}, "title", "body"))
+    assert send.call_count == 2
+    metrics = dispatcher.get_metrics()
+    assert metrics["retried"] == 1
+    assert metrics["sent"] == 1
+
+
+def test_push_failed_after_max_retries():
+    dispatcher = PushDispatcher(max_retries=2, retry_backoff=0)
+    send = Mock(side_effect=Exception("unavailable"))
+    with patch("todos.firebase_messaging.send_sync_notification", send):
+        dispatcher._process(PushJob(1, {"token"}, "title", "body"))
+    assert send.call_count == 3
+    assert dispatcher.get_metrics()["failed"] == 1
+
+
+def make_send_response(tokens, responses, deactivated=()):
+    return Mock(
+        registration_ids_sent=tokens,
+        response=messaging.BatchResponse(responses),
+        deactivated_registration_ids=list(deactivated),
+    )
+
+
+def test_sync_notification_result_per_device():
+    unavailable = UnavailableError("unavailable", "unavailable")
+    responses = [
+        messaging.SendResponse({"name": "sent"}, None),
+        messaging.SendResponse(None, unavailable),
+        messaging.SendResponse(None, Exception("unregistered")),
+    ]
+    response = make_send_response(["a", "b", "c"], responses, ["c"])
+    with patch(
+        "fcm_django.models.FCMDeviceQuerySet.send_message",
+        return_value=response,
+    ):
+        result = send_sync_notification(1, {"origin"}, "title", "body")
+    assert result.sent == 1
+    assert result.deactivated == 1
+    assert result.errors == {"b": unavailable}
+
+
+def test_push_retries_failed_devices_only():
+    dispatcher = PushDispatcher(max_retries=3, retry_backoff=0)
+    send = Mock(
+        side_effect=[
+            SyncPushResult(2, errors={"b": Exception("unavailable")}),
+            SyncPushResult(1),
+        ]
+    )
+    with patch("todos.firebase_messaging.send_sync_notification", send):
+        dispatcher._process(PushJob(1, {"token"}, "title", "body"))
+    assert send.call_args_list[0].kwargs["tokens"] is None
+    assert send.call_args_list[1].kwargs["tokens"] == ["b"]
+    metrics = dispatcher.get_metrics()
+    assert metrics["sent"] == 3
+    assert metrics["retried"] == 1
+    assert metrics["failed"] == 0
+
+
+def test_push_metrics_logged(caplog):
+    dispatcher = PushDispatcher(metrics_interval=0)
+    with caplog.at_level("INFO", logger="todos.firebase_messaging"):
+        dispatcher._log_metrics()
+    assert "Push dispatch metrics" in caplog.text
@@ -0,0 +1,48 @@
+from todos.management.commands.explain_todo_queries import (
+    find_plan_problems,
+)
+
+"""
+======================================
+# Query plan checklist #
+- index range scan is ok
+- full scan is reported
+- filesort is reported
+======================================
+"""
+
+
+def test_find_plan_problems_index_scan():
+    plan = {
+        "query_block": {
+            "select_id": 1,
+            "ordering_operation": {
+                "using_filesort": False,
+                "table": {
+                    "table_name": "todos_todo",
+                    "access_type": "ref",
+                    "key": "todo_user_rank_idx",
+                },
+            },
+        }
+    }
+    assert find_plan_problems(plan) == []
+
+
+def test_find_plan_problems_full_scan_and_filesort():
+    plan = {
+        "query_block": {
+            "select_id": 1,
+            "ordering_operation": {
+                "using_filesort": True,
+                "table": {
+                    "table_name": "todos_todo",
+                    "access_type": "ALL",
+                },
+            },
+        }
+    }
+    assert find_plan_problems(plan) == [
+        "filesort",
+        "full scan on todos_todo",
+    ]
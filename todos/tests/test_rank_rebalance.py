@@ -0,0 +1,84 @@
+import pytest
+from django.core.management import call_command
+
+from todos.lexorank import needs_rebalance, rank_length_histogram
+from todos.models import RankTail, Todo
+
+"""
+======================================
+# Rank rebalance checklist #
+- long ranks are rewritten
+- order is preserved
+- rank tail follows the new last rank
+- short ranks are left alone
+- the command finds users with long or crowded ranks
+======================================
+"""
+
+
+@pytest.mark.django_db
+def test_rebalance_long_ranks(create_user, create_category, content):
+    ranks = [
+        "0|hzzzzz:",
+        "0|hzzzzz:i",
+        "0|hzzzzz:ii",
+        "0|hzzzzz:iii",
+        "0|hzzzzz:iiiiiiiiiiiiiiii",
+        "0|i00007:",
+    ]
+    todos = [
+        Todo.objects.create(
+            user_id=create_user,
+            content=content,
+            category_id=create_category,
+            rank=rank,
+        )
+        for rank in reversed(ranks)
+    ]
+    before, after = Todo.objects.rebalance_ranks(create_user.id)
+    assert before == ranks
+    assert len(after) == len(ranks)
+    assert all(rank.startswith("1|") for rank in after)
+    assert rank_length_histogram(after) == {9: len(ranks)}
+    assert after == sorted(after)
+
+    rebalanced = list(
+        Todo.objects.get_with_user_id(create_user.id).values_list(
+            "id", flat=True
+        )
+    )
+    assert rebalanced == [todo.id for todo in reversed(todos)]
+    tail = RankTail.objects.get(user_id=create_user, scope="todo")
+    assert tail.rank == after[-1]
+
+
+@pytest.mark.django_db
+def test_rebalance_skips_short_ranks(create_todo, create_user):
+    before, after = Todo.objects.rebalance_ranks(create_user.id)
+    assert before == after == [create_todo.rank]
+
+
+def test_needs_rebalance_crowded():
+    assert needs_rebalance(["0|hzzzzz:", "0|hzzzzz:i"])
+    assert not needs_rebalance(["0|hzzzzz:", "0|i00007:"])
+
+
+@pytest.mark.django_db
+def test_rebalance_command_finds_crowded_users(
+    create_user, create_category, content
+):
+    for rank in ("0|hzzzzz:", "0|hzzzzz:i", "0|i00007:"):
+        Todo.objects.create(
+            user_id=create_user,
+            content=content,
+            category_id=create_category,
+            rank=rank,
+        )
+    call_command("rebalance_ranks")
+    ranks = list(
+        Todo.objects.get_with_user_id(create_user.id).values_list(
+            "rank", flat=True
+        )
+    )
+    assert not needs_rebalance(ranks)
+    assert all(rank.startswith("1|") for rank in ranks)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from todos.models import Category, SubTodo, Todo
+from todos.sync import encode_cursor
+
+"""
+======================================
+# Sync checklist #
+- no cursor returns every live item
+- cursor returns only items changed since it
+- soft deletes come back as tombstones
+- cursor never goes backwards
+- invalid or future cursor is rejected
+======================================
+"""
+
+
+def age_items(user):
+    past = timezone.now() - timedelta(days=1)
+    Todo.objects.filter(user_id=user).update(updated_at=past)
+    SubTodo.objects.filter(todo_id__user_id=user).update(updated_at=past)
+    Category.objects.filter(user_id=user).update(updated_at=past)
+
+
+@pytest.mark.django_db
+def test_sync_without_cursor(authenticated_client, create_todo):
+    SubTodo.objects.create(todo_id=create_todo, content="sub")
+    response = authenticated_client.get(reverse("sync"))
+    assert response.status_code == 200
+    data = response.json()
+    assert [todo["id"] for todo in data["todos"]["upserts"]] == [
+        create_todo.id
+    ]
+    assert len(data["subtodos"]["upserts"]) == 1
+    assert len(data["categories"]["upserts"]) == 1
+    assert data["todos"]["deletes"] == []
+    assert data["cursor"]
+
+
+@pytest.mark.django_db
+def test_sync_returns_only_changes(
+    authenticated_client, create_user, create_todo
+):
+    other = Todo.objects.create(
+        user_id=create_user,
+        content="other",
+        category_id=create_todo.category_id,
+    )
+    age_items(create_user)
+    cursor = authenticated_client.get(reverse("sync")).json()["cursor"]
+
+    other.content = "changed"
+    other.save()
+    response = authenticated_client.get(reverse("sync"), {"since": cursor})
+    data = response.json()
+    assert [todo["id"] for todo in data["todos"]["upserts"]] == [other.id]
+    assert data["todos"]["deletes"] == []
+    assert data["categories"]["upserts"] == []
+
+
+@pytest.mark.django_db
+def test_sync_returns_tombstones(
+    authenticated_client, create_user, create_todo
+):
+    subtodo = SubTodo.objects.create(todo_id=create_todo, content="sub")
+    age_items(create_user)
+    cursor = authenticated_client.get(reverse("sync")).json()["cursor"]
+
+    Todo.objects.delete_instance(create_todo)
+    data = authenticated_client.get(reverse("sync"), {"since": cursor}).json()
+    assert data["todos"] == {"upserts": [], "deletes": [create_todo.id]}
+    assert data["subtodos"] == {"upserts": [], "deletes": [subtodo.id]}
+
+
+@pytest.mark.django_db
+def test_sync_cursor_is_monotonic(authenticated_client, create_todo):
+    age_items(create_todo.user_id)
+    recent = encode_cursor(timezone.now() - timedelta(seconds=1))
+    data = authenticated_client.get(reverse("sync"), {"since": recent}).json()
+    assert data["cursor"] == recent
+    assert data["todos"]["upserts"] == []
+
+
+@pytest.mark.django_db
+def test_sync_rejects_future_cursor(authenticated_client):
+    future = encode_cursor(timezone.now() + timedelta(minutes=1))
+    response = authenticated_client.get(reverse("sync"), {"since": future})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_sync_invalid_cursor(authenticated_client):
+    response = authenticated_client.get(reverse("sync"), {"since": "abc"})
+    assert response.status_code == 400
@@ -0,0 +1,122 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todos.cache import get_version_key
+from todos.models import SubTodo, Todo
+
+"""
+======================================
+# Todo list cache checklist #
+- repeated reads only run the fingerprint queries
+- saves, moves and deletes invalidate the cached list
+- inbox is invalidated when a subtodo changes
+- users do not share cached lists
+- writes that did not invalidate this process's cache are still read back
+======================================
+"""
+
+
+def get_daily(client):
+    return client.get(
+        reverse("todos"),
+        {"start_date": "2024-08-01", "end_date": "2024-08-01"},
+    )
+
+
+@pytest.mark.django_db
+def test_daily_list_cached(authenticated_client, create_todo):
+    first = get_daily(authenticated_client)
+    with CaptureQueriesContext(connection) as context:
+        second = get_daily(authenticated_client)
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    # Todo / SubTodo fingerprint 조회만 실행합니다.
+    assert len(context.captured_queries) == 2
+
+
+@pytest.mark.django_db
+def test_daily_list_invalidated_on_patch(authenticated_client, create_todo):
+    get_daily(authenticated_client)
+    response = authenticated_client.patch(
+        reverse("todos"),
+        {"todo_id": create_todo.id, "content": "changed"},
+        format="json",
+    )
+    assert response.status_code == 200
+    assert get_daily(authenticated_client).json()[0]["content"] == "changed"
+
+
+@pytest.mark.django_db
+def test_daily_list_invalidated_on_move(
+    authenticated_client, create_user, create_category, create_todo
+):
+    other = Todo.objects.create(
+        user_id=create_user,
+        date="2024-08-01",
+        content="other",
+        category_id=create_category,
+        rank=Todo.objects.gen_next_rank(create_todo.rank),
+    )
+    assert [todo["id"] for todo in get_daily(authenticated_client).json()] == [
+        create_todo.id,
+        other.id,
+    ]
+    Todo.objects.move(other, None, create_todo.id)
+    assert [todo["id"] for todo in get_daily(authenticated_client).json()] == [
+        other.id,
+        create_todo.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_daily_list_invalidated_on_delete(authenticated_client, create_todo):
+    assert len(get_daily(authenticated_client).json()) == 1
+    Todo.objects.delete_instance(create_todo.category_id)
+    assert get_daily(authenticated_client).json() == []
+
+
+@pytest.mark.django_db
+def test_inbox_invalidated_on_subtodo_save(
+    authenticated_client, create_user, create_category
+):
+    todo = Todo.objects.create(
+        user_id=create_user,
+        content="inbox",
+        category_id=create_category,
+        rank="0|hzzzzz:",
+    )
+    assert (
+        authenticated_client.get(reverse("inbox")).json()[0]["children"] == []
+    )
+    SubTodo.objects.create(todo_id=todo, content="child", rank="0|hzzzzz:")
+    children = authenticated_client.get(reverse("inbox")).json()[0]["children"]
+    assert [child["content"] for child in children] == ["child"]
+
+
+@pytest.mark.django_db
+def test_cache_is_per_user(
+    authenticated_client, create_todo, django_user_model
+):
+    get_daily(authenticated_client)
+    other = django_user_model.objects.create_user(
+        username="other", email="other@example.com", password="password"
+    )
+    authenticated_client.force_authenticate(user=other)
+    assert get_daily(authenticated_client).json() == []
+
+
+@pytest.mark.django_db
+def test_daily_list_reads_write_from_other_process(
+    authenticated_client, create_todo
+):
+    get_daily(authenticated_client)
+    # 다른 process 의 변경처럼 이 process 의 cache version 은 그대로 둡니다.
+    key = get_version_key(create_todo.user_id.id)
+    version = cache.get(key)
+    create_todo.content = "changed"
+    create_todo.save()
+    cache.set(key, version, timeout=None)
+    assert get_daily(authenticated_client).json()[0]["content"] == "changed"
@@ -1,13 +1,14 @@
 import pytest
 from django.urls import reverse
 
-from todos.models import Todo
+from todos.models import SubTodo, Todo
 
 """
 ======================================
 # Todo Delete checklist #
 - correct test
 - todo_id validation
+- subtodos are deleted with a bounded number of queries
 ======================================
 """
 
@@ -43,3 +44,24 @@ def test_delete_todo_invalid_id(authenticated_client):
     data = {"todo_id": 999}
     response = authenticated_client.delete(url, data, format="json")
     assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("subtodo_count", [1, 30])
+def test_delete_todo_subtodos_constant_queries(
+    create_todo, content, subtodo_count, capture_queries
+):
+    SubTodo.objects.bulk_create(
+        SubTodo(todo_id=create_todo, content=content)
+        for _ in range(subtodo_count)
+    )
+    with capture_queries() as queries:
+        Todo.objects.delete_instance(create_todo)
+    assert len(queries) == 2
+    assert not SubTodo.objects.filter(todo_id=create_todo).exists()
+    assert (
+        SubTodo._base_manager.filter(
+            todo_id=create_todo, deleted_at__isnull=False
+        ).count()
+        == subtodo_count
+    )
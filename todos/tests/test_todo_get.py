@@ -1,9 +1,11 @@
 from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 from django.urls import reverse
 
 from todos.models import Todo
+from todos.pagination import TODO_DATE_WINDOW_DAYS, get_local_date
 
 """
 ======================================
@@ -39,7 +41,9 @@ def test_get_todos(
         rank=rank[1],
     )
     response = authenticated_client.get(
-        url, {"user_id": create_user.id}, format="json"
+        url,
+        {"user_id": create_user.id, "start_date": date, "end_date": date},
+        format="json",
     )
     assert response.status_code == 200
     assert len(response.data) == 2
@@ -72,6 +76,97 @@ def test_get_todos_ordering(
         category_id=create_category,
     )
     response = authenticated_client.get(
-        url, {"user_id": create_user.id}, format="json"
+        url,
+        {
+            "user_id": create_user.id,
+            "start_date": date,
+            "end_date": date + timedelta(days=1),
+        },
+        format="json",
     )
     assert response.status_code == 200
+    assert [todo["date"] for todo in response.data] == [
+        str(date),
+        str(date),
+        str(date + timedelta(days=1)),
+    ]
+
+
+def create_todos(user, category, dates):
+    return [
+        Todo.objects.create(
+            user_id=user, date=date, content="todo", category_id=category
+        )
+        for date in dates
+    ]
+
+
+@pytest.mark.django_db
+def test_get_todos_pages(create_user, create_category, authenticated_client):
+    url = reverse("todos")
+    todos = create_todos(
+        create_user,
+        create_category,
+        ["2024-08-03", "2024-08-01", "2024-08-02"],
+    )
+    ids = []
+    params = {"start_date": "2024-08-01", "page_size": 2}
+    while True:
+        response = authenticated_client.get(url, params)
+        assert response.status_code == 200
+        assert len(response.data) <= 2
+        ids += [todo["id"] for todo in response.data]
+        if "Link" not in response.headers:
+            break
+        next_url = response.headers["Link"][1:].split(">")[0]
+        params = parse_qs(urlparse(next_url).query)
+    assert ids == [todos[1].id, todos[2].id, todos[0].id]
+
+
+@pytest.mark.django_db
+def test_get_todos_page_size_is_capped(
+    create_user, create_category, authenticated_client, monkeypatch
+):
+    monkeypatch.setattr("todos.pagination.TODO_MAX_PAGE_SIZE", 1)
+    create_todos(create_user, create_category, ["2024-08-01", "2024-08-02"])
+    response = authenticated_client.get(
+        reverse("todos"), {"start_date": "2024-08-01", "page_size": 10}
+    )
+    assert len(response.data) == 1
+    assert 'rel="next"' in response.headers["Link"]
+
+
+@pytest.mark.django_db
+def test_get_todos_default_window(
+    create_user, create_category, authenticated_client
+):
+    create_todos(create_user, create_category, ["2024-08-01", "2024-10-01"])
+    response = authenticated_client.get(
+        reverse("todos"), {"start_date": "2024-08-01"}
+    )
+    assert [todo["date"] for todo in response.data] == ["2024-08-01"]
+
+
+@pytest.mark.django_db
+def test_get_todos_default_window_around_today(
+    create_user, create_category, authenticated_client
+):
+    today = get_local_date(create_user.utc_offset)
+    days = timedelta(days=TODO_DATE_WINDOW_DAYS)
+    todos = create_todos(
+        create_user,
+        create_category,
+        [today - days - timedelta(days=1), today - days, today + days],
+    )
+    create_todos(create_user, create_category, [today + days * 2])
+    response = authenticated_client.get(reverse("todos"))
+    assert [todo["id"] for todo in response.data] == [
+        todos[1].id,
+        todos[2].id,
+    ]
+
+
+@pytest.mark.django_db
+def test_get_todos_invalid_cursor(authenticated_client):
+    response = authenticated_client.get(reverse("todos"), {"cursor": "abc"})
+    assert response.status_code == 400
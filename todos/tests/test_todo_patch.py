@@ -2,10 +2,12 @@ import datetime
 from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from Lexorank.src.lexo_rank import LexoRank
-from todos.models import SubTodo, Todo
+from todos.models import RankConflictError, RankTail, SubTodo, Todo
 
 """
 ======================================
@@ -269,3 +271,114 @@ def test_update_todo_date_with_subtodo(
     assert response.data["date"] == "2024-11-11"
     subtodo.refresh_from_db()
     assert subtodo.date == datetime.date(2024, 11, 11)
+
+
+@pytest.mark.django_db
+def test_update_todo_date_constant_queries(
+    authenticated_client,
+    create_category,
+    create_user,
+    date,
+    content,
+):
+    todo = Todo.objects.create(
+        user_id=create_user,
+        date=date,
+        content=content,
+        category_id=create_category,
+    )
+    url = reverse("todos")
+
+    def patch_date(new_date):
+        data = {"todo_id": todo.id, "date": new_date}
+        with CaptureQueriesContext(connection) as context:
+            response = authenticated_client.patch(url, data, format="json")
+        assert response.status_code == 200
+        return len(context.captured_queries)
+
+    SubTodo.objects.create(todo_id=todo, content=content, date=date)
+    one_subtodo = patch_date("2024-11-11")
+    SubTodo.objects.bulk_create(
+        SubTodo(todo_id=todo, content=content, date=date) for _ in range(29)
+    )
+    many_subtodos = patch_date("2024-11-12")
+    assert one_subtodo == many_subtodos
+    assert set(
+        SubTodo.objects.filter(todo_id=todo).values_list("date", flat=True)
+    ) == {datetime.date(2024, 11, 12)}
+
+
+@pytest.mark.django_db
+def test_move_todo_two_queries(
+    create_user, create_category, date, content, rank, capture_queries
+):
+    todos = [
+        Todo.objects.create(
+            user_id=create_user,
+            date=date,
+            content=content,
+            category_id=create_category,
+            rank=todo_rank,
+        )
+        for todo_rank in rank
+    ]
+    with capture_queries() as queries:
+        Todo.objects.move(todos[0], todos[1].id, todos[2].id)
+    assert len(queries) == 2
+    todos[0].refresh_from_db()
+    assert todos[1].rank < todos[0].rank < todos[2].rank
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "tail_rank, expected_queries", [("0|i0000f:", 3), ("0|zzzzzz:", 2)]
+)
+def test_move_todo_bottom_bumps_tail(
+    create_user,
+    create_category,
+    date,
+    content,
+    rank,
+    tail_rank,
+    expected_queries,
+    capture_queries,
+):
+    todos = [
+        Todo.objects.create(
+            user_id=create_user,
+            date=date,
+            content=content,
+            category_id=create_category,
+            rank=todo_rank,
+        )
+        for todo_rank in rank
+    ]
+    RankTail.objects.create(user_id=create_user, scope="todo", rank=tail_rank)
+    with capture_queries() as queries:
+        Todo.objects.move(todos[0], todos[2].id, None)
+    assert len(queries) == expected_queries
+    tail = RankTail.objects.get(user_id=create_user, scope="todo")
+    assert tail.rank == max(tail_rank, todos[0].rank)
+    assert todos[2].rank < todos[0].rank
+
+
+@pytest.mark.django_db
+def test_move_todo_conflict(create_user, create_category, date, content, rank):
+    todo = Todo.objects.create(
+        user_id=create_user,
+        date=date,
+        content=content,
+        category_id=create_category,
+        rank=rank[0],
+    )
+    todo2 = Todo.objects.create(
+        user_id=create_user,
+        date=date,
+        content=content,
+        category_id=create_category,
+        rank=rank[1],
+    )
+    stale = Todo.objects.get(id=todo.id)
+    Todo.objects.filter(id=todo.id).update(rank=rank[2])
+    with pytest.raises(RankConflictError):
+        Todo.objects.move(stale, todo2.id, None)
@@ -1,6 +1,8 @@
 import pytest
 from django.urls import reverse
 
+from todos.models import RankTail
+
 """
 ======================================
 # SubTodo Post checklist #
@@ -47,3 +49,47 @@ def test_create_todo_invalid_category_id(
     }
     response = authenticated_client.post(url, data, format="json")
     assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_create_todo_rank_appended_at_tail(
+    authenticated_client,
+    create_category,
+    create_user,
+    date,
+    content,
+):
+    url = reverse("todos")
+    data = {
+        "date": date,
+        "due_time": None,
+        "content": content,
+        "category_id": create_category.id,
+    }
+    first = authenticated_client.post(url, data, format="json")
+    second = authenticated_client.post(url, data, format="json")
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert first.data["rank"] < second.data["rank"]
+    tail = RankTail.objects.get(user_id=create_user, scope="todo")
+    assert tail.rank == second.data["rank"]
+
+
+@pytest.mark.django_db
+def test_create_todo_rank_after_existing_todo(
+    authenticated_client,
+    create_todo,
+    create_category,
+    date,
+    content,
+):
+    url = reverse("todos")
+    data = {
+        "date": date,
+        "due_time": None,
+        "content": content,
+        "category_id": create_category.id,
+    }
+    response = authenticated_client.post(url, data, format="json")
+    assert response.status_code == 201
+    assert response.data["rank"] > create_todo.rank
@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+from django.urls import reverse
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+
+from onestep_be.renderers import CamelCaseJSONRenderer as FastRenderer
+from onestep_be.renderers import RenderedJSON
+from todos.lists import render_todo_list
+from todos.models import SubTodo, Todo
+from todos.serializers import GetTodoSerializer
+
+"""
+======================================
+# Todo list render checklist #
+- output is byte-identical to GetTodoSerializer + CamelCaseJSONRenderer
+- deleted subtodos are left out
+- pre-rendered lists survive the cache
+- views send the pre-rendered bytes
+======================================
+"""
+
+
+@pytest.fixture
+def create_todos(create_user, create_category):
+    todo = Todo.objects.create(
+        user_id=create_user,
+        date="2024-08-01",
+        due_time="09:30",
+        content='할 일 "quoted"  ',
+        category_id=create_category,
+        rank="0|hzzzzz:",
+    )
+    Todo.objects.create(
+        user_id=create_user,
+        content="inbox",
+        category_id=create_category,
+        rank="0|i00007:",
+        is_completed=True,
+    )
+    SubTodo.objects.create(todo_id=todo, content="second", rank="0|i00007:")
+    SubTodo.objects.create(
+        todo_id=todo, content="first", rank="0|hzzzzz:", date="2024-08-02"
+    )
+    deleted = SubTodo.objects.create(todo_id=todo, content="deleted")
+    SubTodo.objects.delete_instance(deleted)
+    return todo
+
+
+def render_with_serializer(todos):
+    data = GetTodoSerializer(todos, many=True).data
+    return CamelCaseJSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+def test_render_daily_matches_serializer(create_user, create_todos):
+    todos = Todo.objects.get_daily_page(create_user.id)
+    rendered = render_todo_list(todos)
+    assert rendered.rendered == render_with_serializer(todos)
+    assert [child["content"] for child in rendered[0]["children"]] == [
+        "first",
+        "second",
+    ]
+
+
+@pytest.mark.django_db
+def test_render_inbox_matches_serializer(create_user, create_todos):
+    todos = Todo.objects.get_inbox(create_user.id)
+    assert render_todo_list(todos).rendered == render_with_serializer(todos)
+
+
+@pytest.mark.django_db
+def test_render_empty_list(create_user):
+    todos = Todo.objects.get_inbox(create_user.id)
+    assert render_todo_list(todos).rendered == b"[]"
+
+
+def test_rendered_json_pickles_rendered_bytes():
+    rendered = RenderedJSON([{"id": 1, "children": []}])
+    loaded = pickle.loads(pickle.dumps(rendered))
+    assert isinstance(loaded, RenderedJSON)
+    assert loaded == rendered
+    assert loaded.rendered == rendered.rendered
+
+
+def test_renderer_uses_rendered_bytes():
+    rendered = RenderedJSON([{"a_b": 1}], b'[{"aB":1}]')
+    assert FastRenderer().render(rendered) == b'[{"aB":1}]'
+    assert FastRenderer().render([{"a_b": 1}]) == b'[{"aB":1}]'
+
+
+@pytest.mark.django_db
+def test_todo_view_renders_fast_list(
+    authenticated_client, create_user, create_todos
+):
+    response = authenticated_client.get(
+        reverse("todos"), {"start_date": "2024-08-01"}
+    )
+    assert response.content == render_with_serializer(
+        Todo.objects.get_daily_page(create_user.id)
+    )
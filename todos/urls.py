@@ -2,10 +2,12 @@
 from django.urls import path
 
 from todos.views import (
+    BatchView,
     CategoryView,
     InboxView,
     RecommendSubTodo,
     SubTodoView,
+    SyncView,
     TodoView,
 )
 
@@ -14,5 +16,7 @@ urlpatterns = [
     path("sub/", SubTodoView.as_view(), name="subtodos"),
     path("category/", CategoryView.as_view(), name="category"),
     path("inbox/", InboxView.as_view(), name="inbox"),
+    path("batch/", BatchView.as_view(), name="batch"),
+    path("sync/", SyncView.as_view(), name="sync"),
     path("recommend/", RecommendSubTodo.as_view(), name="recommend"),
 ]
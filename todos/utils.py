@@ -11,8 +11,10 @@ def set_sentry_user(user):
 
 
 def sentry_validation_error(where: str, error, user_id):
-    sentry_sdk.capture_message(
-        "Validation Error in" + where,
-        level="error",
-        extra={"error": error, "user_id": user_id},
-    )
+    # capture_message 는 extra 인자를 받지 않으므로 scope 에 붙여서 보냅니다.
+    with sentry_sdk.new_scope() as scope:
+        scope.set_extra("error", error)
+        scope.set_extra("user_id", user_id)
+        sentry_sdk.capture_message(
+            "Validation Error in" + where, level="error"
+        )
@@ -4,7 +4,7 @@
 import json
 
 import sentry_sdk
-from asgiref.sync import async_to_sync
+from asgiref.sync import sync_to_async
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -13,9 +13,27 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from onestep_be.settings import openai_client
+from todos.async_views import AsyncAPIView
+from todos.batch import BatchError, apply_batch
+from todos.cache import aget_list_response
 from todos.firebase_messaging import send_push_notification_device
-from todos.models import Category, SubTodo, Todo, UserLastUsage
+from todos.lists import arender_todo_list
+from todos.models import (
+    Category,
+    RankConflictError,
+    SubTodo,
+    Todo,
+    UserLastUsage,
+)
+from todos.pagination import (
+    decode_todo_cursor,
+    get_date_window,
+    get_local_date,
+    get_next_link,
+    get_page_size,
+)
 from todos.serializers import (
+    BatchSerializer,
     CategorySerializer,
     GetTodoSerializer,
     SubTodoSerializer,
@@ -29,6 +47,7 @@ from todos.swagger_serializers import (
     SwaggerTodoPatchSerializer,
     SwaggerTodoSerializer,
 )
+from todos.sync import InvalidCursorError, get_sync_data
 from todos.utils import sentry_validation_error, set_sentry_user
 
 TODO_FCM_MESSAGE_TITLE = "Todo"
@@ -37,11 +56,39 @@ SUBTODO_FCM_MESSAGE_TITLE = "SubTodo"
 SUBTODO_FCM_MESSAGE_BODY = "SubTodo가 변경되었습니다."
 CATEGORY_FCM_MESSAGE_TITLE = "Category"
 CATEGORY_FCM_MESSAGE_BODY = "Category가 변경되었습니다."
+BATCH_FCM_MESSAGE_TITLE = "Batch"
+BATCH_FCM_MESSAGE_BODY = "Todo가 변경되었습니다."
 
 RATE_LIMIT_SECONDS = 10
 
 
-class TodoView(APIView):
+@sync_to_async
+def save_and_notify(request, serializer, title, body):
+    """
+    - serializer 를 검증, 저장하고 push 알림을 보낸 뒤 data 를 반환합니다.
+    - 검증, 저장과 rank 이동, commit 후 알림은 sync ORM 과 transaction 이
+      필요하므로 thread 에서 한 번에 실행합니다.
+    """
+    serializer.is_valid(raise_exception=True)
+    serializer.save()
+    send_push_notification_device(
+        request.auth.get("device"), request.user, title, body
+    )
+    return serializer.data
+
+
+@sync_to_async
+def delete_and_notify(request, instance, title, body):
+    """
+    - instance 와 하위 항목을 soft delete 하고 push 알림을 보냅니다.
+    """
+    type(instance).objects.delete_instance(instance)
+    send_push_notification_device(
+        request.auth.get("device"), request.user, title, body
+    )
+
+
+class TodoView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
     queryset = Todo.objects.all()
 
@@ -51,7 +98,7 @@ class TodoView(APIView):
         operation_summary="Create a todo",
         responses={201: SwaggerTodoSerializer},
     )
-    def post(self, request):
+    async def post(self, request):
         """
         - 이 함수는 todo를 생성하는 함수입니다.
         - 입력 : date, due_time, content, category, parent_id
@@ -67,31 +114,21 @@ class TodoView(APIView):
         try:
             data = request.data.copy()
             data["user_id"] = request.user.id
-            data["rank"] = Todo.objects.get_next_rank(request.user.id)
+            data["rank"] = await sync_to_async(Todo.objects.get_next_rank)(
+                request.user.id
+            )
 
             set_sentry_user(request.user)
             serializer = TodoSerializer(
                 context={"request": request}, data=data
             )
-            if serializer.is_valid(raise_exception=True):
-                serializer.save()
-                send_push_notification_device(
-                    request.auth.get("device"),
-                    request.user,
-                    TODO_FCM_MESSAGE_TITLE,
-                    TODO_FCM_MESSAGE_BODY,
-                )
-                return Response(
-                    serializer.data, status=status.HTTP_201_CREATED
-                )
-            else:
-                sentry_validation_error(
-                    "TodoCreate", serializer.errors, request.user.id
-                )
-                return Response(
-                    {"error": serializer.errors},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            data = await save_and_notify(
+                request,
+                serializer,
+                TODO_FCM_MESSAGE_TITLE,
+                TODO_FCM_MESSAGE_BODY,
+            )
+            return Response(data, status=status.HTTP_201_CREATED)
         except Exception as e:
             sentry_sdk.capture_exception(e)
             return Response(
@@ -118,20 +155,36 @@ class TodoView(APIView):
                 description="end_date",
                 required=False,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="cursor of the next page (Link header)",
+                required=False,
+            ),
+            openapi.Parameter(
+                "page_size",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_INTEGER,
+                description="page_size",
+                required=False,
+            ),
         ],
         operation_summary="Get a todo",
         responses={200: GetTodoSerializer},
     )
-    def get(self, request):
+    async def get(self, request):
         """
         - 이 함수는 daily todo list를 불러오는 함수입니다.
-        - 입력 :  start_date, end_date
-        - start_date와 end_date가 없는 경우 user_id에 해당하는 모든 todo를 불러옵니다.
+        - 입력 :  start_date, end_date, cursor, page_size
+        - start_date와 end_date가 없는 경우 user 의 현지 날짜 기준 오늘 앞뒤로 TODO_DATE_WINDOW_DAYS 일의 todo를 불러옵니다.
         - start_date와 end_date가 있는 경우 user_id에 해당하는 todo 중 start_date와 end_date 사이에 있는 todo를 불러옵니다.
-        - order 의 순서로 정렬합니다.
+        - 하나만 있는 경우 TODO_DATE_WINDOW_DAYS 기간의 todo를 불러옵니다.
+        - date, rank, id 의 순서로 정렬하고, page_size 개씩 불러옵니다.
+        - 다음 페이지가 있으면 Link 헤더로 cursor 가 들어간 URL 을 내려줍니다.
+        - 결과는 user 와 기간, 페이지별로 cache 하고, todo 가 바뀌면 무효화됩니다.
+        - ETag 를 내려주고, If-None-Match 가 같으면 304 를 반환합니다.
         """  # noqa: E501
-        start_date = request.GET.get("start_date")
-        end_date = request.GET.get("end_date")
         user_id = request.user.id
         set_sentry_user(request.user)
         if user_id is None:
@@ -140,24 +193,50 @@ class TodoView(APIView):
                 {"error": "user_id must be provided"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        cursor = request.GET.get("cursor")
         try:
-            if (
-                start_date is not None and end_date is not None
-            ):  # start_date and end_date are not None
-                todos = Todo.objects.get_daily_with_date(
-                    user_id=user_id, start_date=start_date, end_date=end_date
-                )
-            else:
-                todos = Todo.objects.get_with_user_id(
-                    user_id=user_id
-                ).order_by("rank")
+            start_date, end_date = get_date_window(
+                request.GET.get("start_date"),
+                request.GET.get("end_date"),
+                today=get_local_date(request.user.utc_offset),
+            )
+            page_size = get_page_size(request.GET.get("page_size"))
+            after = decode_todo_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        async def get_data():
+            todos = Todo.objects.get_daily_page(
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                after=after,
+            )
+            return await arender_todo_list(todos, page_size)
+
+        try:
+            response = await aget_list_response(
+                request,
+                "daily",
+                start_date,
+                end_date,
+                cursor,
+                page_size,
+                models=(Todo, SubTodo),
+                get_data=get_data,
+            )
         except Todo.DoesNotExist as e:
             sentry_sdk.capture_exception(e)
             return Response(
                 {"error": "Todo not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        serializer = GetTodoSerializer(todos, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if response.status_code == status.HTTP_200_OK:
+            next_link = get_next_link(request, response.data, page_size)
+            if next_link is not None:
+                response["Link"] = f'<{next_link}>; rel="next"'
+        return response
 
     @swagger_auto_schema(
         tags=["Todo"],
@@ -165,7 +244,7 @@ class TodoView(APIView):
         operation_summary="Update a todo",
         responses={200: SwaggerTodoSerializer},
     )
-    def patch(self, request):
+    async def patch(self, request):
         """
         - 이 함수는 todo를 수정하는 함수입니다.
         - 입력 : todo_id, 수정 내용
@@ -185,7 +264,7 @@ class TodoView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            todo = Todo.objects.get(id=todo_id, deleted_at__isnull=True)
+            todo = await Todo.objects.aget(id=todo_id, deleted_at__isnull=True)
         except Todo.DoesNotExist as e:
             sentry_sdk.capture_exception(e)
             return Response(
@@ -197,24 +276,23 @@ class TodoView(APIView):
             data=request.data,
             partial=True,
         )
-
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
+        try:
+            data = await save_and_notify(
+                request,
+                serializer,
                 TODO_FCM_MESSAGE_TITLE,
                 TODO_FCM_MESSAGE_BODY,
             )
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            sentry_validation_error(
-                "TodoPatch", serializer.errors, request.user.id
-            )
+        except RankConflictError as e:
+            sentry_sdk.capture_exception(e)
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except Todo.DoesNotExist as e:
+            sentry_sdk.capture_exception(e)
             return Response(
-                {"error": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"error": "Todo not found"},
+                status=status.HTTP_404_NOT_FOUND,
             )
+        return Response(data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         tags=["Todo"],
@@ -229,7 +307,7 @@ class TodoView(APIView):
         operation_summary="Delete a todo",
         responses={200: SwaggerTodoSerializer},
     )
-    def delete(self, request):
+    async def delete(self, request):
         """
         - 이 함수는 todo를 삭제하는 함수입니다.
         - 입력 : todo_id
@@ -246,15 +324,9 @@ class TodoView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            todo = Todo.objects.get_with_id(id=todo_id)
-            subtodos = SubTodo.objects.get_subtodos(todo.id)
-            SubTodo.objects.delete_many(subtodos)
-            Todo.objects.delete_instance(todo)
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
-                TODO_FCM_MESSAGE_TITLE,
-                TODO_FCM_MESSAGE_BODY,
+            todo = await Todo.objects.aget_with_id(id=todo_id)
+            await delete_and_notify(
+                request, todo, TODO_FCM_MESSAGE_TITLE, TODO_FCM_MESSAGE_BODY
             )
             return Response(
                 {"todo_id": todo.id, "message": "Todo deleted successfully"},
@@ -272,7 +344,7 @@ class TodoView(APIView):
             )
 
 
-class SubTodoView(APIView):
+class SubTodoView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -281,7 +353,7 @@ class SubTodoView(APIView):
         operation_summary="Create a subtodo",
         responses={201: SwaggerSubTodoSerializer},
     )
-    def post(self, request):
+    async def post(self, request):
         """
         - 이 함수는 sub todo를 생성하는 함수입니다.
         - 입력 : todo, date, content
@@ -290,31 +362,21 @@ class SubTodoView(APIView):
         """
         set_sentry_user(request.user)
         data = request.data.copy()
-        rank = SubTodo.objects.get_next_rank_subtodo(request.user.id)
+        ranks = await sync_to_async(SubTodo.objects.get_next_ranks)(
+            request.user.id, len(data)
+        )
         for i in range(len(data)):
-            data[i]["rank"] = rank
-            rank = SubTodo.objects.gen_next_rank(rank)
+            data[i]["rank"] = ranks[i]
         serializer = SubTodoSerializer(
             context={"request": request}, data=data, many=True
         )
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
-                SUBTODO_FCM_MESSAGE_TITLE,
-                SUBTODO_FCM_MESSAGE_BODY,
-            )
-
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        else:
-            sentry_validation_error(
-                "SubTodoCreate", serializer.errors, request.user.id
-            )
-            return Response(
-                {"error": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        data = await save_and_notify(
+            request,
+            serializer,
+            SUBTODO_FCM_MESSAGE_TITLE,
+            SUBTODO_FCM_MESSAGE_BODY,
+        )
+        return Response(data, status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
         tags=["SubTodo"],
@@ -330,7 +392,7 @@ class SubTodoView(APIView):
         operation_summary="Get a subtodo",
         responses={200: SwaggerSubTodoSerializer},
     )
-    def get(self, request):
+    async def get(self, request):
         """
         - 이 함수는 sub todo list를 불러오는 함수입니다.
         - 입력 : todo_id
@@ -345,7 +407,12 @@ class SubTodoView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            sub_todos = SubTodo.objects.get_subtodos(todo_id=todo_id)
+            sub_todos = [
+                sub_todo
+                async for sub_todo in SubTodo.objects.get_subtodos(
+                    todo_id=todo_id
+                )
+            ]
             serializer = SubTodoSerializer(sub_todos, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except SubTodo.DoesNotExist as e:
@@ -366,7 +433,7 @@ class SubTodoView(APIView):
         operation_summary="Update a subtodo",
         responses={200: SwaggerSubTodoSerializer},
     )
-    def patch(self, request):
+    async def patch(self, request):
         """
         - 이 함수는 sub todo를 수정하는 함수입니다.
         - 입력 : subtodo_id, 수정 내용
@@ -388,7 +455,7 @@ class SubTodoView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            sub_todo = SubTodo.objects.get(
+            sub_todo = await SubTodo.objects.aget(
                 id=subtodo_id, deleted_at__isnull=True
             )
         except SubTodo.DoesNotExist:
@@ -402,25 +469,23 @@ class SubTodoView(APIView):
             data=request.data,
             partial=True,
         )
-
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
+        try:
+            data = await save_and_notify(
+                request,
+                serializer,
                 SUBTODO_FCM_MESSAGE_TITLE,
                 SUBTODO_FCM_MESSAGE_BODY,
             )
-
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            sentry_validation_error(
-                "SubTodoPatch", serializer.errors, request.user.id
-            )
+        except RankConflictError as e:
+            sentry_sdk.capture_exception(e)
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except SubTodo.DoesNotExist as e:
+            sentry_sdk.capture_exception(e)
             return Response(
-                {"error": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"error": "SubTodo not found"},
+                status=status.HTTP_404_NOT_FOUND,
             )
+        return Response(data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         tags=["SubTodo"],
@@ -435,7 +500,7 @@ class SubTodoView(APIView):
         operation_summary="Delete a subtodo",
         responses={200: SwaggerSubTodoSerializer},
     )
-    def delete(self, request):
+    async def delete(self, request):
         """
         - 이 함수는 sub todo를 삭제하는 함수입니다.
         - 입력 : subtodo_id
@@ -453,12 +518,10 @@ class SubTodoView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            sub_todo = SubTodo.objects.get_with_id(id=subtodo_id)
-            SubTodo.objects.delete_instance(sub_todo)
-
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
+            sub_todo = await SubTodo.objects.aget_with_id(id=subtodo_id)
+            await delete_and_notify(
+                request,
+                sub_todo,
                 SUBTODO_FCM_MESSAGE_TITLE,
                 SUBTODO_FCM_MESSAGE_BODY,
             )
@@ -482,7 +545,7 @@ class SubTodoView(APIView):
             )
 
 
-class CategoryView(APIView):
+class CategoryView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -491,7 +554,7 @@ class CategoryView(APIView):
         operation_summary="Create a category",
         responses={201: SwaggerCategorySerializer},
     )
-    def post(self, request):
+    async def post(self, request):
         """
         - 이 함수는 category를 생성하는 함수입니다.
         - 입력 : title, color
@@ -502,32 +565,20 @@ class CategoryView(APIView):
         try:
             data = request.data.copy()
             data["user_id"] = request.user.id
-            data["rank"] = Category.objects.get_next_rank(request.user.id)
+            data["rank"] = await sync_to_async(Category.objects.get_next_rank)(
+                request.user.id
+            )
 
             serializer = CategorySerializer(
                 context={"request": request}, data=data
             )
-
-            if serializer.is_valid(raise_exception=True):
-                serializer.save()
-                send_push_notification_device(
-                    request.auth.get("device"),
-                    request.user,
-                    CATEGORY_FCM_MESSAGE_TITLE,
-                    CATEGORY_FCM_MESSAGE_BODY,
-                )
-
-                return Response(
-                    serializer.data, status=status.HTTP_201_CREATED
-                )
-            else:
-                sentry_validation_error(
-                    "CategoryCreate", serializer.errors, request.user.id
-                )
-                return Response(
-                    {"error": serializer.errors},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            data = await save_and_notify(
+                request,
+                serializer,
+                CATEGORY_FCM_MESSAGE_TITLE,
+                CATEGORY_FCM_MESSAGE_BODY,
+            )
+            return Response(data, status=status.HTTP_201_CREATED)
         except Exception as e:
             sentry_sdk.capture_exception(e)
             return Response(
@@ -541,7 +592,7 @@ class CategoryView(APIView):
         operation_summary="Update a category",
         responses={200: SwaggerCategorySerializer},
     )
-    def patch(self, request):
+    async def patch(self, request):
         """
         - 이 함수는 category를 수정하는 함수입니다.
         - 입력 : category_id, 수정 내용
@@ -569,7 +620,7 @@ class CategoryView(APIView):
             )
 
         try:
-            category = Category.objects.get(
+            category = await Category.objects.aget(
                 id=category_id, deleted_at__isnull=True
             )
         except Category.DoesNotExist as e:
@@ -589,35 +640,25 @@ class CategoryView(APIView):
             data=request.data,
             partial=True,
         )
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
-                CATEGORY_FCM_MESSAGE_TITLE,
-                CATEGORY_FCM_MESSAGE_BODY,
-            )
-
-            return Response(serializer.data, status=status.HTTP_200_OK)
-        else:
-            sentry_validation_error(
-                "CategoryPatch", serializer.errors, request.user.id
-            )
-            return Response(
-                {"error": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        data = await save_and_notify(
+            request,
+            serializer,
+            CATEGORY_FCM_MESSAGE_TITLE,
+            CATEGORY_FCM_MESSAGE_BODY,
+        )
+        return Response(data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         tags=["Category"],
         operation_summary="Get a category",
         responses={200: SwaggerCategorySerializer},
     )
-    def get(self, request):
+    async def get(self, request):
         """
         - 이 함수는 category list를 불러오는 함수입니다.
         - 입력 : 없음
         - user_id에 해당하는 category list를 불러옵니다.
+        - ETag 를 내려주고, If-None-Match 가 같으면 304 를 반환합니다.
         """
         set_sentry_user(request.user)
         try:
@@ -630,9 +671,19 @@ class CategoryView(APIView):
                     {"error": "user_id must be provided"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            categories = Category.objects.get_with_user_id(user_id=user_id)
-            serializer = CategorySerializer(categories, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+
+            async def get_data():
+                categories = [
+                    category
+                    async for category in Category.objects.get_with_user_id(
+                        user_id=user_id
+                    )
+                ]
+                return CategorySerializer(categories, many=True).data
+
+            return await aget_list_response(
+                request, "category", models=(Category,), get_data=get_data
+            )
         except Category.DoesNotExist as e:
             sentry_sdk.capture_exception(e)
             return Response(
@@ -658,12 +709,13 @@ class CategoryView(APIView):
         operation_summary="Delete a category",
         responses={200: SwaggerCategorySerializer},
     )
-    def delete(self, request):
+    async def delete(self, request):
         """
         - 이 함수는 category를 삭제하는 함수입니다.
         - 입력 : category_id
         - category_id에 해당하는 category의 deleted_at 필드를 현재 시간으로 업데이트합니다.
         - deleted_at 필드가 null이 아닌 경우 이미 삭제된 category입니다.
+        - 해당 category 에 속한 todo 와 subtodo 도 함께 삭제합니다.
         """  # noqa: E501
         try:
             set_sentry_user(request.user)
@@ -676,11 +728,10 @@ class CategoryView(APIView):
                     {"error": "category_id must be provided"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            category = Category.objects.get_with_id(id=category_id)
-            Category.objects.delete_instance(category)
-            send_push_notification_device(
-                request.auth.get("device"),
-                request.user,
+            category = await Category.objects.aget_with_id(id=category_id)
+            await delete_and_notify(
+                request,
+                category,
                 CATEGORY_FCM_MESSAGE_TITLE,
                 CATEGORY_FCM_MESSAGE_BODY,
             )
@@ -704,7 +755,7 @@ class CategoryView(APIView):
             )
 
 
-class InboxView(APIView):
+class InboxView(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -721,11 +772,13 @@ class InboxView(APIView):
         operation_summary="Get Inbox todo",
         responses={200: GetTodoSerializer},
     )
-    def get(self, request):
+    async def get(self, request):
         """
         - 이 함수는 daily todo list를 불러오는 함수입니다.
         - 입력 :  없음
         - order 의 순서로 정렬합니다.
+        - 결과는 user 별로 cache 하고, todo 가 바뀌면 무효화됩니다.
+        - ETag 를 내려주고, If-None-Match 가 같으면 304 를 반환합니다.
         """
         try:
             set_sentry_user(request.user)
@@ -738,9 +791,15 @@ class InboxView(APIView):
                     {"error": "user_id must be provided"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            todos = Todo.objects.get_inbox(user_id=user_id)
-            serializer = GetTodoSerializer(todos, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+
+            async def get_data():
+                return await arender_todo_list(
+                    Todo.objects.get_inbox(user_id=user_id)
+                )
+
+            return await aget_list_response(
+                request, "inbox", models=(Todo, SubTodo), get_data=get_data
+            )
         except Todo.DoesNotExist as e:
             sentry_sdk.capture_exception(e)
             return Response(
@@ -753,7 +812,103 @@ class InboxView(APIView):
             )
 
 
-class RecommendSubTodo(APIView):
+class BatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=["Batch"],
+        request_body=BatchSerializer,
+        operation_summary="Apply a batch of operations",
+    )
+    def post(self, request):
+        """
+        - 이 함수는 todo, subtodo, category 의 생성, 수정, 삭제를 한 번에
+          적용하는 함수입니다.
+        - 입력 : operations (op, type, id, data 의 list)
+        - op 는 create, update, delete 중 하나이고, type 은 todo, subtodo,
+          category 중 하나입니다.
+        - data 는 각 view 의 post / patch 입력과 같습니다.
+        - 하나의 transaction 에서 순서대로 적용하고, 하나라도 실패하면
+          전체를 되돌립니다.
+        - 실패하면 실패한 operation 의 index 와 error 를 반환합니다.
+        - 성공하면 operation 마다 결과를 반환하고 push 알림을 한 번만
+          보냅니다.
+        """
+        set_sentry_user(request.user)
+        serializer = BatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            sentry_validation_error(
+                "Batch", serializer.errors, request.user.id
+            )
+            return Response(
+                {"error": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            results = apply_batch(
+                request, serializer.validated_data["operations"]
+            )
+        except BatchError as e:
+            sentry_validation_error(
+                "Batch", {"index": e.index, "error": e.error}, request.user.id
+            )
+            return Response(
+                {"index": e.index, "error": e.error}, status=e.status_code
+            )
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        send_push_notification_device(
+            request.auth.get("device"),
+            request.user,
+            BATCH_FCM_MESSAGE_TITLE,
+            BATCH_FCM_MESSAGE_BODY,
+        )
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+class SyncView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=["Sync"],
+        manual_parameters=[
+            openapi.Parameter(
+                "since",
+                openapi.IN_QUERY,
+                type=openapi.TYPE_STRING,
+                description="cursor returned by the previous sync",
+                required=False,
+            ),
+        ],
+        operation_summary="Get changes since a cursor",
+    )
+    def get(self, request):
+        """
+        - 이 함수는 since 이후 바뀐 todo, subtodo, category 를 불러오는 함수입니다.
+        - 입력 : since (이전 응답의 cursor)
+        - 모델별로 upserts(생성, 수정된 항목)와 deletes(삭제된 id)를 반환합니다.
+        - since 가 없으면 전체 항목을 반환합니다.
+        - 응답의 cursor 를 다음 요청의 since 로 사용합니다.
+        """  # noqa: E501
+        set_sentry_user(request.user)
+        try:
+            data = get_sync_data(request.user.id, request.GET.get("since"))
+        except InvalidCursorError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class RecommendSubTodo(AsyncAPIView):
     permission_classes = [IsAuthenticated]
 
     @swagger_auto_schema(
@@ -770,7 +925,7 @@ class RecommendSubTodo(APIView):
         operation_summary="Recommend subtodo",
         responses={200: SubTodoSerializer},
     )
-    def get(self, request):
+    async def get(self, request):
         """
         - 이 함수는 sub todo를 추천하는 함수입니다.
         """
@@ -778,7 +933,7 @@ class RecommendSubTodo(APIView):
 
         user_id = request.user.id
         try:
-            flag, message = UserLastUsage.check_rate_limit(
+            flag, message = await UserLastUsage.acheck_rate_limit(
                 user_id=user_id, RATE_LIMIT_SECONDS=RATE_LIMIT_SECONDS
             )
 
@@ -797,15 +952,15 @@ class RecommendSubTodo(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             # 비동기적으로 OpenAI API 호출 처리
-            todo = Todo.objects.get_with_id(id=todo_id)
+            todo = await Todo.objects.aget_with_id(id=todo_id)
             todo_data = {
                 "id": todo.id,
                 "content": todo.content,
                 "date": todo.date,
                 "due_time": todo.due_time,
-                "category_id": todo.category_id,
+                "category_id": todo.category_id_id,
             }
-            completion = async_to_sync(self.get_openai_completion)(todo_data)
+            completion = await self.get_openai_completion(todo_data)
             return Response(
                 json.loads(completion.choices[0].message.content),
                 status=status.HTTP_200_OK,